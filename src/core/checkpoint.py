@@ -0,0 +1,118 @@
+"""
+Контрольные точки RapidRecon - журнал состояния движка для возобновления сканирования
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import logging
+
+
+class CheckpointJournal:
+    """
+    Append-only журнал состояния движка в формате JSON Lines
+
+    Каждая строка - одна запись:
+        {"op": "node", "node": {...}}          - новый или обновленный узел
+        {"op": "done", "id": ..., "info": {...}} - завершенная задача
+        {"op": "stats", "stats": {...}}        - снимок статистики
+
+    Записи копятся в буфере и дописываются в файл пачками (по времени или
+    количеству), поэтому стоимость записи пропорциональна изменениям,
+    а не общему объему состояния.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 5.0, flush_every: int = 200,
+                 fsync: bool = False):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.logger = logging.getLogger('RapidRecon.Checkpoint')
+
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def record_node(self, node_data: Dict[str, Any]):
+        """Запись нового или обновленного узла"""
+        self._append({'op': 'node', 'node': node_data})
+
+    def record_completed(self, node_id: str, info: Dict[str, Any]):
+        """Запись завершенной задачи"""
+        self._append({'op': 'done', 'id': node_id, 'info': info})
+
+    def record_stats(self, stats: Dict[str, Any]):
+        """Запись снимка статистики"""
+        self._append({'op': 'stats', 'stats': stats})
+
+    def _append(self, record: Dict[str, Any]):
+        self._buffer.append(json.dumps(record, ensure_ascii=False, default=str))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def maybe_flush(self):
+        """Сброс буфера, если прошел интервал контрольной точки"""
+        if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Дописать накопленные записи в журнал"""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        lines, self._buffer = self._buffer, []
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+        except Exception as e:
+            # Не теряем записи: вернем их в буфер до следующей попытки
+            self._buffer = lines + self._buffer
+            self.logger.error(f"Ошибка записи контрольной точки {self.path}: {e}")
+
+    @staticmethod
+    def replay(path: str) -> Dict[str, Any]:
+        """
+        Восстановление состояния из журнала
+
+        Returns:
+            Dict с ключами nodes (node_id -> последняя версия узла, в порядке
+            обнаружения), completed (node_id -> информация о задаче) и stats
+        """
+        nodes: Dict[str, Dict[str, Any]] = {}
+        completed: Dict[str, Dict[str, Any]] = {}
+        stats: Optional[Dict[str, Any]] = None
+        skipped = 0
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Оборванная запись при аварийном завершении
+                    skipped += 1
+                    continue
+
+                op = record.get('op')
+                if op == 'node':
+                    node = record['node']
+                    nodes[node['id']] = node
+                elif op == 'done':
+                    completed[record['id']] = record.get('info', {})
+                elif op == 'stats':
+                    stats = record.get('stats')
+
+        if skipped:
+            logging.getLogger('RapidRecon.Checkpoint').warning(
+                f"Пропущено поврежденных записей журнала: {skipped}"
+            )
+
+        return {'nodes': nodes, 'completed': completed, 'stats': stats}
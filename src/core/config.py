@@ -71,7 +71,60 @@ class ConfigManager:
                 "max_concurrent_tasks": 5,
                 "rate_limit": 10,
                 "timeout_multiplier": 1.5,
-                "retry_attempts": 3
+                "retry_attempts": 3,
+                "queue_poll_interval": 0.5,
+                "priority": {
+                    "type_weights": {},
+                    "priority_offsets": {},
+                    "depth_weight": 0.5,
+                    "aging_interval": 2.0
+                },
+                "rate_governor": {
+                    "global_rate": 500,
+                    "global_burst": 100,
+                    "host_rate": 100,
+                    "host_burst": 20,
+                    "host_concurrency": 20,
+                    "subnet_rate": None,
+                    "module_rates": {
+                        "ping_scanner": 50,
+                        "subdomain_scanner": 100,
+                        "port_scanner": 400,
+                        "service_detector": 20,
+                        "vulnerability_scanner": 10,
+                        "exploitation": 1
+                    }
+                },
+                "liveness": {
+                    "ttl": 600,
+                    "negative_ttl": 60,
+                    "max_entries": 100000
+                },
+                "checkpoint": {
+                    "enabled": False,
+                    "path": "rapidrecon_checkpoint.jsonl",
+                    "flush_interval": 5.0,
+                    "flush_every": 200
+                },
+                "node_store": {
+                    "backend": "memory",
+                    "path": "rapidrecon_nodes.db",
+                    "commit_every": 500
+                },
+                "streaming": True,
+                "simulate_findings": False,
+                "event_bus": {
+                    "capacity": 10000
+                },
+                "batching": {
+                    "enabled": True,
+                    "max_batch_size": 256,
+                    "max_wait": 0.05,
+                    "exclude_modules": [],
+                    "concurrency": 16,
+                    "module_concurrency": {},
+                    "max_timeout": 300
+                }
             },
             "modules": {
                 "directory": "src/modules",
@@ -244,7 +297,16 @@ class ConfigManager:
                 "ports": [21, 22, 80, 443, 8080],
                 "enabled": True,
                 "scan_method": "syn",  # syn, connect, udp
-                "max_port_workers": 50
+                "max_port_workers": 50,
+                "max_host_concurrency": 10,
+                "randomize_ports": False,
+                "adaptive_timeout": True,
+                "min_timeout": 0.1,
+                "max_timeout": 5.0,
+                "rtt_multiplier": 2.0,
+                "alive_ports": [80, 443, 22, 8080, 8443, 445, 3389, 25],
+                "banner_grab": True,
+                "banner_timeout": 1.0
             },
             "service_detector": {
                 "rate_limit": 5,
@@ -258,7 +320,14 @@ class ConfigManager:
                 "wordlist": "common_subdomains.txt",
                 "enabled": True,
                 "use_brute_force": False,
-                "recursive": False
+                "recursive": False,
+                "dns_servers": ["8.8.8.8", "1.1.1.1"],
+                "dns_timeout": 2.0,
+                "dns_retries": 2,
+                "max_in_flight": 500,
+                "cache_size": 100000,
+                "negative_ttl": 300,
+                "wildcard_probes": 3
             },
             "vulnerability_scanner": {
                 "rate_limit": 2,
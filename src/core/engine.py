@@ -3,17 +3,28 @@
 """
 import asyncio
 import json
-from queue import Queue
-from typing import Dict, List, Any, Optional, Callable
+import threading
+from collections import OrderedDict
+from queue import PriorityQueue, Empty
+from typing import Dict, List, Any, Optional, Callable, Tuple, Set, AsyncIterator
 import logging
 import time
-from dataclasses import dataclass
+import sys
 from enum import Enum
 import random
 import ipaddress
 import inspect
+import itertools
+from pathlib import Path
 
 from .config import ConfigManager  # ← ДОБАВЛЕН импорт ConfigManager
+from .scheduler import TaskPriorityPolicy, BatchPolicy, TaskBatch
+from .rate_limiter import RateGovernor
+from .liveness import LivenessCache
+from .checkpoint import CheckpointJournal
+from .node_store import NodeRepository, create_node_repository
+from .routing import ResultRouter
+from .event_bus import EventBus
 
 class NodeType(Enum):
     """Типы обнаруживаемых узлов"""
@@ -31,40 +42,148 @@ class NodeType(Enum):
     INTERNAL_SCAN = "internal_scan"
     CUSTOM = "custom"
 
-@dataclass
+# Компактные целочисленные коды типов узлов (порядок объявления NodeType)
+_NODE_TYPES_BY_CODE = tuple(NodeType)
+_NODE_TYPE_CODES = {node_type: code for code, node_type in enumerate(_NODE_TYPES_BY_CODE)}
+NodeType.code = property(lambda self: _NODE_TYPE_CODES[self])
+NodeType.from_code = staticmethod(lambda code: _NODE_TYPES_BY_CODE[code])
+
 class ScanNode:
-    """Унифицированная структура узла для сканирования"""
-    node_id: str
-    type: NodeType
-    data: Any
-    source: str
-    depth: int
-    timestamp: float
-    module: str = "default"
-    metadata: Dict[str, Any] = None
-    ports: List[int] = None
-    services: List[Dict] = None
-    vulnerability_data: Dict = None
-    vulnerabilities: List[Dict] = None
-    exploit_data: Dict = None
-    
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
-        if self.ports is None:
-            self.ports = []
-        if self.services is None:
-            self.services = []
-        if self.vulnerability_data is None:
-            self.vulnerability_data = {}
-        if self.vulnerabilities is None:
-            self.vulnerabilities = []
-        if self.exploit_data is None:
-            self.exploit_data = {}
+    """
+    Унифицированная структура узла для сканирования
+    
+    Компактное представление: __slots__ вместо __dict__, тип хранится
+    целочисленным кодом, строки модуля и источника интернируются, а контейнеры
+    (metadata, ports, services, ...) создаются только при первом обращении.
+    """
+    
+    __slots__ = (
+        'node_id', 'type_code', 'data', 'source', 'depth', 'timestamp', 'module',
+        '_metadata', '_ports', '_services', '_vulnerability_data', '_vulnerabilities',
+        '_exploit_data', '__weakref__'
+    )
+    
+    def __init__(self, node_id: str, type: NodeType, data: Any, source: str, depth: int,
+                 timestamp: float, module: str = "default", metadata: Dict[str, Any] = None,
+                 ports: List[int] = None, services: List[Dict] = None, vulnerability_data: Dict = None,
+                 vulnerabilities: List[Dict] = None, exploit_data: Dict = None):
+        self.node_id = node_id
+        self.type_code = _NODE_TYPE_CODES[type]
+        self.data = data
+        self.source = sys.intern(source) if isinstance(source, str) else source
+        self.depth = depth
+        self.timestamp = timestamp
+        self.module = sys.intern(module) if isinstance(module, str) else module
+        # Пустые контейнеры не храним - экономия памяти на каждом узле
+        self._metadata = metadata or None
+        self._ports = ports or None
+        self._services = services or None
+        self._vulnerability_data = vulnerability_data or None
+        self._vulnerabilities = vulnerabilities or None
+        self._exploit_data = exploit_data or None
+    
+    @property
+    def type(self) -> NodeType:
+        return _NODE_TYPES_BY_CODE[self.type_code]
+    
+    @type.setter
+    def type(self, value: NodeType):
+        self.type_code = _NODE_TYPE_CODES[value]
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value or None
+    
+    @property
+    def ports(self) -> List[int]:
+        if self._ports is None:
+            self._ports = []
+        return self._ports
+    
+    @ports.setter
+    def ports(self, value: List[int]):
+        self._ports = value or None
+    
+    @property
+    def services(self) -> List[Dict]:
+        if self._services is None:
+            self._services = []
+        return self._services
+    
+    @services.setter
+    def services(self, value: List[Dict]):
+        self._services = value or None
+    
+    @property
+    def vulnerability_data(self) -> Dict:
+        if self._vulnerability_data is None:
+            self._vulnerability_data = {}
+        return self._vulnerability_data
+    
+    @vulnerability_data.setter
+    def vulnerability_data(self, value: Dict):
+        self._vulnerability_data = value or None
+    
+    @property
+    def vulnerabilities(self) -> List[Dict]:
+        if self._vulnerabilities is None:
+            self._vulnerabilities = []
+        return self._vulnerabilities
+    
+    @vulnerabilities.setter
+    def vulnerabilities(self, value: List[Dict]):
+        self._vulnerabilities = value or None
+    
+    @property
+    def exploit_data(self) -> Dict:
+        if self._exploit_data is None:
+            self._exploit_data = {}
+        return self._exploit_data
+    
+    @exploit_data.setter
+    def exploit_data(self, value: Dict):
+        self._exploit_data = value or None
+    
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """Чтение metadata без создания пустого словаря"""
+        if self._metadata is None:
+            return default
+        return self._metadata.get(key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Сериализация узла без создания пустых контейнеров"""
+        return {
+            'id': self.node_id,
+            'type': self.type.value,
+            'data': self.data,
+            'source': self.source,
+            'depth': self.depth,
+            'timestamp': self.timestamp,
+            'module': self.module,
+            'metadata': self._metadata or {},
+            'ports': self._ports or [],
+            'services': self._services or [],
+            'vulnerability_data': self._vulnerability_data or {},
+            'vulnerabilities': self._vulnerabilities or [],
+            'exploit_data': self._exploit_data or {}
+        }
+    
+    def __repr__(self) -> str:
+        return (f"ScanNode(node_id={self.node_id!r}, type={self.type}, data={self.data!r}, "
+                f"source={self.source!r}, depth={self.depth}, module={self.module!r})")
 
 class PropagationEngine:
     """Движок авто-распространения сканирования с поддержкой эксплуатации"""
     
+    # Запас токенов модуля в секундах работы на полной скорости
+    RATE_BURST_WINDOW = 0.1
+    
     def __init__(self, update_callback: Optional[Callable] = None):
         # Инициализация ConfigManager внутри движка
         self.config_manager = ConfigManager()
@@ -77,16 +196,63 @@ class PropagationEngine:
         self.max_depth = engine_config.get('max_depth', 10)
         self.max_concurrent_tasks = engine_config.get('max_concurrent_tasks', 5)
         self.rate_limit = engine_config.get('rate_limit', 10)
+        self.queue_poll_interval = engine_config.get('queue_poll_interval', 0.5)
+        self.priority_policy = TaskPriorityPolicy(engine_config.get('priority', {}))
+        self.batch_policy = BatchPolicy(engine_config.get('batching', {}))
+        # Потоковые модули (scan_stream) отдают находки по мере обнаружения
+        self.streaming_enabled = engine_config.get('streaming', True)
+        # Симуляция находок - только для демонстрации, в рабочих запусках выключена
+        self.simulate_findings_enabled = engine_config.get('simulate_findings', False)
+        
+        # Таблица маршрутов: тип выхода модуля -> обработчик результата
+        self.result_router = ResultRouter({
+            'subdomains': self._route_subdomains,
+            'active_hosts': self._route_active_hosts,
+            'open_ports': self._route_open_ports,
+            'services': self._route_services,
+            'vulnerabilities': self._route_vulnerabilities,
+            'exploitation_results': self._route_exploitation_results,
+            'internal_hosts': self._route_internal_hosts
+        })
+        
+        # Общий регулятор нагрузки на цели, передается всем модулям
+        self.rate_governor = RateGovernor.from_config(engine_config.get('rate_governor', {}))
+        # Общий кэш доступности хостов: заполняется по результатам ping_scanner
+        self.liveness = LivenessCache.from_config(engine_config.get('liveness', {}))
         
         # Инициализация остальных атрибутов
-        self.discovered_nodes: List[ScanNode] = []
-        self.pending_scans = Queue()
+        # Репозиторий узлов (память или SQLite) с индексами по типу, глубине,
+        # источнику, цели и каноническому ключу (тип, нормализованная цель, модуль)
+        self.discovered_nodes: NodeRepository = create_node_repository(
+            engine_config.get('node_store', {}), self._node_to_dict, self._node_from_dict
+        )
+        # Очереди хранят элементы (приоритет, порядковый номер, узел)
+        self.pending_scans = PriorityQueue()
+        self._work_queue: Optional[asyncio.PriorityQueue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Открытые партии задач: (модуль, вид входных данных) -> TaskBatch
+        self._open_batches: Dict[Tuple[str, str], TaskBatch] = {}
         self.completed_scans: Dict[str, Dict] = {}
+        # Узлы, выполнение которых уже началось (входные данные переданы модулю)
+        self._running_scans: Set[str] = set()
+        self._follow_up_ids = itertools.count(1)
         self.active_modules: Dict[str, Any] = {}
         self.scan_depth = 0
         self.is_running = False
         self.update_callback = update_callback
         
+        # Шина событий для GUI: движок публикует без ожидания, GUI забирает раз в кадр
+        self.event_bus = EventBus(engine_config.get('event_bus', {}).get('capacity', 10000))
+        
+        # Лента изменений: node_id -> номер последнего изменения, в порядке изменений.
+        # Читается из потока GUI через changes_since()
+        self.change_seq = 0
+        self._changes: "OrderedDict[str, int]" = OrderedDict()
+        self._changes_lock = threading.Lock()
+        
+        # Журнал контрольных точек для возобновления после перезапуска
+        self.checkpoint: Optional[CheckpointJournal] = None
+        
         self.stats = {
             'total_scans': 0,
             'successful_scans': 0,
@@ -96,7 +262,10 @@ class PropagationEngine:
             'vulnerabilities_found': 0,
             'exploits_attempted': 0,
             'exploits_successful': 0,
-            'lateral_movements': 0
+            'lateral_movements': 0,
+            'duplicates_merged': 0,
+            'batches_executed': 0,
+            'follow_up_scans': 0
         }
         
         # Настройка логирования с использованием конфига
@@ -111,6 +280,14 @@ class PropagationEngine:
         
         self.logger.info(f"PropagationEngine инициализирован с настройками из конфига")
         self.logger.info(f"Глубина: {self.max_depth}, Потоки: {self.max_concurrent_tasks}, Лимит: {self.rate_limit}/сек")
+        
+        checkpoint_config = engine_config.get('checkpoint', {})
+        if checkpoint_config.get('enabled', False):
+            self.enable_checkpoint(
+                checkpoint_config.get('path', 'rapidrecon_checkpoint.jsonl'),
+                flush_interval=checkpoint_config.get('flush_interval', 5.0),
+                flush_every=checkpoint_config.get('flush_every', 200)
+            )
     
     def set_scan_profile(self, profile_name: str) -> bool:
         """Установить профиль сканирования"""
@@ -120,6 +297,7 @@ class PropagationEngine:
             profile_config = self.config_manager.get_active_config()
             self.rate_limit = profile_config.get('rate_limit', self.rate_limit)
             self.max_depth = profile_config.get('max_depth', self.max_depth)
+            self._apply_profile_rates()
             
             # Обновляем настройки модулей
             for module_name, module in self.active_modules.items():
@@ -162,6 +340,12 @@ class PropagationEngine:
             self.max_depth = engine_config.get('max_depth', self.max_depth)
             self.max_concurrent_tasks = engine_config.get('max_concurrent_tasks', self.max_concurrent_tasks)
             self.rate_limit = engine_config.get('rate_limit', self.rate_limit)
+            self.priority_policy = TaskPriorityPolicy(engine_config.get('priority', {}))
+            self.batch_policy = BatchPolicy(engine_config.get('batching', {}))
+            self.streaming_enabled = engine_config.get('streaming', self.streaming_enabled)
+            self.simulate_findings_enabled = engine_config.get('simulate_findings', self.simulate_findings_enabled)
+            
+            self._apply_profile_rates()
             
             self.logger.info("Конфигурация перезагружена из файлов")
             self._notify_gui_update('config_reloaded')
@@ -196,8 +380,12 @@ class PropagationEngine:
             module=module,
             metadata={'priority': 'high', 'target_type': self._get_target_type(target)}
         )
-        self.discovered_nodes.append(initial_node)
-        self.pending_scans.put(initial_node)
+        if self._merge_duplicate(initial_node):
+            return
+        
+        self._store_node(initial_node)
+        self._record_node(initial_node)
+        self._enqueue(initial_node)
         self.stats['nodes_discovered'] += 1
         
         # Уведомляем GUI о новом узле
@@ -252,8 +440,12 @@ class PropagationEngine:
             vulnerabilities=vulnerabilities or [],
             exploit_data=exploit_data or {}
         )
-        self.discovered_nodes.append(node)
-        self.pending_scans.put(node)
+        if self._merge_duplicate(node):
+            return
+        
+        self._store_node(node)
+        self._record_node(node)
+        self._enqueue(node)
         self.stats['nodes_discovered'] += 1
         self.logger.info(f"Добавлен кастомный узел: {node_type.value} -> {data} (модуль: {module})")
         
@@ -281,7 +473,10 @@ class PropagationEngine:
                         module_instance.update_config(module_config)
             else:
                 module_instance = module_class()
-                
+            
+            self._attach_rate_governor(module_name, module_instance)
+            self._attach_liveness(module_name, module_instance)
+            self._register_routes(module_name, module_class, module_instance)
             self.active_modules[module_name] = module_instance
             self.logger.info(f"Модуль зарегистрирован: {module_name}")
             
@@ -293,11 +488,87 @@ class PropagationEngine:
             # Создаем модуль без конфига как fallback
             try:
                 module_instance = module_class()
+                self._attach_rate_governor(module_name, module_instance)
+                self._attach_liveness(module_name, module_instance)
+                self._register_routes(module_name, module_class, module_instance)
                 self.active_modules[module_name] = module_instance
                 self.logger.info(f"Модуль зарегистрирован (без конфига): {module_name}")
             except Exception as e2:
                 self.logger.error(f"Не удалось создать модуль {module_name}: {e2}")
     
+    def _register_routes(self, module_name: str, module_class, module_instance):
+        """Компиляция маршрутов результатов модуля из module_info.json"""
+        module_info = ResultRouter.load_module_info(module_class)
+        if not module_info and hasattr(module_instance, 'output_types'):
+            module_info = {'output_types': module_instance.output_types}
+        if not module_info:
+            # Без описания модуль маршрутизируется по ключам результата
+            self.logger.debug(f"Модуль {module_name}: module_info.json не найден")
+            return
+        
+        routed = self.result_router.register(module_name, module_info)
+        self.logger.debug(f"Маршруты модуля {module_name}: {routed}")
+    
+    def _attach_rate_governor(self, module_name: str, module_instance):
+        """Передача общего регулятора нагрузки модулю"""
+        if hasattr(module_instance, 'rate_governor'):
+            module_instance.rate_governor = self.rate_governor
+            self._apply_profile_rates([module_name])
+            self.logger.debug(f"Модулю {module_name} назначен общий регулятор нагрузки")
+    
+    def _apply_profile_rates(self, module_names: Optional[List[str]] = None):
+        """
+        Лимиты регулятора нагрузки по активному профилю
+        
+        global_rate и module_rates из engine.rate_governor рассчитаны на
+        скорость engine.rate_limit; профиль масштабирует их пропорционально
+        своему rate_limit (stealth с rate_limit 2 при базовых 10 - в 5 раз
+        медленнее). Явные module_rates профиля задают лимит модуля напрямую.
+        Запас токенов - RATE_BURST_WINDOW секунды работы на полной скорости,
+        чтобы смена профиля не обходилась начальным всплеском.
+        
+        Args:
+            module_names: Модули для настройки (по умолчанию - все известные)
+        """
+        engine_config = self.config_manager.get_engine_config()
+        governor_config = engine_config.get('rate_governor', {})
+        profile_config = self.config_manager.get_active_config()
+        
+        base_rate = engine_config.get('rate_limit') or 10
+        scale = profile_config.get('rate_limit', base_rate) / base_rate
+        
+        def scaled(rate: Optional[float]) -> Optional[float]:
+            return rate * scale if rate else rate
+        
+        def burst(rate: Optional[float]) -> Optional[float]:
+            return max(1.0, rate * self.RATE_BURST_WINDOW) if rate else None
+        
+        global_rate = scaled(governor_config.get('global_rate'))
+        global_burst = governor_config.get('global_burst')
+        if global_rate and global_burst:
+            # Медленный профиль уменьшает и всплеск, быстрый его не раздувает
+            global_burst = max(1.0, global_burst * min(scale, 1.0))
+        self.rate_governor.set_global_rate(global_rate, global_burst)
+        
+        module_rates = {
+            name: scaled(rate) for name, rate in governor_config.get('module_rates', {}).items()
+        }
+        module_rates.update(profile_config.get('module_rates', {}))
+        if module_names is None:
+            module_names = set(module_rates) | set(self.active_modules)
+        for module_name in module_names:
+            if module_name in module_rates:
+                rate = module_rates[module_name]
+                self.rate_governor.configure_module(module_name, rate, burst(rate))
+        
+        self.logger.debug(f"Лимиты регулятора по профилю {self.config_manager.active_profile}: x{scale:g}")
+    
+    def _attach_liveness(self, module_name: str, module_instance):
+        """Передача общего кэша доступности хостов модулю"""
+        if hasattr(module_instance, 'liveness'):
+            module_instance.liveness = self.liveness
+            self.logger.debug(f"Модулю {module_name} назначен общий кэш доступности хостов")
+    
     def register_callback(self, event_type: str, callback: Callable):
         """Регистрация callback-функций для событий"""
         if not hasattr(self, 'callbacks'):
@@ -306,7 +577,14 @@ class PropagationEngine:
         self.logger.info(f"Callback зарегистрирован для события: {event_type}")
     
     def _notify_gui_update(self, event_type: str, data: Any = None):
-        """Уведомление GUI об обновлении"""
+        """
+        Уведомление GUI об обновлении
+        
+        Событие публикуется в шину событий (не блокирует движок). Синхронный
+        update_callback поддерживается для внешних потребителей и вызывается
+        в потоке движка.
+        """
+        self.event_bus.publish(event_type, data)
         if self.update_callback:
             try:
                 self.update_callback(event_type, data)
@@ -314,7 +592,7 @@ class PropagationEngine:
                 self.logger.warning(f"Ошибка при вызове GUI callback: {e}")
     
     async def process_queue(self):
-        """Асинхронная обработка очереди задач"""
+        """Асинхронная обработка очереди задач пулом постоянных воркеров"""
         self.is_running = True
         self.logger.info("Запуск обработки очереди задач...")
         
@@ -326,44 +604,203 @@ class PropagationEngine:
         # Уведомляем GUI о начале сканирования
         self._notify_gui_update('scan_started')
         
-        semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+        # Рабочая очередь живет в event loop движка; pending_scans остается
+        # потокобезопасным входом для целей, добавленных из других потоков
+        self._loop = asyncio.get_running_loop()
+        self._work_queue = asyncio.PriorityQueue()
+        self._transfer_pending_scans()
+        
+        # Каждый воркер забирает следующую задачу сразу после завершения предыдущей,
+        # поэтому медленная задача занимает только свой слот
+        workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(max(1, self.max_concurrent_tasks))
+        ]
+        
+        try:
+            await self._wait_for_drain()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            
+            # Невыполненные задачи возвращаем во входную очередь для следующего запуска
+            while not self._work_queue.empty():
+                self.pending_scans.put(self._work_queue.get_nowait())
+            self._work_queue = None
+            self._loop = None
+            
+            self.discovered_nodes.flush()
+            if self.checkpoint is not None:
+                self.checkpoint.record_stats(self.stats)
+                self.checkpoint.flush()
         
-        async def process_with_semaphore(task):
-            async with semaphore:
-                return await self.execute_task(task)
+        self.logger.info("Обработка очереди завершена")
+        self.is_running = False
         
-        while self.is_running and not self.pending_scans.empty():
-            tasks = []
-            # Собираем задачи для параллельного выполнения
-            while len(tasks) < self.max_concurrent_tasks and not self.pending_scans.empty():
-                task = self.pending_scans.get()
-                if task.depth <= self.max_depth:
-                    task_coroutine = process_with_semaphore(task)
-                    tasks.append(task_coroutine)
+        # Уведомляем GUI о завершении сканирования
+        self._notify_gui_update('scan_completed')
+    
+    async def _worker(self, worker_id: int):
+        """Воркер пула: выполняет задачи из рабочей очереди по одной или партиями"""
+        while True:
+            entry = await self._work_queue.get()
+            task = entry[2]
+            if not (self.is_running and task.depth <= self.max_depth):
+                self._work_queue.task_done()
+                continue
+            
+            batch_key = self._batch_key(task)
+            if batch_key is not None and self._join_open_batch(batch_key, entry):
+                # Задачу выполнит лидер партии, воркер сразу берет следующую
+                continue
+            
+            entries = [entry]
+            try:
+                if batch_key is not None:
+                    entries = await self._collect_batch(batch_key, entry)
+                if len(entries) == 1:
+                    await self.execute_task(task)
+                else:
+                    await self.execute_batch([batch_entry[2] for batch_entry in entries])
+            except Exception as e:
+                self.logger.error(f"Воркер {worker_id}: необработанная ошибка задачи {task.data}: {e}")
+            finally:
+                # Лидер отчитывается за все задачи партии
+                for _ in entries:
+                    self._work_queue.task_done()
             
-            # Запускаем задачи конкурентно
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+            # Изменения узлов фиксируются одной транзакцией на задачу
+            self.discovered_nodes.flush()
+            if self.checkpoint is not None:
+                self.checkpoint.maybe_flush()
             
             # Уведомляем GUI о прогрессе
             self._notify_gui_update('progress_update', {
-                'pending_tasks': self.pending_scans.qsize(),
+                'pending_tasks': self.get_pending_count(),
                 'completed_tasks': len(self.completed_scans),
                 'discovered_nodes': len(self.discovered_nodes),
                 'vulnerabilities_found': self.stats['vulnerabilities_found'],
                 'exploits_successful': self.stats['exploits_successful']
             })
+    
+    def _batch_key(self, task: ScanNode) -> Optional[Tuple[str, str]]:
+        """Ключ партии задачи или None, если задачу нельзя объединять"""
+        module_name = self._resolve_module_name(task)
+        if not module_name or not self.batch_policy.allows(module_name):
+            return None
+        scan_method, _ = self._scan_method(self.active_modules.get(module_name))
+        if scan_method is None:
+            return None
+        return (module_name, self._payload_kind(task))
+    
+    def _join_open_batch(self, batch_key: Tuple[str, str], entry: Tuple) -> bool:
+        """Присоединение задачи к открытой партии того же модуля"""
+        batch = self._open_batches.get(batch_key)
+        if batch is None:
+            return False
         
-        self.logger.info("Обработка очереди завершена")
-        self.is_running = False
+        batch.entries.append(entry)
+        if len(batch.entries) >= self.batch_policy.max_batch_size:
+            # Партия заполнена - закрываем ее и будим лидера
+            del self._open_batches[batch_key]
+            batch.full.set()
+        return True
+    
+    async def _collect_batch(self, batch_key: Tuple[str, str], entry: Tuple) -> List[Tuple]:
+        """
+        Сбор партии лидером: ожидание попутных задач того же модуля
+        не дольше max_wait или до заполнения партии
+        """
+        batch = TaskBatch(batch_key)
+        batch.entries.append(entry)
+        self._open_batches[batch_key] = batch
         
-        # Уведомляем GUI о завершении сканирования
-        self._notify_gui_update('scan_completed')
+        try:
+            # Пустая очередь - объединять не с чем, не задерживаем задачу
+            if not self._work_queue.empty():
+                await asyncio.wait_for(batch.full.wait(), timeout=self.batch_policy.max_wait)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Остановка движка: несобранную партию возвращаем во входную очередь
+            for batch_entry in batch.entries:
+                self.pending_scans.put(batch_entry)
+            raise
+        finally:
+            if self._open_batches.get(batch_key) is batch:
+                del self._open_batches[batch_key]
+        
+        return batch.entries
+    
+    async def _wait_for_drain(self):
+        """
+        Ожидание опустошения очереди.
+        
+        Очередь считается опустошенной, когда все задачи (включая дочерние,
+        добавленные во время выполнения) завершены и входная очередь пуста.
+        """
+        drained = asyncio.ensure_future(self._work_queue.join())
+        try:
+            while self.is_running:
+                done, _ = await asyncio.wait({drained}, timeout=self.queue_poll_interval)
+                if not done:
+                    continue
+                
+                if self.pending_scans.empty():
+                    return
+                
+                # Пока воркеры простаивали, из другого потока пришли новые цели
+                self._transfer_pending_scans()
+                drained = asyncio.ensure_future(self._work_queue.join())
+        finally:
+            drained.cancel()
+    
+    def _transfer_pending_scans(self):
+        """Перенос задач из входной очереди в рабочую очередь воркеров"""
+        if self._work_queue is None:
+            return
+        while not self.pending_scans.empty():
+            try:
+                self._work_queue.put_nowait(self.pending_scans.get_nowait())
+            except Empty:
+                break
+    
+    def _enqueue(self, node: ScanNode):
+        """Постановка узла в очередь сканирования с учетом приоритета"""
+        entry = self.priority_policy.make_entry(node)
+        loop = self._loop
+        if loop is None:
+            self.pending_scans.put(entry)
+            return
+        
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        
+        if current_loop is loop and self._work_queue is not None:
+            self._work_queue.put_nowait(entry)
+        else:
+            # Вызов из другого потока (например, GUI) - передаем через event loop движка
+            self.pending_scans.put(entry)
+            try:
+                loop.call_soon_threadsafe(self._transfer_pending_scans)
+            except RuntimeError:
+                pass  # Loop уже закрыт, задача останется во входной очереди
+    
+    def get_pending_count(self) -> int:
+        """Количество задач, ожидающих выполнения"""
+        pending = self.pending_scans.qsize()
+        if self._work_queue is not None:
+            pending += self._work_queue.qsize()
+        return pending
     
     async def execute_task(self, task: ScanNode):
         """Выполнение одной задачи сканирования"""
         self.logger.info(f"Выполняется задача: {task.module} -> {task.data} (глубина: {task.depth})")
         self.stats['total_scans'] += 1
+        self._running_scans.add(task.node_id)
         
         # Уведомляем GUI о начале задачи
         self._notify_gui_update('task_started', task)
@@ -387,309 +824,524 @@ class PropagationEngine:
                 # Поведение по умолчанию при отсутствии модуля
                 await self.default_scan_behavior(task)
             
-            self.stats['successful_scans'] += 1
-            self.completed_scans[task.node_id] = {
-                'status': 'completed',
-                'result': 'success',
-                'timestamp': time.time(),
-                'module': task.module
-            }
-            
-            # Уведомляем GUI о завершении задачи
-            self._notify_gui_update('task_completed', task)
-            
-            # Вызов callback при успешном выполнении
-            if hasattr(self, 'callbacks') and 'scan_completed' in self.callbacks:
-                self.callbacks['scan_completed'](task)
+            self._complete_task(task)
                 
         except asyncio.TimeoutError:
             self.logger.warning(f"Таймаут задачи: {task.data}")
-            self.stats['failed_scans'] += 1
-            self.completed_scans[task.node_id] = {
-                'status': 'failed',
-                'error': 'timeout',
-                'timestamp': time.time(),
-                'module': task.module
-            }
-            
-            # Уведомляем GUI об ошибке
-            self._notify_gui_update('task_failed', {
-                'task': task,
-                'error': 'timeout'
-            })
+            self._fail_task(task, 'timeout')
             
         except Exception as e:
             self.logger.error(f"Ошибка выполнения задачи {task.data}: {e}")
-            self.stats['failed_scans'] += 1
-            self.completed_scans[task.node_id] = {
-                'status': 'failed',
-                'error': str(e),
-                'timestamp': time.time(),
-                'module': task.module
-            }
+            self._fail_task(task, str(e))
+    
+    async def execute_batch(self, tasks: List[ScanNode]):
+        """
+        Выполнение партии задач одного модуля одним вызовом scan()
+        
+        Результаты разделяются по исходным узлам, поэтому дочерние узлы,
+        статистика и события GUI такие же, как при выполнении задач по одной.
+        """
+        module_name = self._resolve_module_name(tasks[0])
+        module = self.active_modules.get(module_name)
+        
+        self.logger.info(f"Выполняется партия задач: {module_name} x{len(tasks)}")
+        self.stats['total_scans'] += len(tasks)
+        self.stats['batches_executed'] += 1
+        
+        for task in tasks:
+            self._running_scans.add(task.node_id)
+            self._notify_gui_update('task_started', task)
+        
+        scan_method, streaming = self._scan_method(module)
+        try:
+            module_config = self.config_manager.get_module_config(module_name)
+            # Цели партии обрабатываются параллельно: таймаут растет по "волнам" целей
+            timeout = self.batch_policy.timeout(
+                module_name, module_config.get('timeout', 30.0), len(tasks))
             
-            # Уведомляем GUI об ошибке
-            self._notify_gui_update('task_failed', {
-                'task': task,
-                'error': str(e)
-            })
+            payload = self._build_scan_payload(tasks, self._payload_kind(tasks[0]))
+            if streaming:
+                await asyncio.wait_for(self._consume_stream(scan_method(payload), tasks), timeout=timeout)
+            else:
+                results = await asyncio.wait_for(scan_method(payload), timeout=timeout)
+            self.stats['modules_executed'] += 1
+            
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Таймаут партии задач модуля {module_name} ({len(tasks)} задач)")
+            for task in tasks:
+                self._fail_task(task, 'timeout')
+            return
+            
+        except Exception as e:
+            self.logger.error(f"Ошибка выполнения партии задач модуля {module_name}: {e}")
+            for task in tasks:
+                self._fail_task(task, str(e))
+            return
+        
+        if streaming:
+            # Находки уже обработаны по мере поступления
+            for task in tasks:
+                self._complete_task(task)
+            return
+        
+        for task, task_results in self._split_batch_results(results, tasks):
+            try:
+                await self.process_module_results(task_results, task)
+                self._complete_task(task)
+            except Exception as e:
+                self.logger.error(f"Ошибка обработки результатов задачи {task.data}: {e}")
+                self._fail_task(task, str(e))
+    
+    def _complete_task(self, task: ScanNode):
+        """Учет успешно выполненной задачи"""
+        self._running_scans.discard(task.node_id)
+        self.stats['successful_scans'] += 1
+        self.completed_scans[task.node_id] = {
+            'status': 'completed',
+            'result': 'success',
+            'timestamp': time.time(),
+            'module': task.module
+        }
+        self._record_completed(task)
+        
+        # Уведомляем GUI о завершении задачи
+        self._notify_gui_update('task_completed', task)
+        
+        # Вызов callback при успешном выполнении
+        if hasattr(self, 'callbacks') and 'scan_completed' in self.callbacks:
+            self.callbacks['scan_completed'](task)
+    
+    def _fail_task(self, task: ScanNode, error: str):
+        """Учет задачи, завершившейся ошибкой или таймаутом"""
+        self._running_scans.discard(task.node_id)
+        self.stats['failed_scans'] += 1
+        self.completed_scans[task.node_id] = {
+            'status': 'failed',
+            'error': error,
+            'timestamp': time.time(),
+            'module': task.module
+        }
+        self._record_completed(task)
+        
+        # Уведомляем GUI об ошибке
+        self._notify_gui_update('task_failed', {
+            'task': task,
+            'error': error
+        })
+    
+    def _record_completed(self, task: ScanNode):
+        """Запись итога задачи в журнал контрольных точек"""
+        if self.checkpoint is not None:
+            self.checkpoint.record_completed(task.node_id, self.completed_scans[task.node_id])
     
     async def run_module(self, module, task: ScanNode):
         """Запуск модуля сканирования"""
+        scan_method, streaming = self._scan_method(module)
+        
         # Если модуль имеет метод scan, используем его
-        if hasattr(module, 'scan'):
-            # Передаем дополнительные данные если есть
-            scan_data = [task.data]
-            if task.services:
-                # Для vulnerability_scanner передаем информацию о сервисах
-                scan_data = [task.data, task.services]
-            elif task.vulnerabilities:
-                # Для exploitation модуля передаем уязвимости
-                scan_data = [task.data, task.vulnerabilities]
-            
-            results = await module.scan(scan_data)
-            await self.process_module_results(results, task)
-        else:
+        if scan_method is None:
             # Запасной вариант для кастомных модулей
             await self.default_scan_behavior(task)
+            return
+        
+        payload = self._build_scan_payload([task], self._payload_kind(task))
+        if streaming:
+            await self._consume_stream(scan_method(payload), [task])
+        else:
+            results = await scan_method(payload)
+            await self.process_module_results(results, task)
     
-    async def process_module_results(self, results: Dict[str, Any], source_task: ScanNode):
-        """Обработка результатов модуля сканирования"""
+    def _scan_method(self, module) -> Tuple[Optional[Callable], bool]:
+        """
+        Метод сканирования модуля и признак потокового протокола
         
-        # Обработка результатов subdomain_scanner
-        if results.get("module") == "subdomain_scanner" and results.get("subdomains"):
-            for subdomain_info in results["subdomains"]:
-                new_node = ScanNode(
-                    node_id=f"subdomain_{subdomain_info['subdomain']}_{int(time.time())}",
-                    type=NodeType.SUBDOMAIN,
-                    data=subdomain_info["subdomain"],
-                    source=source_task.node_id,
-                    depth=source_task.depth + 1,
-                    timestamp=time.time(),
-                    module='ping_scanner',
-                    metadata={
-                        'confidence': subdomain_info.get('confidence', 0.8),
-                        'source': subdomain_info.get('source', 'unknown')
-                    }
+        Потоковый модуль реализует scan_stream() (или scan() как async-генератор),
+        выдающий словари в формате результата scan() по мере находок.
+        """
+        if module is None:
+            return None, False
+        if self.streaming_enabled and hasattr(module, 'scan_stream'):
+            return module.scan_stream, True
+        if hasattr(module, 'scan'):
+            return module.scan, inspect.isasyncgenfunction(module.scan)
+        return None, False
+    
+    async def _consume_stream(self, stream: AsyncIterator[Dict[str, Any]], tasks: List[ScanNode]):
+        """Обработка находок потокового модуля по мере их поступления"""
+        try:
+            async for chunk in stream:
+                if len(tasks) == 1:
+                    parts = [(tasks[0], chunk)]
+                else:
+                    parts = self._split_batch_results(chunk, tasks)
+                
+                for task, task_chunk in parts:
+                    # Пустая порция - не повод для симуляции находок
+                    await self.process_module_results(task_chunk, task, simulate=False)
+        finally:
+            await stream.aclose()
+    
+    @staticmethod
+    def _payload_kind(task: ScanNode) -> str:
+        """Вид входных данных модуля для задачи"""
+        if task._services:
+            # Для vulnerability_scanner передаем информацию о сервисах
+            return 'services'
+        if task._vulnerabilities:
+            # Для exploitation модуля передаем уязвимости
+            return 'vulnerabilities'
+        if task._ports:
+            # Для service_detector передаем открытые порты
+            return 'ports'
+        return 'targets'
+    
+    @staticmethod
+    def _build_scan_payload(tasks: List[ScanNode], kind: str) -> Any:
+        """
+        Входные данные scan() для одной или нескольких задач
+        
+        targets - список целей, ports/services - словарь хост -> порты/сервисы,
+        vulnerabilities - общий список уязвимостей.
+        """
+        if kind == 'services':
+            services_data: Dict[str, List[Dict]] = {}
+            for task in tasks:
+                services_data.setdefault(task.data, []).extend(task.services)
+            return services_data
+        
+        if kind == 'vulnerabilities':
+            return [vuln for task in tasks for vuln in task.vulnerabilities]
+        
+        if kind == 'ports':
+            open_ports_data: Dict[str, List[Dict]] = {}
+            for task in tasks:
+                open_ports_data.setdefault(task.data, []).extend(
+                    {'host': task.data, 'port': port, 'protocol': 'tcp', 'status': 'open'}
+                    for port in task.ports
                 )
-                await self.add_discovered_node(new_node)
+            return open_ports_data
+        
+        # Одинаковые цели передаем модулю один раз
+        return list(dict.fromkeys(task.data for task in tasks))
+    
+    def _split_batch_results(self, results: Dict[str, Any],
+                             tasks: List[ScanNode]) -> List[Tuple[ScanNode, Dict[str, Any]]]:
+        """
+        Разделение результатов партии по исходным узлам
+        
+        Словари с ключами-хостами делятся по ключу, элементы списков относятся
+        к задаче по хосту внутри элемента (ip/host/target/source, в том числе
+        во вложенных service/vulnerability). Элементы без хоста или с хостом
+        вне партии, как и остальные значения, копируются во все задачи -
+        повторные находки отсекает дедупликация узлов.
+        """
+        owners: Dict[str, int] = {}
+        for index, task in enumerate(tasks):
+            owners.setdefault(self._normalize_target(task.get_meta('target', task.data)), index)
+        
+        parts: List[Dict[str, Any]] = [{} for _ in tasks]
+        for key, value in results.items():
+            if isinstance(value, dict) and value and all(
+                    self._normalize_target(host) in owners for host in value):
+                for part in parts:
+                    part[key] = {}
+                for host, item in value.items():
+                    parts[owners[self._normalize_target(host)]][key][host] = item
+            
+            elif isinstance(value, list):
+                for part in parts:
+                    part[key] = []
+                for item in value:
+                    host = self._result_host(item)
+                    index = owners.get(self._normalize_target(host)) if host is not None else None
+                    if index is None:
+                        for part in parts:
+                            part[key].append(item)
+                    else:
+                        parts[index][key].append(item)
+            
+            else:
+                for part in parts:
+                    part[key] = value
         
-        # Обработка результатов ping_scanner
-        elif results.get("module") == "ping_scanner" and results.get("active_hosts"):
-            for host in results["active_hosts"]:
+        return list(zip(tasks, parts))
+    
+    @classmethod
+    def _result_host(cls, item: Any) -> Optional[Any]:
+        """Хост, к которому относится элемент результата модуля"""
+        if not isinstance(item, dict):
+            return None
+        for key in ('ip', 'host', 'target', 'source'):
+            if item.get(key):
+                return item[key]
+        for key in ('service', 'vulnerability'):
+            host = cls._result_host(item.get(key))
+            if host is not None:
+                return host
+        return None
+    
+    async def process_module_results(self, results: Dict[str, Any], source_task: ScanNode,
+                                     simulate: bool = True):
+        """
+        Обработка результатов модуля сканирования
+        
+        Результат разбирается по таблице маршрутов: каждый тип выхода модуля
+        (ключ результата) передается своему обработчику.
+        
+        Args:
+            results: Результат scan() или порция потокового модуля
+            source_task: Узел, для которого выполнялся модуль
+            simulate: Разрешить симуляцию находок для нераспознанного результата
+                (только при включенном engine.simulate_findings)
+        """
+        module_name = results.get("module")
+        routed = False
+        
+        for output_type, handler in self.result_router.routes_for(module_name, results):
+            items = results.get(output_type)
+            if items:
+                await handler(items, source_task)
+                routed = True
+        
+        if not routed:
+            if simulate and self.simulate_findings_enabled:
+                # Демонстрационный режим: симулируем находки
+                new_nodes = self.simulate_findings(source_task)
+                await self.process_findings(new_nodes, source_task)
+            else:
+                self.logger.debug(f"Результат модуля {module_name} для {source_task.data} не содержит находок")
+        
+        # Уведомляем GUI о результатах модуля
+        self._notify_gui_update('module_results', {
+            'task': source_task,
+            'results': results
+        })
+    
+    async def _route_subdomains(self, subdomains: List[Dict], source_task: ScanNode):
+        """Обработка результатов subdomain_scanner"""
+        for subdomain_info in subdomains:
+            new_node = ScanNode(
+                node_id=f"subdomain_{subdomain_info['subdomain']}_{int(time.time())}",
+                type=NodeType.SUBDOMAIN,
+                data=subdomain_info["subdomain"],
+                source=source_task.node_id,
+                depth=source_task.depth + 1,
+                timestamp=time.time(),
+                module='ping_scanner',
+                metadata={
+                    'confidence': subdomain_info.get('confidence', 0.8),
+                    'source': subdomain_info.get('source', 'unknown')
+                }
+            )
+            await self.add_discovered_node(new_node)
+    
+    async def _route_active_hosts(self, active_hosts: List[Dict], source_task: ScanNode):
+        """Обработка результатов ping_scanner"""
+        for host in active_hosts:
+            new_node = ScanNode(
+                node_id=f"active_host_{host['ip']}_{int(time.time())}",
+                type=NodeType.ACTIVE_HOST,
+                data=host["ip"],
+                source=source_task.node_id,
+                depth=source_task.depth + 1,
+                timestamp=time.time(),
+                module='port_scanner',
+                metadata={
+                    'host_status': 'active', 
+                    'response_time': host.get('response_time'),
+                    'original_target': source_task.data
+                }
+            )
+            await self.add_discovered_node(new_node)
+        
+        # Дополнительная логика: для доменов запускаем поиск поддоменов
+        if (source_task.type == NodeType.INITIAL_TARGET and 
+            self._is_domain(source_task.data)):
+            domain_scan_node = ScanNode(
+                node_id=f"domain_scan_{source_task.data}_{int(time.time())}",
+                type=NodeType.DOMAIN_SCAN,
+                data=source_task.data,
+                source=source_task.node_id,
+                depth=source_task.depth + 1,
+                timestamp=time.time(),
+                module='subdomain_scanner',
+                metadata={'triggered_by': 'ping_scanner_results'}
+            )
+            await self.add_discovered_node(domain_scan_node)
+    
+    async def _route_open_ports(self, open_ports: Dict[str, List[Dict]], source_task: ScanNode):
+        """Обработка результатов port_scanner"""
+        for host, ports in open_ports.items():
+            if ports:  # Если есть открытые порты
                 new_node = ScanNode(
-                    node_id=f"active_host_{host['ip']}_{int(time.time())}",
-                    type=NodeType.ACTIVE_HOST,
-                    data=host["ip"],
+                    node_id=f"open_ports_{host}_{int(time.time())}",
+                    type=NodeType.OPEN_PORTS,
+                    data=host,
                     source=source_task.node_id,
                     depth=source_task.depth + 1,
                     timestamp=time.time(),
-                    module='port_scanner',
-                    metadata={
-                        'host_status': 'active', 
-                        'response_time': host.get('response_time'),
-                        'original_target': source_task.data
-                    }
+                    module='service_detector',
+                    metadata={'port_count': len(ports)},
+                    ports=[port_info["port"] for port_info in ports]
                 )
                 await self.add_discovered_node(new_node)
-            
-            # Дополнительная логика: для доменов запускаем поиск поддоменов
-            if (source_task.type == NodeType.INITIAL_TARGET and 
-                self._is_domain(source_task.data)):
-                domain_scan_node = ScanNode(
-                    node_id=f"domain_scan_{source_task.data}_{int(time.time())}",
-                    type=NodeType.DOMAIN_SCAN,
-                    data=source_task.data,
+    
+    async def _route_services(self, services_by_host: Dict[str, List[Dict]], source_task: ScanNode):
+        """Обработка результатов service_detector"""
+        for host, services in services_by_host.items():
+            if services:  # Если есть сервисы
+                # Создаем узел для сканирования уязвимостей
+                vulnerability_scan_node = ScanNode(
+                    node_id=f"vuln_scan_{host}_{int(time.time())}",
+                    type=NodeType.VULNERABILITY_SCAN,
+                    data=host,
                     source=source_task.node_id,
                     depth=source_task.depth + 1,
                     timestamp=time.time(),
-                    module='subdomain_scanner',
-                    metadata={'triggered_by': 'ping_scanner_results'}
+                    module='vulnerability_scanner',
+                    metadata={'service_count': len(services)},
+                    services=services
                 )
-                await self.add_discovered_node(domain_scan_node)
-        
-        # Обработка результатов port_scanner
-        elif results.get("module") == "port_scanner" and results.get("open_ports"):
-            for host, ports in results["open_ports"].items():
-                if ports:  # Если есть открытые порты
-                    new_node = ScanNode(
-                        node_id=f"open_ports_{host}_{int(time.time())}",
-                        type=NodeType.OPEN_PORTS,
-                        data=host,
-                        source=source_task.node_id,
-                        depth=source_task.depth + 1,
-                        timestamp=time.time(),
-                        module='service_detector',
-                        metadata={'port_count': len(ports)},
-                        ports=[port_info["port"] for port_info in ports]
-                    )
-                    await self.add_discovered_node(new_node)
-        
-        # Обработка результатов service_detector
-        elif results.get("module") == "service_detector" and results.get("services"):
-            for host, services in results["services"].items():
-                if services:  # Если есть сервисы
-                    # Создаем узел для сканирования уязвимостей
-                    vulnerability_scan_node = ScanNode(
-                        node_id=f"vuln_scan_{host}_{int(time.time())}",
-                        type=NodeType.VULNERABILITY_SCAN,
-                        data=host,
+                await self.add_discovered_node(vulnerability_scan_node)
+                
+                # Также создаем узлы для каждого обнаруженного сервиса.
+                # Сервисы проверяет узел VULNERABILITY_SCAN, эти узлы - для отчета
+                for service_info in services:
+                    service_type = service_info.get('type', service_info.get('service'))
+                    service_node = ScanNode(
+                        node_id=f"service_{service_info['port']}_{service_type}_{int(time.time())}",
+                        type=NodeType.SERVICE,
+                        data=f"{service_info.get('host', host)}:{service_info['port']}",
                         source=source_task.node_id,
                         depth=source_task.depth + 1,
                         timestamp=time.time(),
-                        module='vulnerability_scanner',
-                        metadata={'service_count': len(services)},
-                        services=services
+                        module='report_generator',
+                        metadata={
+                            'service_type': service_type,
+                            'banner': service_info.get('banner'),
+                            'port': service_info.get('port'),
+                            'protocol': service_info.get('protocol', 'tcp')
+                        }
                     )
-                    await self.add_discovered_node(vulnerability_scan_node)
-                    
-                    # Также создаем узлы для каждого обнаруженного сервиса
-                    for service_info in services:
-                        service_node = ScanNode(
-                            node_id=f"service_{service_info['port']}_{service_info['type']}_{int(time.time())}",
-                            type=NodeType.SERVICE,
-                            data=f"{service_info['host']}:{service_info['port']}",
-                            source=source_task.node_id,
-                            depth=source_task.depth + 1,
-                            timestamp=time.time(),
-                            module='vulnerability_scanner',
-                            metadata={
-                                'service_type': service_info.get('type'),
-                                'banner': service_info.get('banner'),
-                                'port': service_info.get('port'),
-                                'protocol': service_info.get('protocol', 'tcp')
-                            }
-                        )
-                        await self.add_discovered_node(service_node)
-        
-        # Обработка результатов vulnerability_scanner
-        elif results.get("module") == "vulnerability_scanner" and results.get("vulnerabilities"):
-            vulnerabilities = results["vulnerabilities"]
-            
-            for vuln in vulnerabilities:
-                self.stats['vulnerabilities_found'] += 1
-                
-                vulnerability_node = ScanNode(
-                    node_id=f"vuln_{vuln.get('cve', vuln['type'])}_{int(time.time())}",
-                    type=NodeType.VULNERABILITY,
-                    data=f"{vuln.get('cve', vuln['type'])} - {vuln['description']}",
-                    source=source_task.node_id,
-                    depth=source_task.depth + 1,
-                    timestamp=time.time(),
-                    module='report_generator',
-                    metadata={
-                        'severity': vuln.get('severity', 'unknown'),
-                        'confidence': vuln.get('confidence', 0.0),
-                        'cvss_score': vuln.get('cvss_score', 0.0)
-                    },
-                    vulnerability_data=vuln
-                )
-                await self.add_discovered_node(vulnerability_node)
-                
-                # Логируем найденную уязвимость
-                self.logger.warning(
-                    f"🔴 Найдена уязвимость: {vuln.get('cve', vuln['type'])} "
-                    f"(Severity: {vuln.get('severity', 'unknown')}) "
-                    f"на {source_task.data}"
-                )
+                    await self.add_discovered_node(service_node)
+    
+    async def _route_vulnerabilities(self, vulnerabilities: List[Dict], source_task: ScanNode):
+        """Обработка результатов vulnerability_scanner"""
+        for vuln in vulnerabilities:
+            self.stats['vulnerabilities_found'] += 1
             
-            # ОБРАБОТКА ЭКСПЛУАТАЦИИ - запускаем эксплуатацию для эксплуатируемых уязвимостей
-            exploitable_vulns = [
-                vuln for vuln in vulnerabilities
-                if vuln.get('exploit_available', False) or 
-                   vuln.get('type') in ['anonymous_ftp', 'exposed_endpoint', 'weak_password']
-            ]
+            vulnerability_node = ScanNode(
+                node_id=f"vuln_{vuln.get('cve', vuln['type'])}_{int(time.time())}",
+                type=NodeType.VULNERABILITY,
+                data=f"{vuln.get('cve', vuln['type'])} - {vuln['description']}",
+                source=source_task.node_id,
+                depth=source_task.depth + 1,
+                timestamp=time.time(),
+                module='report_generator',
+                metadata={
+                    'target': source_task.data,
+                    'severity': vuln.get('severity', 'unknown'),
+                    'confidence': vuln.get('confidence', 0.0),
+                    'cvss_score': vuln.get('cvss_score', 0.0)
+                },
+                vulnerability_data=vuln
+            )
+            await self.add_discovered_node(vulnerability_node)
+            
+            # Логируем найденную уязвимость
+            self.logger.warning(
+                f"🔴 Найдена уязвимость: {vuln.get('cve', vuln['type'])} "
+                f"(Severity: {vuln.get('severity', 'unknown')}) "
+                f"на {source_task.data}"
+            )
+        
+        # ОБРАБОТКА ЭКСПЛУАТАЦИИ - запускаем эксплуатацию для эксплуатируемых уязвимостей
+        exploitable_vulns = [
+            vuln for vuln in vulnerabilities
+            if vuln.get('exploit_available', False) or 
+               vuln.get('type') in ['anonymous_ftp', 'exposed_endpoint', 'weak_password']
+        ]
+        
+        if exploitable_vulns:
+            self.stats['exploits_attempted'] += len(exploitable_vulns)
+            
+            exploitation_node = ScanNode(
+                node_id=f"exploitation_{source_task.data}_{int(time.time())}",
+                type=NodeType.EXPLOITATION,
+                data=f"Exploit {len(exploitable_vulns)} vulns on {source_task.data}",
+                source=source_task.node_id,
+                depth=source_task.depth + 1,
+                timestamp=time.time(),
+                module='exploitation',
+                metadata={
+                    'target': source_task.data,
+                    'vulnerability_count': len(exploitable_vulns),
+                    'vulnerability_types': [vuln.get('type') for vuln in exploitable_vulns]
+                },
+                vulnerabilities=exploitable_vulns
+            )
+            await self.add_discovered_node(exploitation_node)
             
-            if exploitable_vulns:
-                self.stats['exploits_attempted'] += len(exploitable_vulns)
+            self.logger.info(f"🚀 Запуск эксплуатации {len(exploitable_vulns)} уязвимостей на {source_task.data}")
+    
+    async def _route_exploitation_results(self, exploitation_results: List[Dict], source_task: ScanNode):
+        """Обработка результатов эксплуатации"""
+        target = source_task.get_meta('target', source_task.data)
+        
+        for exploit_result in exploitation_results:
+            if exploit_result.get("success"):
+                self.stats['exploits_successful'] += 1
                 
-                exploitation_node = ScanNode(
-                    node_id=f"exploitation_{source_task.data}_{int(time.time())}",
-                    type=NodeType.EXPLOITATION,
-                    data=f"Exploit {len(exploitable_vulns)} vulns on {source_task.data}",
+                exploit_node = ScanNode(
+                    node_id=f"exploit_success_{target}_{int(time.time())}",
+                    type=NodeType.EXPLOITATION_SUCCESS,
+                    data=f"{exploit_result['access_type']} доступ - Успех",
                     source=source_task.node_id,
                     depth=source_task.depth + 1,
                     timestamp=time.time(),
-                    module='exploitation',
+                    module='report_generator',
                     metadata={
-                        'target': source_task.data,
-                        'vulnerability_count': len(exploitable_vulns),
-                        'vulnerability_types': [vuln.get('type') for vuln in exploitable_vulns]
+                        'target': target,
+                        'severity': 'critical',
+                        'access_type': exploit_result.get('access_type'),
+                        'credentials_obtained': bool(exploit_result.get('credentials')),
+                        'shell_obtained': exploit_result.get('shell_obtained', False)
                     },
-                    vulnerabilities=exploitable_vulns
+                    exploit_data=exploit_result
                 )
-                await self.add_discovered_node(exploitation_node)
+                await self.add_discovered_node(exploit_node)
                 
-                self.logger.info(f"🚀 Запуск эксплуатации {len(exploitable_vulns)} уязвимостей на {source_task.data}")
-        
-        # Обработка результатов эксплуатации
-        elif (results.get("module") == "exploitation" and 
-              results.get("exploitation_results")):
-            
-            for exploit_result in results["exploitation_results"]:
-                if exploit_result.get("success"):
-                    self.stats['exploits_successful'] += 1
-                    
-                    exploit_node = ScanNode(
-                        node_id=f"exploit_success_{source_task.data}_{int(time.time())}",
-                        type=NodeType.EXPLOITATION_SUCCESS,
-                        data=f"{exploit_result['access_type']} доступ - Успех",
-                        source=source_task.node_id,
-                        depth=source_task.depth + 1,
-                        timestamp=time.time(),
-                        module='report_generator',
-                        metadata={
-                            'severity': 'critical',
-                            'access_type': exploit_result.get('access_type'),
-                            'credentials_obtained': bool(exploit_result.get('credentials')),
-                            'shell_obtained': exploit_result.get('shell_obtained', False)
-                        },
-                        exploit_data=exploit_result
-                    )
-                    await self.add_discovered_node(exploit_node)
-                    
-                    self.logger.critical(
-                        f"💥 УСПЕШНАЯ ЭКСПЛУАТАЦИЯ: {exploit_result.get('access_type')} "
-                        f"доступ к {source_task.data}"
-                    )
-                    
-                    # Если получили доступ к системе - запускаем внутреннее сканирование
-                    if exploit_result.get("access_type") in ["ssh_access", "shell_access", "remote_code_execution"]:
-                        await self.start_lateral_movement(exploit_result, source_task)
-        
-        # Обработка результатов internal_scanner (lateral movement)
-        elif results.get("module") == "internal_scanner" and results.get("internal_hosts"):
-            self.stats['lateral_movements'] += 1
-            
-            for host_info in results["internal_hosts"]:
-                # Создаем узлы для внутренних хостов
-                internal_node = ScanNode(
-                    node_id=f"internal_host_{host_info['ip']}_{int(time.time())}",
-                    type=NodeType.ACTIVE_HOST,
-                    data=host_info["ip"],
-                    source=source_task.node_id,
-                    depth=source_task.depth + 1,
-                    timestamp=time.time(),
-                    module='port_scanner',
-                    metadata={
-                        'host_status': 'active',
-                        'internal_network': True,
-                        'source_exploit': source_task.exploit_data.get('access_type'),
-                        'lateral_movement': True
-                    }
+                self.logger.critical(
+                    f"💥 УСПЕШНАЯ ЭКСПЛУАТАЦИЯ: {exploit_result.get('access_type')} "
+                    f"доступ к {target}"
                 )
-                await self.add_discovered_node(internal_node)
-        
-        # Обработка общих результатов для других модулей
-        else:
-            new_nodes = self.simulate_findings(source_task)
-            await self.process_findings(new_nodes, source_task)
+                
+                # Если получили доступ к системе - запускаем внутреннее сканирование
+                if exploit_result.get("access_type") in ["ssh_access", "shell_access", "remote_code_execution"]:
+                    await self.start_lateral_movement(exploit_result, source_task)
+    
+    async def _route_internal_hosts(self, internal_hosts: List[Dict], source_task: ScanNode):
+        """Обработка результатов internal_scanner (lateral movement)"""
+        self.stats['lateral_movements'] += 1
         
-        # Уведомляем GUI о результатах модуля
-        self._notify_gui_update('module_results', {
-            'task': source_task,
-            'results': results
-        })
+        for host_info in internal_hosts:
+            # Создаем узлы для внутренних хостов
+            internal_node = ScanNode(
+                node_id=f"internal_host_{host_info['ip']}_{int(time.time())}",
+                type=NodeType.ACTIVE_HOST,
+                data=host_info["ip"],
+                source=source_task.node_id,
+                depth=source_task.depth + 1,
+                timestamp=time.time(),
+                module='port_scanner',
+                metadata={
+                    'host_status': 'active',
+                    'internal_network': True,
+                    'source_exploit': source_task.exploit_data.get('access_type'),
+                    'lateral_movement': True
+                }
+            )
+            await self.add_discovered_node(internal_node)
     
     async def start_lateral_movement(self, exploit_result: Dict, source_task: ScanNode):
         """Начать перемещение внутри сети после успешной эксплуатации"""
@@ -719,8 +1371,12 @@ class PropagationEngine:
     async def add_discovered_node(self, node: ScanNode):
         """Добавление обнаруженного узла в систему"""
         if node.depth <= self.max_depth:
-            self.discovered_nodes.append(node)
-            self.pending_scans.put(node)
+            if self._merge_duplicate(node):
+                return
+            
+            self._store_node(node)
+            self._record_node(node)
+            self._enqueue(node)
             self.stats['nodes_discovered'] += 1
             
             self.logger.info(f"Обнаружен новый узел: {node.type.value} -> {node.data}")
@@ -732,8 +1388,230 @@ class PropagationEngine:
             if hasattr(self, 'callbacks') and 'node_discovered' in self.callbacks:
                 self.callbacks['node_discovered'](node)
     
+    def _normalize_target(self, value: Any) -> str:
+        """Нормализация цели для канонического ключа узла"""
+        text = str(value).strip().lower().rstrip('.')
+        try:
+            return str(ipaddress.ip_address(text))
+        except ValueError:
+            return text
+    
+    def _canonical_key(self, node: ScanNode) -> Tuple[str, str, str]:
+        """Канонический ключ узла: (тип, нормализованная цель, модуль)"""
+        target = self._normalize_target(node.data)
+        
+        # Для находок, данные которых не содержат хост (уязвимости, успешные
+        # эксплойты), цель уточняется хостом из metadata
+        host = node.get_meta('target')
+        if host is not None:
+            target = f"{self._normalize_target(host)}|{target}"
+        
+        return (node.type.value, target, node.module)
+    
+    def find_node(self, node_type: NodeType, target: Any, module: str) -> Optional[ScanNode]:
+        """Поиск уже обнаруженного узла по каноническому ключу"""
+        return self.discovered_nodes.get_by_key((node_type.value, self._normalize_target(target), module))
+    
+    def get_node(self, node_id: str) -> Optional[ScanNode]:
+        """Узел по идентификатору"""
+        return self.discovered_nodes.get(node_id)
+    
+    def get_nodes_by_type(self, node_type: NodeType) -> List[ScanNode]:
+        """Все узлы заданного типа (по индексу)"""
+        return self.discovered_nodes.by_type(node_type)
+    
+    def get_child_nodes(self, node_id: str) -> List[ScanNode]:
+        """Узлы, обнаруженные из заданного узла (по индексу)"""
+        return self.discovered_nodes.children_of(node_id)
+    
+    def _store_node(self, node: ScanNode):
+        """Сохранение нового узла в репозитории"""
+        self.discovered_nodes.add(node, self._canonical_key(node))
+        self._mark_changed(node)
+        self._note_liveness(node)
+    
+    def _note_liveness(self, node: ScanNode):
+        """Хост, отмеченный активным (ping_scanner, lateral movement), попадает в кэш доступности"""
+        if node.get_meta('host_status') == 'active':
+            self.liveness.mark(node.data, True, source=node.node_id)
+    
+    def _mark_changed(self, node: ScanNode):
+        """Регистрация нового или измененного узла в ленте изменений"""
+        with self._changes_lock:
+            self.change_seq += 1
+            self._changes[node.node_id] = self.change_seq
+            self._changes.move_to_end(node.node_id)
+    
+    def changes_since(self, seq: int = 0) -> Tuple[int, List[ScanNode]]:
+        """
+        Узлы, добавленные или измененные после номера изменения seq
+        
+        Стоимость пропорциональна числу изменений, а не числу узлов.
+        
+        Args:
+            seq: Номер изменения, полученный при прошлом вызове (0 - все узлы)
+            
+        Returns:
+            (текущий номер изменения, список узлов в порядке изменения)
+        """
+        with self._changes_lock:
+            current = self.change_seq
+            if seq > current:
+                # Номер из другого запуска движка - отдаем все узлы
+                seq = 0
+            
+            changed_ids = []
+            for node_id in reversed(self._changes):
+                if self._changes[node_id] <= seq:
+                    break
+                changed_ids.append(node_id)
+        
+        changed_ids.reverse()
+        nodes = []
+        for node_id in changed_ids:
+            node = self.discovered_nodes.get(node_id)
+            if node is not None:
+                nodes.append(node)
+        return current, nodes
+    
+    def _merge_duplicate(self, node: ScanNode) -> bool:
+        """
+        Слияние узла с уже известным дубликатом.
+        
+        Returns:
+            True если узел оказался дубликатом и был слит с существующим,
+            False если узел новый
+        """
+        existing = self.discovered_nodes.get_by_key(self._canonical_key(node))
+        if existing is None:
+            return False
+        
+        # Узел уже передан модулю - новые порты/сервисы/уязвимости
+        # сканируются отдельной задачей-продолжением
+        follow_up = None
+        if existing.node_id in self._running_scans or existing.node_id in self.completed_scans:
+            follow_up = self._make_follow_up(existing, node)
+        
+        changed = self._merge_node_data(existing, node)
+        self.stats['duplicates_merged'] += 1
+        self.logger.debug(f"Дубликат узла {node.type.value} -> {node.data} слит с {existing.node_id}")
+        
+        if changed:
+            self.discovered_nodes.update(existing)
+            self._mark_changed(existing)
+            self._record_node(existing)
+            self._notify_gui_update('node_updated', existing)
+        
+        if follow_up is not None and follow_up.depth <= self.max_depth:
+            # Продолжение хранится без канонического ключа, чтобы не подменять основной узел
+            self.discovered_nodes.add(follow_up)
+            self._mark_changed(follow_up)
+            self._record_node(follow_up)
+            self._enqueue(follow_up)
+            self.stats['follow_up_scans'] += 1
+            self.logger.debug(f"Продолжение {follow_up.node_id} для {existing.node_id}")
+        return True
+    
+    def _make_follow_up(self, existing: ScanNode, node: ScanNode) -> Optional[ScanNode]:
+        """
+        Узел-продолжение только с данными, которых не было в уже запущенном узле
+        
+        Returns:
+            ScanNode или None, если дубликат не добавляет входных данных
+        """
+        ports = [port for port in node._ports or [] if port not in (existing._ports or [])]
+        
+        known_services = {self._service_key(service) for service in existing._services or []}
+        services = [service for service in node._services or []
+                    if self._service_key(service) not in known_services]
+        
+        known_vulns = {self._vulnerability_key(vuln) for vuln in existing._vulnerabilities or []}
+        vulnerabilities = [vuln for vuln in node._vulnerabilities or []
+                           if self._vulnerability_key(vuln) not in known_vulns]
+        
+        if not (ports or services or vulnerabilities):
+            return None
+        
+        return ScanNode(
+            node_id=f"{existing.node_id}_followup_{next(self._follow_up_ids)}",
+            type=existing.type,
+            data=existing.data,
+            source=node.source,
+            depth=node.depth,
+            timestamp=time.time(),
+            module=existing.module,
+            metadata={**(node._metadata or {}), 'follow_up_of': existing.node_id},
+            ports=ports,
+            services=services,
+            vulnerabilities=vulnerabilities
+        )
+    
+    def _merge_node_data(self, target: ScanNode, source: ScanNode) -> bool:
+        """Объединение metadata, портов, сервисов и уязвимостей дубликата"""
+        changed = False
+        
+        for key, value in source.metadata.items():
+            if key not in target.metadata:
+                target.metadata[key] = value
+                changed = True
+        
+        sources = target.metadata.setdefault('sources', [target.source])
+        if source.source not in sources:
+            sources.append(source.source)
+            changed = True
+        
+        for port in source.ports:
+            if port not in target.ports:
+                target.ports.append(port)
+                changed = True
+        
+        known_services = {self._service_key(service) for service in target.services}
+        for service in source.services:
+            service_key = self._service_key(service)
+            if service_key not in known_services:
+                known_services.add(service_key)
+                target.services.append(service)
+                changed = True
+        
+        known_vulns = {self._vulnerability_key(vuln) for vuln in target.vulnerabilities}
+        for vuln in source.vulnerabilities:
+            vuln_key = self._vulnerability_key(vuln)
+            if vuln_key not in known_vulns:
+                known_vulns.add(vuln_key)
+                target.vulnerabilities.append(vuln)
+                changed = True
+        
+        if source.vulnerability_data and not target.vulnerability_data:
+            target.vulnerability_data = source.vulnerability_data
+            changed = True
+        if source.exploit_data and not target.exploit_data:
+            target.exploit_data = source.exploit_data
+            changed = True
+        
+        return changed
+    
+    @staticmethod
+    def _service_key(service: Any) -> Tuple:
+        """Ключ сервиса для объединения дубликатов"""
+        if isinstance(service, dict):
+            return (service.get('host'), service.get('port'), service.get('protocol', 'tcp'))
+        return (str(service),)
+    
+    @staticmethod
+    def _vulnerability_key(vuln: Any) -> Tuple:
+        """Ключ уязвимости для объединения дубликатов"""
+        if isinstance(vuln, dict):
+            service = vuln.get('service')
+            port = service.get('port') if isinstance(service, dict) else None
+            return (vuln.get('cve') or vuln.get('type'), port, vuln.get('description'))
+        return (str(vuln),)
+    
     async def default_scan_behavior(self, task: ScanNode):
         """Поведение по умолчанию при отсутствии модуля"""
+        if not self.simulate_findings_enabled:
+            # Узлы без модуля (отчетные) не порождают находок
+            return
+        
         # Имитация работы модуля
         await asyncio.sleep(0.1)
         new_nodes = self.simulate_findings(task)
@@ -746,6 +1624,10 @@ class PropagationEngine:
     
     def select_module_for_task(self, task: ScanNode) -> Optional[Any]:
         """Выбор подходящего модуля для задачи"""
+        return self.active_modules.get(self._resolve_module_name(task))
+    
+    def _resolve_module_name(self, task: ScanNode) -> Optional[str]:
+        """Имя модуля для задачи"""
         # Используем модуль из задачи или выбираем по типу
         module_name = task.module if task.module != "default" else None
         
@@ -767,7 +1649,7 @@ class PropagationEngine:
             }
             module_name = module_map.get(task.type)
         
-        return self.active_modules.get(module_name)
+        return module_name
     
     def simulate_findings(self, task: ScanNode) -> List[ScanNode]:
         """Временная функция для симуляции находок (для демонстрации)"""
@@ -863,6 +1745,7 @@ class PropagationEngine:
                     timestamp=time.time(),
                     module='report_generator',
                     metadata={
+                        'target': task.data,
                         'severity': vuln['severity'],
                         'confidence': vuln['confidence'],
                         'cvss_score': vuln['cvss_score'],
@@ -892,6 +1775,7 @@ class PropagationEngine:
                     timestamp=time.time(),
                     module='report_generator',
                     metadata={
+                        'target': task.data,
                         'severity': 'critical',
                         'access_type': 'ssh_access',
                         'credentials_obtained': True,
@@ -907,37 +1791,115 @@ class PropagationEngine:
         """Получение статистики сканирования"""
         return {
             **self.stats,
-            'pending_tasks': self.pending_scans.qsize(),
+            'pending_tasks': self.get_pending_count(),
             'completed_tasks': len(self.completed_scans),
             'discovered_nodes': len(self.discovered_nodes),
             'active_modules': len(self.active_modules),
             'is_running': self.is_running,
             'rate_limit': self.rate_limit,
             'max_depth': self.max_depth,
+            'rate_governor': self.rate_governor.get_statistics(),
+            'liveness': self.liveness.get_statistics(),
+            'event_bus': self.event_bus.get_statistics(),
             'current_profile': self.get_current_profile_info()
         }
     
+    @staticmethod
+    def _node_to_dict(node: ScanNode) -> Dict[str, Any]:
+        """Сериализация узла для экспорта и контрольных точек"""
+        return node.to_dict()
+    
+    @staticmethod
+    def _node_from_dict(node_data: Dict[str, Any]) -> ScanNode:
+        """Восстановление узла из сериализованного представления"""
+        return ScanNode(
+            node_id=node_data['id'],
+            type=NodeType(node_data['type']),
+            data=node_data['data'],
+            source=node_data['source'],
+            depth=node_data['depth'],
+            timestamp=node_data['timestamp'],
+            module=node_data.get('module', 'default'),
+            metadata=node_data.get('metadata'),
+            ports=node_data.get('ports'),
+            services=node_data.get('services'),
+            vulnerability_data=node_data.get('vulnerability_data'),
+            vulnerabilities=node_data.get('vulnerabilities'),
+            exploit_data=node_data.get('exploit_data')
+        )
+    
+    def _record_node(self, node: ScanNode):
+        """Запись узла в журнал контрольных точек"""
+        if self.checkpoint is not None:
+            self.checkpoint.record_node(self._node_to_dict(node))
+    
+    def enable_checkpoint(self, path: str, flush_interval: float = 5.0, flush_every: int = 200):
+        """Включение журнала контрольных точек"""
+        self.checkpoint = CheckpointJournal(path, flush_interval=flush_interval, flush_every=flush_every)
+        self.logger.info(f"Контрольные точки сохраняются в: {path}")
+    
+    def resume_from(self, path: str) -> int:
+        """
+        Возобновление сканирования из журнала контрольных точек
+        
+        Восстанавливает обнаруженные узлы, завершенные задачи и статистику,
+        ставит в очередь только незавершенные узлы. Новые записи дописываются
+        в тот же журнал.
+        
+        Args:
+            path: Путь к журналу контрольных точек
+            
+        Returns:
+            Количество задач, поставленных в очередь
+        """
+        state = CheckpointJournal.replay(path)
+        completed = state['completed']
+        
+        self.completed_scans.update(completed)
+        if state['stats']:
+            self.stats.update(state['stats'])
+        
+        restored = 0
+        requeued = 0
+        for node_data in state['nodes'].values():
+            try:
+                node = self._node_from_dict(node_data)
+            except (KeyError, ValueError) as e:
+                self.logger.warning(f"Пропущен поврежденный узел контрольной точки: {e}")
+                continue
+            
+            # Продолжения хранятся без ключа, рядом с основным узлом
+            key = None if node.get_meta('follow_up_of') else self._canonical_key(node)
+            if key is not None and self.discovered_nodes.get_by_key(key) is not None:
+                continue
+            self.discovered_nodes.add(node, key)
+            self._mark_changed(node)
+            self._note_liveness(node)
+            restored += 1
+            
+            if node.node_id not in completed and node.depth <= self.max_depth:
+                self._enqueue(node)
+                requeued += 1
+        
+        if self.checkpoint is None or self.checkpoint.path != Path(path):
+            self.enable_checkpoint(path)
+        
+        self.logger.info(
+            f"Сканирование возобновлено из {path}: узлов {restored}, "
+            f"завершено {len(completed)}, в очереди {requeued}"
+        )
+        self._notify_gui_update('scan_resumed', {
+            'restored_nodes': restored,
+            'completed_tasks': len(completed),
+            'pending_tasks': requeued
+        })
+        return requeued
+    
     def export_results(self, filename: str):
         """Экспорт результатов сканирования"""
         results = {
             'statistics': self.get_statistics(),
-            'discovered_nodes': [
-                {
-                    'id': node.node_id,
-                    'type': node.type.value,
-                    'data': node.data,
-                    'source': node.source,
-                    'depth': node.depth,
-                    'timestamp': node.timestamp,
-                    'module': node.module,
-                    'metadata': node.metadata,
-                    'ports': node.ports,
-                    'services': node.services,
-                    'vulnerability_data': node.vulnerability_data,
-                    'vulnerabilities': node.vulnerabilities,
-                    'exploit_data': node.exploit_data
-                } for node in self.discovered_nodes
-            ],
+            'discovered_nodes': [self._node_to_dict(node) for node in self.discovered_nodes],
             'completed_scans': self.completed_scans
         }
         
@@ -0,0 +1,130 @@
+"""
+Шина событий RapidRecon - передача событий движка в GUI без блокировок
+"""
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class EventBus:
+    """
+    Ограниченный кольцевой буфер событий между движком и GUI
+
+    Движок публикует события через deque.append - операция атомарна и не
+    блокирует поток движка. GUI раз в кадр забирает все накопленные события
+    через drain(), который объединяет однотипные события:
+
+    * COALESCE_COLLECT - N событий превращаются в одно с списком данных
+      (например, все node_discovered за кадр);
+    * COALESCE_LATEST - важно только последнее значение (progress_update);
+    * остальные события передаются по одному в исходном порядке.
+
+    Объединенное событие стоит на месте последнего из объединенных, поэтому
+    оно не опережает события, опубликованные между ними.
+
+    При переполнении буфера самые старые события вытесняются, а следующий
+    drain() начинается с события "resync": потребитель должен перечитать
+    состояние движка целиком, поэтому данные не теряются. Вытеснения считает
+    только движок (монотонный счетчик), а GUI сравнивает его с последним
+    увиденным значением - общего флага, который сбрасывают оба потока, нет.
+    """
+
+    COALESCE_COLLECT = frozenset({
+        'node_added',
+        'node_discovered',
+        'node_updated',
+        'task_started',
+        'task_completed',
+        'task_failed',
+        'module_results'
+    })
+
+    COALESCE_LATEST = frozenset({
+        'progress_update'
+    })
+
+    RESYNC = 'resync'
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = max(1, int(capacity))
+        self._events: deque = deque(maxlen=self.capacity)
+        # Пишет только издатель, потребитель только читает
+        self._drops = 0
+        self._seen_drops = 0
+        self.stats = {
+            'published': 0,
+            'dropped': 0,
+            'drained': 0
+        }
+
+    def publish(self, event_type: str, data: Any = None):
+        """Публикация события (не блокирует, вызывается из потока движка)"""
+        if len(self._events) >= self.capacity:
+            # Самое старое событие будет вытеснено - потребителю нужна полная синхронизация
+            self._drops += 1
+            self.stats['dropped'] += 1
+        self._events.append((event_type, data))
+        self.stats['published'] += 1
+
+    def drain(self, max_events: Optional[int] = None) -> List[Tuple[str, Any]]:
+        """
+        Забрать накопленные события (вызывается из потока GUI)
+
+        Args:
+            max_events: Ограничение числа исходных событий за вызов
+
+        Returns:
+            Список (тип события, данные) после объединения
+        """
+        # Счетчик читается до выборки: вытеснение во время выборки попадет в следующий drain()
+        drops = self._drops
+        events = []
+        pop = self._events.popleft
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(pop())
+            except IndexError:
+                break
+
+        overflowed = drops != self._seen_drops
+        self._seen_drops = drops
+        self.stats['drained'] += len(events)
+        return self.coalesce(events, resync=overflowed)
+
+    @classmethod
+    def coalesce(cls, events: List[Tuple[str, Any]], resync: bool = False) -> List[Tuple[str, Any]]:
+        """Объединение однотипных событий на месте последнего появления"""
+        result: List[Tuple[str, Any]] = []
+        coalesced = cls.COALESCE_COLLECT | cls.COALESCE_LATEST
+        last: Dict[str, int] = {
+            event_type: index for index, (event_type, _) in enumerate(events) if event_type in coalesced
+        }
+        collected: Dict[str, List[Any]] = {}
+
+        if resync:
+            result.append((cls.RESYNC, None))
+
+        for index, (event_type, data) in enumerate(events):
+            if event_type in cls.COALESCE_COLLECT:
+                collected.setdefault(event_type, []).append(data)
+                if last[event_type] == index:
+                    result.append((event_type, collected[event_type]))
+
+            elif event_type in cls.COALESCE_LATEST:
+                if last[event_type] == index:
+                    result.append((event_type, data))
+
+            else:
+                result.append((event_type, data))
+
+        return result
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика шины"""
+        return {
+            **self.stats,
+            'pending': len(self._events),
+            'capacity': self.capacity
+        }
@@ -0,0 +1,100 @@
+"""
+Кэш доступности хостов RapidRecon - общий для движка и модулей
+"""
+import ipaddress
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+
+class LivenessCache:
+    """
+    Доступность хостов с ограниченным сроком жизни, ключ - нормализованный IP
+
+    Движок отмечает хосты, которые ping_scanner нашел активными, а модули
+    (port_scanner) перед сканированием сначала спрашивают кэш и проверяют
+    хост сами, только если о нем ничего не известно. Отрицательный
+    результат хранится меньше (negative_ttl): недоступный хост мог быть
+    просто медленным или фильтровать проверочные порты.
+    """
+
+    def __init__(self, ttl: float = 600.0, negative_ttl: float = 60.0, max_entries: int = 100000):
+        self.logger = logging.getLogger('RapidRecon.LivenessCache')
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        # Ключ -> (истекает, доступен, источник)
+        self._entries: "OrderedDict[str, Tuple[float, bool, str]]" = OrderedDict()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'marked_alive': 0,
+            'marked_dead': 0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'LivenessCache':
+        """Создание кэша из секции engine.liveness"""
+        config = config or {}
+        return cls(
+            ttl=config.get('ttl', 600.0),
+            negative_ttl=config.get('negative_ttl', 60.0),
+            max_entries=config.get('max_entries', 100000)
+        )
+
+    @staticmethod
+    def _key(host: Any) -> str:
+        text = str(host).strip().lower().rstrip('.')
+        try:
+            return str(ipaddress.ip_address(text))
+        except ValueError:
+            return text
+
+    def get(self, host: Any) -> Optional[bool]:
+        """
+        Известная доступность хоста
+
+        Returns:
+            True/False или None, если хост не проверялся или запись устарела
+        """
+        key = self._key(host)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return entry[1]
+
+    def mark(self, host: Any, alive: bool, source: str = ''):
+        """Запись результата проверки доступности"""
+        key = self._key(host)
+        ttl = self.ttl if alive else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, alive, source)
+        self._entries.move_to_end(key)
+        self.stats['marked_alive' if alive else 'marked_dead'] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, host: Any):
+        """Удаление записи о хосте"""
+        self._entries.pop(self._key(host), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика кэша"""
+        return {**self.stats, 'entries': len(self._entries)}
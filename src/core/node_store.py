@@ -0,0 +1,326 @@
+"""
+Хранилище узлов RapidRecon - репозитории обнаруженных ScanNode
+"""
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Callable, Tuple
+import logging
+
+
+class NodeRepository(ABC):
+    """
+    Базовый интерфейс репозитория узлов
+
+    Поддерживает len(), итерацию в порядке обнаружения и append() для
+    совместимости с прежним списком discovered_nodes.
+    """
+
+    @abstractmethod
+    def add(self, node, key: Optional[Tuple] = None):
+        """Добавить узел (key - канонический ключ для дедупликации)"""
+
+    def append(self, node):
+        """Совместимость со списком"""
+        self.add(node)
+
+    @abstractmethod
+    def update(self, node):
+        """Сохранить изменения существующего узла"""
+
+    @abstractmethod
+    def get(self, node_id: str):
+        """Узел по идентификатору"""
+
+    @abstractmethod
+    def get_by_key(self, key: Tuple):
+        """Узел по каноническому ключу"""
+
+    @abstractmethod
+    def by_type(self, node_type) -> List[Any]:
+        """Все узлы заданного типа"""
+
+    @abstractmethod
+    def children_of(self, node_id: str) -> List[Any]:
+        """Узлы, обнаруженные из узла node_id"""
+
+    @abstractmethod
+    def by_target(self, target: str) -> List[Any]:
+        """Узлы с заданной целью"""
+
+    @abstractmethod
+    def by_depth(self, depth: int) -> List[Any]:
+        """Узлы на заданной глубине"""
+
+    def flush(self):
+        """Запись накопленных изменений на диск"""
+
+    def close(self):
+        """Освобождение ресурсов"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Число узлов"""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Any]:
+        """Узлы в порядке обнаружения"""
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    @staticmethod
+    def _type_value(node_type) -> str:
+        return getattr(node_type, 'value', node_type)
+
+    @staticmethod
+    def _target_value(target: Any) -> str:
+        return str(target).strip().lower()
+
+
+class InMemoryNodeRepository(NodeRepository):
+    """Репозиторий в памяти со вторичными индексами"""
+
+    def __init__(self):
+        # Список только дописывается, поэтому его можно обходить из потока GUI
+        self._order: List[Any] = []
+        self._by_id: Dict[str, Any] = {}
+        self._by_key: Dict[Tuple, Any] = {}
+        self._by_type: Dict[str, List[Any]] = {}
+        self._by_source: Dict[str, List[Any]] = {}
+        self._by_target: Dict[str, List[Any]] = {}
+        self._by_depth: Dict[int, List[Any]] = {}
+
+    def add(self, node, key: Optional[Tuple] = None):
+        self._order.append(node)
+        self._by_id[node.node_id] = node
+        if key is not None:
+            self._by_key[key] = node
+        self._by_type.setdefault(self._type_value(node.type), []).append(node)
+        self._by_source.setdefault(node.source, []).append(node)
+        self._by_target.setdefault(self._target_value(node.data), []).append(node)
+        self._by_depth.setdefault(node.depth, []).append(node)
+
+    def update(self, node):
+        # Узлы хранятся по ссылке - изменения уже видны
+        pass
+
+    def get(self, node_id: str):
+        return self._by_id.get(node_id)
+
+    def get_by_key(self, key: Tuple):
+        return self._by_key.get(key)
+
+    def by_type(self, node_type) -> List[Any]:
+        return list(self._by_type.get(self._type_value(node_type), []))
+
+    def children_of(self, node_id: str) -> List[Any]:
+        return list(self._by_source.get(node_id, []))
+
+    def by_target(self, target: str) -> List[Any]:
+        return list(self._by_target.get(self._target_value(target), []))
+
+    def by_depth(self, depth: int) -> List[Any]:
+        return list(self._by_depth.get(depth, []))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._order)
+
+
+class SQLiteNodeRepository(NodeRepository):
+    """
+    Репозиторий узлов в SQLite
+
+    Узлы хранятся в таблице с индексами по типу, глубине, источнику, цели и
+    каноническому ключу; тело узла сериализуется в JSON. Живые объекты
+    (например, стоящие в очереди) отслеживаются через weakref, чтобы слияние
+    дубликатов изменяло тот же объект, который будет выполнен.
+
+    Записи фиксируются одной транзакцией на commit_every изменений или при
+    flush() (движок вызывает его после каждой задачи), а не на каждую вставку.
+    Чтения идут через то же соединение и видят незафиксированные записи.
+    """
+
+    FETCH_CHUNK = 500
+
+    def __init__(self, path: str, serializer: Callable[[Any], Dict[str, Any]],
+                 deserializer: Callable[[Dict[str, Any]], Any], reset: bool = True,
+                 commit_every: int = 500):
+        self.path = path
+        self.serializer = serializer
+        self.deserializer = deserializer
+        self.commit_every = max(1, commit_every)
+        self._uncommitted = 0
+        self.logger = logging.getLogger('RapidRecon.NodeStore')
+
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Репозиторий читается из потока GUI и пишется из потока движка
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        if reset:
+            # Хранилище рабочее: новое сканирование начинается с пустой таблицы,
+            # восстановление выполняется через журнал контрольных точек
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM nodes")
+
+        self._live = weakref.WeakValueDictionary()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS nodes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    node_id TEXT NOT NULL,
+                    node_key TEXT,
+                    type TEXT NOT NULL,
+                    depth INTEGER NOT NULL,
+                    source TEXT,
+                    target TEXT,
+                    module TEXT,
+                    body TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_id ON nodes(node_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_key ON nodes(node_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(type)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_depth ON nodes(depth)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_source ON nodes(source)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_target ON nodes(target)")
+
+    @staticmethod
+    def _encode_key(key: Optional[Tuple]) -> Optional[str]:
+        return json.dumps(list(key), ensure_ascii=False) if key is not None else None
+
+    def _encode_body(self, node) -> str:
+        return json.dumps(self.serializer(node), ensure_ascii=False, default=str)
+
+    def _decode(self, body: str):
+        node_data = json.loads(body)
+        node = self._live.get(node_data['id'])
+        if node is None:
+            node = self.deserializer(node_data)
+            self._live[node.node_id] = node
+        return node
+
+    def add(self, node, key: Optional[Tuple] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO nodes (node_id, node_key, type, depth, source, target, module, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (node.node_id, self._encode_key(key), self._type_value(node.type), node.depth,
+                 node.source, self._target_value(node.data), node.module, self._encode_body(node))
+            )
+            self._count += 1
+            self._written()
+        self._live[node.node_id] = node
+
+    def update(self, node):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE nodes SET body = ? WHERE node_id = ?",
+                (self._encode_body(node), node.node_id)
+            )
+            self._written()
+
+    def _written(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._uncommitted:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def _query_one(self, sql: str, params: Tuple):
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+            return self._decode(row[0]) if row else None
+
+    def _query_all(self, sql: str, params: Tuple) -> List[Any]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            return [self._decode(row[0]) for row in rows]
+
+    def get(self, node_id: str):
+        node = self._live.get(node_id)
+        if node is not None:
+            return node
+        return self._query_one("SELECT body FROM nodes WHERE node_id = ? ORDER BY seq LIMIT 1", (node_id,))
+
+    def get_by_key(self, key: Tuple):
+        return self._query_one("SELECT body FROM nodes WHERE node_key = ? ORDER BY seq LIMIT 1", (self._encode_key(key),))
+
+    def by_type(self, node_type) -> List[Any]:
+        return self._query_all("SELECT body FROM nodes WHERE type = ? ORDER BY seq", (self._type_value(node_type),))
+
+    def children_of(self, node_id: str) -> List[Any]:
+        return self._query_all("SELECT body FROM nodes WHERE source = ? ORDER BY seq", (node_id,))
+
+    def by_target(self, target: str) -> List[Any]:
+        return self._query_all("SELECT body FROM nodes WHERE target = ? ORDER BY seq", (self._target_value(target),))
+
+    def by_depth(self, depth: int) -> List[Any]:
+        return self._query_all("SELECT body FROM nodes WHERE depth = ? ORDER BY seq", (depth,))
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        # Обходим порциями по seq, не удерживая блокировку между порциями
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, body FROM nodes WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (last_seq, self.FETCH_CHUNK)
+                ).fetchall()
+                nodes = [self._decode(body) for _, body in rows]
+            if not rows:
+                return
+            last_seq = rows[-1][0]
+            yield from nodes
+
+
+def create_node_repository(config: Dict[str, Any], serializer: Callable[[Any], Dict[str, Any]],
+                           deserializer: Callable[[Dict[str, Any]], Any]) -> NodeRepository:
+    """
+    Создание репозитория по секции engine.node_store
+
+    Args:
+        config: {"backend": "memory" | "sqlite", "path": "...", "reset": true,
+                 "commit_every": 500}
+        serializer: Функция узел -> dict
+        deserializer: Функция dict -> узел
+    """
+    config = config or {}
+    backend = config.get('backend', 'memory')
+
+    if backend == 'sqlite':
+        return SQLiteNodeRepository(
+            config.get('path', 'rapidrecon_nodes.db'), serializer, deserializer,
+            reset=config.get('reset', True), commit_every=config.get('commit_every', 500)
+        )
+    if backend != 'memory':
+        logging.getLogger('RapidRecon.NodeStore').warning(
+            f"Неизвестный backend хранилища узлов: {backend}, используется memory"
+        )
+    return InMemoryNodeRepository()
@@ -0,0 +1,259 @@
+"""
+Централизованное ограничение скорости RapidRecon - token bucket для всех модулей
+"""
+import asyncio
+import ipaddress
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+import logging
+
+
+class TokenBucket:
+    """
+    Token bucket с резервированием токенов
+
+    Токены можно брать "в долг": reserve() сразу списывает токен и возвращает
+    время ожидания до момента, когда он был бы доступен. Это позволяет
+    ожидать несколько корзин одновременно без блокировок внутри event loop.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def set_rate(self, rate: Optional[float], burst: Optional[float] = None):
+        """Изменение скорости корзины"""
+        self._refill(time.monotonic())
+        self.rate = rate
+        if burst is not None:
+            self.burst = burst
+        self.tokens = min(self.tokens, self.burst)
+
+    def _refill(self, now: float):
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Зарезервировать токены, вернуть задержку в секундах"""
+        if not self.rate or self.rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateGovernor:
+    """
+    Общий регулятор нагрузки, который движок передает всем модулям
+
+    Каждый запрос к цели проходит через три уровня token bucket:
+    глобальный, модуля и хоста назначения (и, опционально, его подсети /24).
+    Дополнительно ограничивается число одновременных запросов к одному хосту.
+    """
+
+    def __init__(self, global_rate: Optional[float] = None, global_burst: Optional[float] = None,
+                 module_rates: Dict[str, float] = None, host_rate: Optional[float] = None,
+                 host_burst: Optional[float] = None, host_concurrency: int = 0,
+                 subnet_rate: Optional[float] = None):
+        self.logger = logging.getLogger('RapidRecon.RateGovernor')
+
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.module_rates = dict(module_rates or {})
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.host_concurrency = host_concurrency
+        self.subnet_rate = subnet_rate
+
+        self._module_buckets: Dict[str, TokenBucket] = {}
+        self._host_buckets: Dict[str, TokenBucket] = {}
+        self._subnet_buckets: Dict[str, TokenBucket] = {}
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_active: Dict[str, int] = {}
+
+        self.stats = {
+            'acquired': 0,
+            'throttled': 0,
+            'total_wait': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RateGovernor':
+        """Создание регулятора из секции engine.rate_governor"""
+        config = config or {}
+        return cls(
+            global_rate=config.get('global_rate'),
+            global_burst=config.get('global_burst'),
+            module_rates=config.get('module_rates', {}),
+            host_rate=config.get('host_rate'),
+            host_burst=config.get('host_burst'),
+            host_concurrency=config.get('host_concurrency', 0),
+            subnet_rate=config.get('subnet_rate')
+        )
+
+    def set_global_rate(self, rate: Optional[float], burst: Optional[float] = None):
+        """Изменение глобального лимита"""
+        self.global_bucket.set_rate(rate, burst)
+
+    def configure_module(self, module_name: str, rate: Optional[float], burst: Optional[float] = None):
+        """Установка лимита для модуля"""
+        self.module_rates[module_name] = rate
+        bucket = self._module_buckets.get(module_name)
+        if bucket:
+            bucket.set_rate(rate, burst)
+        else:
+            self._module_buckets[module_name] = TokenBucket(rate, burst)
+
+    @staticmethod
+    def normalize_host(target: Any) -> str:
+        """Хост назначения без порта, схемы и пути"""
+        host = str(target).strip().lower()
+        if '://' in host:
+            host = host.split('://', 1)[1]
+        host = host.split('/', 1)[0]
+        if host.startswith('['):
+            return host[1:].split(']', 1)[0]
+        if host.count(':') == 1:
+            host = host.split(':', 1)[0]
+        return host.rstrip('.')
+
+    def _subnet_key(self, host: str) -> Optional[str]:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return None
+        prefix = 24 if address.version == 4 else 64
+        return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+    def _module_bucket(self, module_name: str) -> TokenBucket:
+        bucket = self._module_buckets.get(module_name)
+        if bucket is None:
+            bucket = TokenBucket(self.module_rates.get(module_name))
+            self._module_buckets[module_name] = bucket
+        return bucket
+
+    def _host_bucket(self, host: str) -> TokenBucket:
+        bucket = self._host_buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.host_rate, self.host_burst)
+            self._host_buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, module_name: str, target: Any = None, amount: float = 1.0):
+        """Дождаться разрешения на запрос модуля к цели"""
+        delay = max(
+            self.global_bucket.reserve(amount),
+            self._module_bucket(module_name).reserve(amount)
+        )
+
+        if target is not None:
+            host = self.normalize_host(target)
+            delay = max(delay, self._host_bucket(host).reserve(amount))
+
+            if self.subnet_rate:
+                subnet = self._subnet_key(host)
+                if subnet:
+                    bucket = self._subnet_buckets.get(subnet)
+                    if bucket is None:
+                        bucket = self._subnet_buckets[subnet] = TokenBucket(self.subnet_rate)
+                    delay = max(delay, bucket.reserve(amount))
+
+        self.stats['acquired'] += 1
+        if delay > 0:
+            self.stats['throttled'] += 1
+            self.stats['total_wait'] += delay
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def limit(self, module_name: str, target: Any = None):
+        """
+        Контекст запроса: лимит одновременных запросов к хосту + token bucket
+
+        Пример:
+            async with governor.limit("port_scanner", host):
+                await probe(host, port)
+        """
+        if target is None or not self.host_concurrency:
+            await self.acquire(module_name, target)
+            yield
+            return
+
+        host = self.normalize_host(target)
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.host_concurrency)
+        self._host_active[host] = self._host_active.get(host, 0) + 1
+
+        try:
+            async with semaphore:
+                await self.acquire(module_name, host)
+                yield
+        finally:
+            self._host_active[host] -= 1
+            if not self._host_active[host]:
+                # Хост простаивает - освобождаем его состояние
+                del self._host_active[host]
+                self._host_semaphores.pop(host, None)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика регулятора"""
+        return {
+            **self.stats,
+            'tracked_hosts': len(self._host_buckets),
+            'active_hosts': len(self._host_active)
+        }
+
+
+class FallbackPacer:
+    """
+    Локальный темп модуля, запущенного без движка (RateGovernor не назначен)
+
+    Запросы выполняются по одному с паузой 1/rate после каждого. При
+    hold=False пауза выдерживается только между стартами запросов, а сами
+    запросы идут параллельно.
+    """
+
+    def __init__(self, hold: bool = True):
+        self.hold = hold
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def slot(self, rate: Optional[float]):
+        interval = 1 / rate if rate else 0.0
+        if not self.hold:
+            async with self._lock:
+                await asyncio.sleep(interval)
+            yield
+            return
+
+        async with self._lock:
+            yield
+            await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def governed_slot(governor: Optional[RateGovernor], module_name: str, target: Any, fallback):
+    """
+    Слот запроса модуля к цели с учетом ограничения скорости
+
+    Args:
+        governor: Общий RateGovernor движка или None
+        module_name: Имя модуля (лимит модуля в регуляторе)
+        target: Цель запроса (лимиты хоста), None - только глобальный лимит и лимит модуля
+        fallback: Асинхронный контекстный менеджер на случай работы без движка
+            (FallbackPacer.slot(), asyncio.Semaphore)
+    """
+    if governor is not None:
+        async with governor.limit(module_name, target):
+            yield
+        return
+
+    async with fallback:
+        yield
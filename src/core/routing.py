@@ -0,0 +1,86 @@
+"""
+Маршрутизация результатов RapidRecon - таблица "тип выхода модуля -> обработчик"
+"""
+import inspect
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple, Optional
+import logging
+
+
+class ResultRouter:
+    """
+    Таблица маршрутизации результатов модулей
+
+    Обработчики регистрируются по типу выхода - ключу словаря результата
+    ("active_hosts", "open_ports", ...). При регистрации модуля его
+    output_types из module_info.json компилируются в кортеж маршрутов,
+    поэтому обработка результата - поиск в словаре, а новый модуль
+    не удлиняет цепочку проверок.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable]):
+        self.handlers = dict(handlers)
+        self.logger = logging.getLogger('RapidRecon.Router')
+        self._routes: Dict[str, Tuple[Tuple[str, Callable], ...]] = {}
+        self._module_info: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def load_module_info(module_class) -> Dict[str, Any]:
+        """Чтение module_info.json, лежащего рядом с файлом модуля"""
+        try:
+            info_path = Path(inspect.getfile(module_class)).with_name('module_info.json')
+        except (TypeError, OSError):
+            return {}
+        if not info_path.exists():
+            return {}
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.getLogger('RapidRecon.Router').warning(f"Ошибка чтения {info_path}: {e}")
+            return {}
+
+    def register(self, module_name: str, module_info: Dict[str, Any]) -> List[str]:
+        """
+        Компиляция маршрутов модуля
+
+        Returns:
+            Типы выхода, для которых найден обработчик
+        """
+        output_types = module_info.get('output_types', [])
+        routes = tuple(
+            (output_type, self.handlers[output_type])
+            for output_type in output_types
+            if output_type in self.handlers
+        )
+        self._routes[module_name] = routes
+        self._module_info[module_name] = {
+            'output_types': list(output_types),
+            'triggers': list(module_info.get('triggers', []))
+        }
+
+        unrouted = [output_type for output_type in output_types if output_type not in self.handlers]
+        if unrouted:
+            self.logger.debug(f"Модуль {module_name}: нет обработчиков для {unrouted}")
+        return [output_type for output_type, _ in routes]
+
+    def routes_for(self, module_name: Optional[str], results: Dict[str, Any]) -> Tuple[Tuple[str, Callable], ...]:
+        """Маршруты для результата модуля"""
+        routes = self._routes.get(module_name)
+        if routes is not None:
+            return routes
+        # Модуль без module_info: маршруты по ключам самого результата
+        return tuple(
+            (key, self.handlers[key]) for key in results if key in self.handlers
+        )
+
+    def get_routes(self) -> Dict[str, Dict[str, Any]]:
+        """Скомпилированная таблица маршрутов (для отображения и отладки)"""
+        return {
+            module_name: {
+                **self._module_info.get(module_name, {}),
+                'routed': [output_type for output_type, _ in routes]
+            }
+            for module_name, routes in self._routes.items()
+        }
@@ -0,0 +1,117 @@
+"""
+Планировщик задач RapidRecon - приоритеты узлов сканирования
+"""
+import asyncio
+import itertools
+import time
+from typing import Dict, Any, List, Tuple
+
+
+class TaskPriorityPolicy:
+    """
+    Расчет приоритета узлов для очереди сканирования
+    
+    Ключ очереди - "виртуальный дедлайн": время постановки плюс задержка,
+    пропорциональная весу узла (тип, глубина, metadata['priority']).
+    Меньший ключ выполняется раньше. Так как время постановки входит в ключ,
+    ожидающая задача стареет автоматически: новая задача с меньшим весом
+    обгоняет ее не более чем на разницу весов * aging_interval секунд,
+    поэтому низкоприоритетная работа не голодает.
+    """
+    
+    # Чем меньше вес, тем выше приоритет
+    DEFAULT_TYPE_WEIGHTS = {
+        'exploitation': 0,
+        'vulnerability_scan': 0,
+        'internal_scan': 1,
+        'service': 1,
+        'open_ports': 2,
+        'initial_target': 3,
+        'active_host': 3,
+        'ip_address': 4,
+        'vulnerability': 5,
+        'exploitation_success': 5,
+        'domain_scan': 6,
+        'subdomain': 8,
+        'custom': 5
+    }
+    
+    DEFAULT_PRIORITY_OFFSETS = {
+        'critical': -6,
+        'high': -3,
+        'normal': 0,
+        'low': 3
+    }
+    
+    def __init__(self, config: Dict[str, Any] = None):
+        config = config or {}
+        self.type_weights = {**self.DEFAULT_TYPE_WEIGHTS, **config.get('type_weights', {})}
+        self.priority_offsets = {**self.DEFAULT_PRIORITY_OFFSETS, **config.get('priority_offsets', {})}
+        self.depth_weight = config.get('depth_weight', 0.5)
+        self.default_weight = config.get('default_weight', 5)
+        # Сколько секунд ожидания компенсирует одна единица веса
+        self.aging_interval = config.get('aging_interval', 2.0)
+        self._sequence = itertools.count()
+    
+    def weight(self, node) -> float:
+        """Вес узла без учета времени ожидания"""
+        node_type = getattr(node.type, 'value', node.type)
+        weight = self.type_weights.get(node_type, self.default_weight)
+        weight += node.depth * self.depth_weight
+        
+        priority = node.get_meta('priority', 'normal') if hasattr(node, 'get_meta') else (node.metadata or {}).get('priority', 'normal')
+        if isinstance(priority, (int, float)):
+            weight += priority
+        else:
+            weight += self.priority_offsets.get(priority, 0)
+        
+        return weight
+    
+    def make_entry(self, node) -> Tuple[float, int, Any]:
+        """Элемент очереди: (виртуальный дедлайн, порядковый номер, узел)"""
+        deadline = time.monotonic() + self.weight(node) * self.aging_interval
+        return (deadline, next(self._sequence), node)
+
+
+class BatchPolicy:
+    """
+    Настройки объединения задач одного модуля в один вызов scan()
+    
+    Воркер, взявший задачу, становится лидером партии и ждет попутные задачи
+    того же модуля не дольше max_wait секунд или до max_batch_size задач.
+    
+    Модуль обрабатывает цели партии параллельно (concurrency целей
+    одновременно, module_concurrency - для отдельных модулей), поэтому таймаут
+    партии - таймаут задачи на каждую "волну" целей, но не больше max_timeout.
+    """
+    
+    def __init__(self, config: Dict[str, Any] = None):
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.max_batch_size = max(1, int(config.get('max_batch_size', 256)))
+        self.max_wait = config.get('max_wait', 0.05)
+        self.exclude_modules = set(config.get('exclude_modules', []))
+        self.concurrency = max(1, int(config.get('concurrency', 16)))
+        self.module_concurrency = dict(config.get('module_concurrency', {}))
+        self.max_timeout = config.get('max_timeout', 300.0)
+    
+    def allows(self, module_name: str) -> bool:
+        """Можно ли объединять задачи модуля"""
+        return self.enabled and self.max_batch_size > 1 and module_name not in self.exclude_modules
+    
+    def timeout(self, module_name: str, task_timeout: float, size: int) -> float:
+        """Таймаут партии из size задач модуля"""
+        concurrency = max(1, int(self.module_concurrency.get(module_name, self.concurrency)))
+        waves = -(-size // concurrency)
+        return max(task_timeout, min(task_timeout * waves, self.max_timeout))
+
+
+class TaskBatch:
+    """Открытая партия задач: элементы очереди, собранные лидером"""
+    
+    __slots__ = ('key', 'entries', 'full')
+    
+    def __init__(self, key: Tuple):
+        self.key = key
+        self.entries: List[Tuple[float, int, Any]] = []
+        self.full = asyncio.Event()
@@ -68,6 +68,7 @@ class ControlsPanel:
                 'retry_count': 2
             },
             'custom_ports': [80, 443, 22, 21, 25, 53, 110, 143, 993, 995, 8080, 8443],
+            'dns_servers': ["8.8.8.8", "1.1.1.1"],
             'user_agents': [
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
@@ -387,6 +388,7 @@ class ControlsPanel:
                 tag="dns_servers",
                 default_value="8.8.8.8,1.1.1.1",
                 width=-1,
+                on_enter=True,
                 callback=self._on_config_change
             )
     
@@ -498,6 +500,23 @@ class ControlsPanel:
         config_key = config_map.get(sender)
         if config_key:
             self.scan_config['advanced_options'][config_key] = app_data
+        elif sender == "dns_servers":
+            self._on_dns_servers_change(app_data)
+    
+    def _on_dns_servers_change(self, app_data: str):
+        """Обработчик изменения DNS-серверов: список передается резолверу subdomain_scanner"""
+        servers = [server.strip() for server in app_data.split(',') if server.strip()]
+        if not servers:
+            return
+        
+        modules = getattr(self.engine, 'active_modules', {}) if self.engine else {}
+        scanner = modules.get('subdomain_scanner')
+        if scanner is not None and hasattr(scanner, 'set_dns_servers'):
+            if not scanner.set_dns_servers(servers):
+                self.add_to_log(f"❌ Invalid DNS servers: {', '.join(servers)}")
+                return
+            self.add_to_log(f"🔧 DNS servers updated: {', '.join(servers)}")
+        self.scan_config['dns_servers'] = servers
     
     def _on_ports_change(self, sender, app_data):
         """Обработчик изменения портов"""
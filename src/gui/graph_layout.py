@@ -0,0 +1,291 @@
+"""
+Силовая раскладка графа сети (NumPy)
+"""
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+
+class ForceLayout:
+    """
+    Инкрементальная силовая раскладка Фрюхтермана-Рейнгольда
+
+    Позиции хранятся в массивах NumPy, итерация полностью векторизована.
+    Отталкивание считается в сеточном приближении: плоскость делится на
+    ячейки со стороной 2k, и узел отталкивается только от узлов своей и
+    соседних ячеек (дальние силы пренебрежимо малы). Рёбра притягивают
+    концы, слабая гравитация удерживает компоненты связности рядом.
+
+    Раскладка "теплая": новые узлы ставятся рядом с соседом, существующие
+    позиции сохраняются, а температура лишь частично поднимается, поэтому
+    граф плавно сходится по мере роста, а не перестраивается заново.
+    """
+
+    # Предел числа пар ближнего поля за итерацию; сверх него пары выбираются
+    # случайно, а силы масштабируются
+    MAX_PAIRS = 400_000
+    _KEY_OFFSET = 1 << 20
+    _KEY_BASE = 1 << 21
+
+    def __init__(self, ideal_length: float = 80.0, gravity: float = 0.01,
+                 initial_temperature: float = 40.0, min_temperature: float = 0.5,
+                 cooling: float = 0.96, reheat: float = 15.0, seed: Optional[int] = None):
+        self.logger = logging.getLogger('RapidRecon.GraphLayout')
+        self.k = float(ideal_length)
+        self.gravity = gravity
+        self.min_temperature = min_temperature
+        self.cooling = cooling
+        self.reheat = reheat
+        self.temperature = initial_temperature
+
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+
+        self._ids: List[Any] = []
+        self._index: Dict[Any, int] = {}
+        self._pos = np.zeros((64, 2), dtype=np.float64)
+        self._degree = np.zeros(64, dtype=np.int64)
+        self._edges: List[Tuple[int, int]] = []
+        self._edge_array: Optional[np.ndarray] = None
+
+        # Версия увеличивается при каждом изменении позиций
+        self.version = 0
+        self.iterations = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ------------------------------------------------------------------
+    # Изменение графа
+    # ------------------------------------------------------------------
+
+    def add_node(self, node_id: Any, near: Any = None,
+                 position: Optional[Tuple[float, float]] = None) -> Tuple[float, float]:
+        """
+        Добавление узла с теплым стартом
+
+        Args:
+            node_id: Идентификатор узла
+            near: Узел, рядом с которым поставить новый
+            position: Явная начальная позиция
+
+        Returns:
+            Начальная позиция узла
+        """
+        with self._lock:
+            if node_id in self._index:
+                return self.position(node_id)
+
+            count = len(self._ids)
+            if count == len(self._pos):
+                self._pos = np.resize(self._pos, (count * 2, 2))
+                self._degree = np.resize(self._degree, count * 2)
+
+            if position is not None:
+                point = np.asarray(position, dtype=np.float64)
+            elif near in self._index:
+                point = self._pos[self._index[near]] + self._jitter(self.k)
+            elif count:
+                # Без соседа - на окраине текущей раскладки
+                center = self._pos[:count].mean(axis=0)
+                point = center + self._jitter(self.k * np.sqrt(count + 1))
+            else:
+                point = np.zeros(2)
+
+            self._pos[count] = point
+            self._degree[count] = 0
+            self._index[node_id] = count
+            self._ids.append(node_id)
+            self.temperature = max(self.temperature, self.reheat)
+            self.version += 1
+            return float(point[0]), float(point[1])
+
+    def add_edge(self, source_id: Any, target_id: Any):
+        """
+        Добавление ребра
+
+        Если у цели еще нет рёбер (только что добавленный узел), она
+        переносится к источнику - так узел сразу появляется у своего родителя.
+        """
+        with self._lock:
+            source = self._index.get(source_id)
+            target = self._index.get(target_id)
+            if source is None or target is None or source == target:
+                return
+
+            if self._degree[target] == 0:
+                self._pos[target] = self._pos[source] + self._jitter(self.k)
+            elif self._degree[source] == 0:
+                self._pos[source] = self._pos[target] + self._jitter(self.k)
+
+            self._degree[source] += 1
+            self._degree[target] += 1
+            self._edges.append((source, target))
+            self._edge_array = None
+            self.temperature = max(self.temperature, self.reheat)
+            self.version += 1
+
+    def _jitter(self, radius: float) -> np.ndarray:
+        angle = self._rng.uniform(0.0, 2.0 * np.pi)
+        distance = radius * self._rng.uniform(0.5, 1.0)
+        return np.array([np.cos(angle), np.sin(angle)]) * distance
+
+    # ------------------------------------------------------------------
+    # Итерации
+    # ------------------------------------------------------------------
+
+    @property
+    def settled(self) -> bool:
+        """Раскладка остыла - итерации не нужны до следующего изменения графа"""
+        return self.temperature <= self.min_temperature or len(self._ids) < 2
+
+    def step(self, iterations: int = 1) -> float:
+        """
+        Ограниченное число итераций раскладки
+
+        Returns:
+            Максимальное смещение узла на последней итерации
+        """
+        moved = 0.0
+        with self._lock:
+            count = len(self._ids)
+            if count < 2:
+                return 0.0
+            for _ in range(iterations):
+                if self.settled:
+                    break
+                moved = self._iterate(count)
+                self.iterations += 1
+            self.version += 1
+        return moved
+
+    def _iterate(self, count: int) -> float:
+        pos = self._pos[:count]
+        k2 = self.k * self.k
+        disp = np.zeros_like(pos)
+
+        # Отталкивание (ближнее поле по сетке): k^2 / d
+        i, j, weight = self._near_pairs(pos)
+        if len(i):
+            delta = pos[i] - pos[j]
+            dist2 = np.einsum('ij,ij->i', delta, delta)
+            np.maximum(dist2, 1e-4, out=dist2)
+            # Пары дальше 2k по ФР-сетке не учитываются
+            factor = np.where(dist2 < 4.0 * k2, k2 / dist2, 0.0) * weight
+            disp[:, 0] += np.bincount(i, weights=delta[:, 0] * factor, minlength=count)
+            disp[:, 1] += np.bincount(i, weights=delta[:, 1] * factor, minlength=count)
+
+        # Притяжение по рёбрам: d^2 / k
+        edges = self._edge_pairs()
+        if edges is not None:
+            src, dst = edges[:, 0], edges[:, 1]
+            delta = pos[src] - pos[dst]
+            dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+            pull = delta * (dist / self.k)[:, None]
+            disp[:, 0] -= np.bincount(src, weights=pull[:, 0], minlength=count)
+            disp[:, 1] -= np.bincount(src, weights=pull[:, 1], minlength=count)
+            disp[:, 0] += np.bincount(dst, weights=pull[:, 0], minlength=count)
+            disp[:, 1] += np.bincount(dst, weights=pull[:, 1], minlength=count)
+
+        # Гравитация к центру масс
+        disp -= self.gravity * (pos - pos.mean(axis=0))
+
+        # Смещение ограничено температурой
+        length = np.sqrt(np.einsum('ij,ij->i', disp, disp))
+        scale = np.minimum(length, self.temperature) / np.maximum(length, 1e-9)
+        disp *= scale[:, None]
+        pos += disp
+        moved = float(np.minimum(length, self.temperature).max())
+
+        self.temperature = max(self.temperature * self.cooling, self.min_temperature)
+        return moved
+
+    def _edge_pairs(self) -> Optional[np.ndarray]:
+        if not self._edges:
+            return None
+        if self._edge_array is None:
+            self._edge_array = np.asarray(self._edges, dtype=np.int64)
+        return self._edge_array
+
+    def _near_pairs(self, pos: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Упорядоченные пары узлов из соседних ячеек сетки
+
+        Returns:
+            (i, j, вес) - сила действует на i; вес > 1, если пары прорежены
+        """
+        cell_size = 2.0 * self.k
+        cells = np.floor(pos / cell_size).astype(np.int64) + self._KEY_OFFSET
+        keys = cells[:, 0] * self._KEY_BASE + cells[:, 1]
+
+        order = np.argsort(keys, kind='stable')
+        cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+        pair_a, pair_b = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                neighbor = cell_keys + dx * self._KEY_BASE + dy
+                found = np.searchsorted(cell_keys, neighbor)
+                found = np.minimum(found, len(cell_keys) - 1)
+                valid = cell_keys[found] == neighbor
+                pair_a.append(np.nonzero(valid)[0])
+                pair_b.append(found[valid])
+        a = np.concatenate(pair_a)
+        b = np.concatenate(pair_b)
+
+        # Декартово произведение узлов ячеек a и b
+        na, nb = counts[a], counts[b]
+        sizes = na * nb
+        total = int(sizes.sum())
+        weight = 1.0
+        offsets = np.cumsum(sizes) - sizes
+        if total > self.MAX_PAIRS:
+            flat = np.sort(self._rng.integers(0, total, self.MAX_PAIRS))
+            weight = total / self.MAX_PAIRS
+        else:
+            flat = np.arange(total)
+        pair = np.searchsorted(offsets, flat, side='right') - 1
+        local = flat - offsets[pair]
+
+        i = order[starts[a][pair] + local // nb[pair]]
+        j = order[starts[b][pair] + local % nb[pair]]
+        distinct = i != j
+        return i[distinct], j[distinct], weight
+
+    # ------------------------------------------------------------------
+    # Чтение позиций
+    # ------------------------------------------------------------------
+
+    def position(self, node_id: Any) -> Tuple[float, float]:
+        """Текущая позиция узла"""
+        with self._lock:
+            x, y = self._pos[self._index[node_id]]
+            return float(x), float(y)
+
+    def snapshot(self) -> Tuple[List[Any], np.ndarray]:
+        """Копия идентификаторов и позиций (для отрисовки из другого потока)"""
+        with self._lock:
+            count = len(self._ids)
+            return list(self._ids), self._pos[:count].copy()
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Границы раскладки (min_x, min_y, max_x, max_y)"""
+        with self._lock:
+            count = len(self._ids)
+            if not count:
+                return 0.0, 0.0, 0.0, 0.0
+            low = self._pos[:count].min(axis=0)
+            high = self._pos[:count].max(axis=0)
+            return float(low[0]), float(low[1]), float(high[0]), float(high[1])
+
+    def clear(self):
+        """Удаление всех узлов и рёбер"""
+        with self._lock:
+            self._ids.clear()
+            self._index.clear()
+            self._edges.clear()
+            self._edge_array = None
+            self._degree[:] = 0
+            self.version += 1
@@ -0,0 +1,484 @@
+"""
+Отрисовка графа сети - сохраняемая сцена с отсечением и уровнями детализации
+"""
+import dearpygui.dearpygui as dpg
+from typing import Dict, Any, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+
+
+class GraphRenderer:
+    """
+    Сохраняемая (retained) сцена графа на drawlist DearPyGui
+
+    Элементы рисования создаются один раз и живут между кадрами:
+
+    * узлы и рёбра рисуются в мировых координатах внутри draw_node, а
+      панорамирование и масштаб - это только apply_transform этого узла;
+    * создаются элементы лишь для узлов в видимой области (с запасом),
+      при сдвиге вида добавляются вошедшие и удаляются вышедшие узлы;
+    * при движении раскладки меняются координаты уже созданных элементов;
+    * уровни детализации: при мелком масштабе подписи не рисуются, а если
+      масштаб совсем мелкий или видимых узлов слишком много, узлы
+      объединяются по сетке в агрегированные глифы с числом узлов.
+    """
+
+    LABEL_MIN_SCALE = 0.5
+    CLUSTER_MAX_SCALE = 0.35
+    MAX_DRAWN_NODES = 2500
+    CLUSTER_CELL_PX = 48
+    CULL_MARGIN_PX = 60
+    GRID_STEP = 50
+
+    EXPLOIT_TYPES = ('exploitation', 'exploitation_success')
+
+    def __init__(self, view, canvas: str = "graph_canvas"):
+        self.logger = logging.getLogger('RapidRecon.GraphRenderer')
+        self.view = view
+        self.canvas = canvas
+
+        # Узел-id -> элементы рисования и то, с какими параметрами они созданы
+        self._node_items: Dict[Any, Dict[str, Any]] = {}
+        # Индекс ребра -> (линия, p1, p2)
+        self._edge_items: Dict[int, Tuple[int, Tuple[float, float], Tuple[float, float]]] = {}
+        self._cluster_items: List[int] = []
+        self._edges_by_node: Dict[Any, List[int]] = {}
+        self._edges_indexed = 0
+
+        # Позиции узлов и запросы видимой области - через SpatialGrid вида
+        self.index = view.spatial_index
+        self._index_version = -1
+
+        self._mode: Optional[str] = None
+        self._view_state: Optional[Tuple] = None
+        self._grid_state: Optional[Tuple] = None
+        # Узел -> (кольцо выделения, центр, радиус) и рамка выделения
+        self._selection_items: Dict[Any, Tuple[int, Tuple[float, float], float]] = {}
+        self._band_item: Optional[int] = None
+        self._scene_ready = False
+
+        self.stats = {'updates': 0, 'created': 0, 'deleted': 0, 'moved': 0}
+
+    # ------------------------------------------------------------------
+    # Сцена
+    # ------------------------------------------------------------------
+
+    def _ensure_scene(self) -> bool:
+        if self._scene_ready and dpg.does_item_exist("graph_scene"):
+            return True
+        if not dpg.does_item_exist(self.canvas):
+            return False
+
+        self._forget_items()
+        dpg.delete_item(self.canvas, children_only=True)
+        dpg.add_draw_layer(tag="graph_background", parent=self.canvas)
+        with dpg.draw_node(tag="graph_scene", parent=self.canvas):
+            dpg.add_draw_layer(tag="graph_edges_layer")
+            dpg.add_draw_layer(tag="graph_nodes_layer")
+            dpg.add_draw_layer(tag="graph_labels_layer")
+            dpg.add_draw_layer(tag="graph_overlay_layer")
+        self._scene_ready = True
+        return True
+
+    def _forget_items(self):
+        """Сброс учета элементов (сами элементы удаляются вместе со сценой)"""
+        self._node_items.clear()
+        self._edge_items.clear()
+        self._cluster_items = []
+        self._selection_items.clear()
+        self._band_item = None
+        self._mode = None
+        self._view_state = None
+        self._grid_state = None
+
+    def reset(self):
+        """Удаление всех элементов сцены (следующий update() создаст их заново)"""
+        if dpg.does_item_exist(self.canvas):
+            dpg.delete_item(self.canvas, children_only=True)
+        self._forget_items()
+        self._scene_ready = False
+        self._edges_by_node.clear()
+        self._edges_indexed = 0
+        self._index_version = -1
+
+    # ------------------------------------------------------------------
+    # Обновление
+    # ------------------------------------------------------------------
+
+    def update(self):
+        """Приведение сцены к текущим данным, раскладке и виду"""
+        if not self._ensure_scene():
+            return
+
+        view = self.view
+        scale = view.graph_scale
+        offset = (float(view.graph_offset[0]), float(view.graph_offset[1]))
+        width, height = self._canvas_size()
+
+        layout_changed = self._refresh_positions()
+        self._index_edges()
+
+        view_state = (scale, offset, width, height)
+        if not layout_changed and view_state == self._view_state and not self._pending_changes():
+            self._update_selection(scale)
+            return
+        scale_changed = self._view_state is None or self._view_state[0] != scale
+        self._view_state = view_state
+        self.stats['updates'] += 1
+
+        self._draw_background(width, height, scale)
+        dpg.apply_transform(
+            "graph_scene",
+            dpg.create_scale_matrix([scale, scale, 1.0]) * dpg.create_translation_matrix([offset[0], offset[1], 0.0])
+        )
+
+        visible = self.visible_rows(self.world_rect(width, height, scale, offset))
+        mode = 'clusters' if scale < self.CLUSTER_MAX_SCALE or len(visible) > self.MAX_DRAWN_NODES else 'nodes'
+        if mode != self._mode:
+            self._clear_items()
+            self._mode = mode
+            scale_changed = True
+
+        if mode == 'clusters':
+            self._draw_clusters(visible, scale)
+        else:
+            self._sync_nodes(visible, scale, scale_changed)
+        self._update_selection(scale)
+
+    def _canvas_size(self) -> Tuple[int, int]:
+        """Размер холста (у drawlist с width=-1 берется фактический размер)"""
+        width = dpg.get_item_width(self.canvas) or 0
+        height = dpg.get_item_height(self.canvas) or 0
+        if width <= 0 or height <= 0:
+            rect_width, rect_height = dpg.get_item_rect_size(self.canvas)
+            width = width if width > 0 else rect_width
+            height = height if height > 0 else rect_height
+        return int(width), int(height)
+
+    def _pending_changes(self) -> bool:
+        """Есть узлы или рёбра, которых еще нет в снимке"""
+        return len(self.view.nodes) != len(self.index.rows) or len(self.view.edges) != self._edges_indexed
+
+    def _refresh_positions(self) -> bool:
+        """Синхронизация индекса с раскладкой; True, если позиции изменились с прошлой отрисовки"""
+        self.index.sync(self.view.layout)
+        if self.index.version == self._index_version:
+            return False
+        self._index_version = self.index.version
+        return True
+
+    def _index_edges(self):
+        """Список рёбер каждого узла (рёбра только добавляются)"""
+        edges = self.view.edges
+        for index in range(self._edges_indexed, len(edges)):
+            edge = edges[index]
+            self._edges_by_node.setdefault(edge['source'], []).append(index)
+            self._edges_by_node.setdefault(edge['target'], []).append(index)
+        self._edges_indexed = len(edges)
+
+    def world_rect(self, width: float, height: float, scale: float,
+                   offset: Tuple[float, float]) -> Tuple[float, float, float, float]:
+        """Видимая область в мировых координатах (с запасом CULL_MARGIN_PX)"""
+        margin = self.CULL_MARGIN_PX / scale
+        return (
+            -offset[0] - margin,
+            -offset[1] - margin,
+            width / scale - offset[0] + margin,
+            height / scale - offset[1] + margin
+        )
+
+    def visible_rows(self, rect: Tuple[float, float, float, float]) -> np.ndarray:
+        """Строки снимка, попадающие в прямоугольник"""
+        return self.index.query_rect(*rect)
+
+    # ------------------------------------------------------------------
+    # Уровень "узлы"
+    # ------------------------------------------------------------------
+
+    def _sync_nodes(self, visible: np.ndarray, scale: float, scale_changed: bool):
+        """Создание вошедших, удаление вышедших и перемещение видимых узлов"""
+        ids = self.index.ids
+        positions = self.index.positions
+        rows = self.index.rows
+        nodes = self.view.nodes
+        show_labels = scale >= self.LABEL_MIN_SCALE
+
+        visible_ids = {ids[row] for row in visible.tolist() if ids[row] in nodes}
+        for node_id in [node_id for node_id in self._node_items if node_id not in visible_ids]:
+            self._delete_node(node_id)
+
+        for node_id in visible_ids:
+            x, y = positions[rows[node_id]]
+            position = (float(x), float(y))
+            items = self._node_items.get(node_id)
+            if items is None:
+                self._create_node(node_id, nodes[node_id], position, scale, show_labels)
+            elif items['labels'] != show_labels:
+                self._delete_node(node_id)
+                self._create_node(node_id, nodes[node_id], position, scale, show_labels)
+            elif scale_changed or items['position'] != position:
+                self._place_node(items, position, scale, scale_changed)
+
+        self._sync_edges(visible_ids, scale, scale_changed)
+
+    def _create_node(self, node_id: Any, node: Dict, position: Tuple[float, float],
+                     scale: float, show_labels: bool):
+        size = node['size']
+        items = {
+            'position': position,
+            'size': size,
+            'labels': show_labels,
+            'circle': dpg.draw_circle(
+                position, size * scale,
+                fill=node['color'],
+                color=[255, 255, 255, 150],
+                thickness=2,
+                parent="graph_nodes_layer"
+            ),
+            'ring': None,
+            'label': None,
+            'label_width': 0
+        }
+        # Для узлов успешной эксплуатации - эффект "пульсации"
+        if node['type'] == 'exploitation_success':
+            items['ring'] = dpg.draw_circle(
+                position, (size + 5) * scale,
+                color=[255, 20, 147, 100],
+                thickness=2,
+                parent="graph_nodes_layer"
+            )
+        if show_labels:
+            label = self.view.get_node_label(node)
+            items['label_width'] = len(label) * 3
+            items['label'] = dpg.draw_text(
+                self._label_position(position, size, items['label_width'], scale),
+                label,
+                color=self.view.colors['text'],
+                size=12 * scale,
+                parent="graph_labels_layer"
+            )
+        self._node_items[node_id] = items
+        self.stats['created'] += 1
+
+    def _place_node(self, items: Dict[str, Any], position: Tuple[float, float], scale: float,
+                    resize: bool):
+        """Перемещение элементов узла; при смене масштаба - и их размеров"""
+        size = items['size']
+        items['position'] = position
+        if resize:
+            dpg.configure_item(items['circle'], center=position, radius=size * scale)
+            if items['ring'] is not None:
+                dpg.configure_item(items['ring'], center=position, radius=(size + 5) * scale)
+        else:
+            dpg.configure_item(items['circle'], center=position)
+            if items['ring'] is not None:
+                dpg.configure_item(items['ring'], center=position)
+        if items['label'] is not None:
+            label_position = self._label_position(position, size, items['label_width'], scale)
+            if resize:
+                dpg.configure_item(items['label'], pos=label_position, size=12 * scale)
+            else:
+                dpg.configure_item(items['label'], pos=label_position)
+        self.stats['moved'] += 1
+
+    @staticmethod
+    def _label_position(position: Tuple[float, float], size: float, label_width: float,
+                        scale: float) -> List[float]:
+        # Подпись под узлом: экранные отступы переводятся в мировые
+        return [position[0] - label_width / scale, position[1] + size + 5 / scale]
+
+    def _delete_node(self, node_id: Any):
+        items = self._node_items.pop(node_id)
+        for key in ('circle', 'ring', 'label'):
+            if items[key] is not None:
+                dpg.delete_item(items[key])
+        self.stats['deleted'] += 1
+
+    def _sync_edges(self, visible_ids: Set[Any], scale: float, scale_changed: bool):
+        """Рёбра, у которых хотя бы один конец виден"""
+        edges = self.view.edges
+        wanted = set()
+        for node_id in visible_ids:
+            wanted.update(self._edges_by_node.get(node_id, ()))
+
+        for index in [index for index in self._edge_items if index not in wanted]:
+            dpg.delete_item(self._edge_items.pop(index)[0])
+
+        rows = self.index.rows
+        positions = self.index.positions
+        for index in wanted:
+            edge = edges[index]
+            source_row = rows.get(edge['source'])
+            target_row = rows.get(edge['target'])
+            if source_row is None or target_row is None:
+                continue
+            p1 = (float(positions[source_row, 0]), float(positions[source_row, 1]))
+            p2 = (float(positions[target_row, 0]), float(positions[target_row, 1]))
+
+            current = self._edge_items.get(index)
+            if current is None:
+                self._edge_items[index] = (self._create_edge(edge, p1, p2, scale), p1, p2)
+            elif scale_changed:
+                dpg.configure_item(current[0], p1=p1, p2=p2,
+                                   thickness=self._edge_thickness(edge) * scale)
+                self._edge_items[index] = (current[0], p1, p2)
+            elif (current[1], current[2]) != (p1, p2):
+                dpg.configure_item(current[0], p1=p1, p2=p2)
+                self._edge_items[index] = (current[0], p1, p2)
+
+    def _edge_thickness(self, edge: Dict) -> float:
+        # Толщина связи зависит от типов узлов
+        nodes = self.view.nodes
+        if (nodes[edge['source']]['type'] in self.EXPLOIT_TYPES or
+                nodes[edge['target']]['type'] in self.EXPLOIT_TYPES):
+            return 4  # Толще для атакующих связей
+        return 2
+
+    def _create_edge(self, edge: Dict, p1: Tuple[float, float], p2: Tuple[float, float],
+                     scale: float) -> int:
+        return dpg.draw_line(
+            p1, p2,
+            color=edge['color'],
+            thickness=self._edge_thickness(edge) * scale,
+            parent="graph_edges_layer"
+        )
+
+    # ------------------------------------------------------------------
+    # Уровень "кластеры"
+    # ------------------------------------------------------------------
+
+    def _draw_clusters(self, visible: np.ndarray, scale: float):
+        """
+        Агрегированные глифы: видимые узлы группируются по мировой сетке с
+        шагом CLUSTER_CELL_PX экранных пикселей; число глифов ограничено
+        размером экрана, а не числом узлов.
+        """
+        for item in self._cluster_items:
+            dpg.delete_item(item)
+        self._cluster_items = []
+        if not len(visible):
+            return
+
+        cell = self.CLUSTER_CELL_PX / scale
+        points = self.index.positions[visible]
+        cells = np.floor(points / cell).astype(np.int64)
+        keys = cells[:, 0] * (1 << 32) + cells[:, 1]
+        _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+        centers_x = np.bincount(inverse, weights=points[:, 0]) / counts
+        centers_y = np.bincount(inverse, weights=points[:, 1]) / counts
+
+        nodes = self.view.nodes
+        show_labels = scale >= self.LABEL_MIN_SCALE
+        radius_limit = self.CLUSTER_CELL_PX / 2
+        for center_x, center_y, count, row in zip(centers_x.tolist(), centers_y.tolist(),
+                                                  counts.tolist(), visible[first].tolist()):
+            node = nodes.get(self.index.ids[row])
+            color = node['color'] if node else self.view.colors['node_default']
+            center = (center_x, center_y)
+            if count == 1:
+                radius = min(node['size'] if node else 10.0, radius_limit) * scale
+                self._cluster_items.append(dpg.draw_circle(
+                    center, radius, fill=color, color=[255, 255, 255, 120],
+                    parent="graph_nodes_layer"
+                ))
+                continue
+
+            radius = min(6 + 3 * np.log2(count), radius_limit)
+            self._cluster_items.append(dpg.draw_circle(
+                center, radius, fill=color, color=[255, 255, 255, 200], thickness=2,
+                parent="graph_nodes_layer"
+            ))
+            if show_labels or count >= 10:
+                text = str(count)
+                self._cluster_items.append(dpg.draw_text(
+                    [center_x - len(text) * 3.5 / scale, center_y - 7 / scale], text,
+                    color=self.view.colors['text'], size=13,
+                    parent="graph_labels_layer"
+                ))
+
+    def _clear_items(self):
+        """Удаление элементов текущего уровня детализации"""
+        for node_id in list(self._node_items):
+            self._delete_node(node_id)
+        for line, _, _ in self._edge_items.values():
+            dpg.delete_item(line)
+        self._edge_items.clear()
+        for item in self._cluster_items:
+            dpg.delete_item(item)
+        self._cluster_items = []
+
+    # ------------------------------------------------------------------
+    # Фон и выделение
+    # ------------------------------------------------------------------
+
+    def _draw_background(self, width: int, height: int, scale: float):
+        """Фон с сеткой (экранные координаты, перерисовка только при смене размера или масштаба)"""
+        grid_state = (width, height, scale)
+        if grid_state == self._grid_state:
+            return
+        self._grid_state = grid_state
+        dpg.delete_item("graph_background", children_only=True)
+
+        colors = self.view.colors
+        dpg.draw_rectangle([0, 0], [width, height], fill=colors['background'], parent="graph_background")
+        grid_size = max(int(self.GRID_STEP * scale), 5)
+        for x in range(0, width, grid_size):
+            dpg.draw_line([x, 0], [x, height], color=colors['grid'], thickness=1, parent="graph_background")
+        for y in range(0, height, grid_size):
+            dpg.draw_line([0, y], [width, y], color=colors['grid'], thickness=1, parent="graph_background")
+
+    def _update_selection(self, scale: float):
+        """
+        Кольца выделения и рамка выделения
+
+        Кольцо рисуется у выбранного узла и у узлов, выделенных рамкой,
+        но только у тех, что сейчас отрисованы - выделение тысяч узлов
+        не создает тысячи элементов.
+        """
+        view = self.view
+        wanted = {node_id for node_id in view.selected_nodes if node_id in self._node_items}
+        if view.selected_node in view.nodes:
+            wanted.add(view.selected_node)
+
+        for node_id in [node_id for node_id in self._selection_items if node_id not in wanted]:
+            dpg.delete_item(self._selection_items.pop(node_id)[0])
+
+        for node_id in wanted:
+            center = self.index.position(node_id)
+            if center is None:
+                continue
+            radius = view.nodes[node_id]['size'] * scale + 3
+            current = self._selection_items.get(node_id)
+            if current is None:
+                item = dpg.draw_circle(
+                    center, radius, color=[255, 255, 0, 200], thickness=3,
+                    parent="graph_overlay_layer"
+                )
+                self._selection_items[node_id] = (item, center, radius)
+            elif (current[1], current[2]) != (center, radius):
+                dpg.configure_item(current[0], center=center, radius=radius)
+                self._selection_items[node_id] = (current[0], center, radius)
+
+        band = view.selection_band
+        if band is None:
+            if self._band_item is not None:
+                dpg.configure_item(self._band_item, show=False)
+        elif self._band_item is None:
+            self._band_item = dpg.draw_rectangle(
+                band[:2], band[2:], color=[255, 255, 0, 200], fill=[255, 255, 0, 30],
+                thickness=1, parent="graph_overlay_layer"
+            )
+        else:
+            dpg.configure_item(self._band_item, pmin=band[:2], pmax=band[2:], show=True)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика отрисовки"""
+        return {
+            **self.stats,
+            'mode': self._mode,
+            'drawn_nodes': len(self._node_items),
+            'drawn_edges': len(self._edge_items),
+            'clusters': len(self._cluster_items)
+        }
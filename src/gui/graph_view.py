@@ -1,25 +1,60 @@
 import dearpygui.dearpygui as dpg
-from typing import Dict, List, Any, Optional
-import math
-import random
+from typing import Dict, List, Any, Optional, Tuple
+import threading
+import time
+from gui.graph_layout import ForceLayout
+from gui.graph_renderer import GraphRenderer
+from gui.spatial_index import SpatialGrid
 
 class GraphView:
     """
     Компонент для визуализации графа сети в RapidRecon
     Поддерживает интерактивное отображение узлов и связей
+    
+    Позиции узлов рассчитывает ForceLayout в фоновом потоке: за один тик
+    выполняется не больше LAYOUT_ITERATIONS_PER_TICK итераций, а отрисовка
+    лишь забирает готовые позиции через poll_layout().
+    
+    Холст ведет GraphRenderer: элементы рисования сохраняются между кадрами,
+    панорамирование и масштаб меняют только трансформацию сцены.
+    
+    Выбор кликом, подсказка при наведении, выделение рамкой (правая кнопка)
+    и отсечение по видимой области обращаются к SpatialGrid, а не к self.nodes.
     """
     
+    LAYOUT_ITERATIONS_PER_TICK = 2
+    LAYOUT_TICK_INTERVAL = 1 / 30
+    # Центр графа на холсте при масштабе 1
+    GRAPH_CENTER = (400, 250)
+    # Допуск попадания курсором в узел, пикселей экрана
+    HIT_TOLERANCE_PX = 3
+    
     def __init__(self):
         self.nodes = {}
         self.edges = []
         self.node_positions = {}
         self.next_node_id = 1
         self.selected_node = None
+        self.selected_nodes = set()  # Узлы, выделенные рамкой
+        self.hovered_node = None
+        self.selection_band = None  # Рамка выделения в мировых координатах
+        self.band_start = None
         self.graph_scale = 1.0
         self.graph_offset = [0, 0]
         self.is_dragging = False
         self.drag_start_pos = [0, 0]
         
+        # Силовая раскладка и поток, который ее итерирует
+        self.layout = ForceLayout()
+        self.layout_version = -1  # Версия раскладки, которая сейчас отрисована
+        self.layout_thread = None
+        self.layout_running = False
+        self.layout_wakeup = threading.Event()
+        
+        # Пространственный индекс позиций и сохраняемая сцена холста
+        self.spatial_index = SpatialGrid(cell_size=2 * self.layout.k)
+        self.renderer = GraphRenderer(self)
+        
         # Настройка цветовой схемы
         self.setup_colors()
     
@@ -155,11 +190,19 @@ class GraphView:
                     # Фон будет рисоваться динамически
                     pass
                 
+                # Подсказка для узла под курсором
+                with dpg.tooltip("graph_canvas", tag="graph_tooltip", show=False):
+                    dpg.add_text("", tag="graph_tooltip_text")
+                
                 # Обработчики событий для интерактивности
                 with dpg.handler_registry():
                     dpg.add_mouse_click_handler(callback=self.on_canvas_click)
                     dpg.add_mouse_drag_handler(callback=self.on_canvas_drag)
                     dpg.add_mouse_wheel_handler(callback=self.on_canvas_scroll)
+                    dpg.add_mouse_move_handler(callback=self.on_canvas_hover)
+                    dpg.add_mouse_release_handler(callback=self.on_canvas_release)
+        
+        self.start_layout()
     
     def add_node(self, node_data: Dict[str, Any]) -> int:
         """Добавить узел в граф"""
@@ -203,35 +246,17 @@ class GraphView:
         }
         return sizes.get(node_type, sizes['default'])
     
-    def generate_node_position(self, node_id: int) -> List[float]:
-        """Генерация позиции для нового узла"""
-        if not self.nodes:
-            # Первый узел в центре
-            return [400, 250]
-        
-        # Распределяем узлы по кругу с группировкой по типам
-        total_nodes = len(self.nodes)
-        
-        # Для узлов эксплуатации размещаем ближе к центру
-        if any(node['type'] in ['exploitation', 'exploitation_success'] for node in self.nodes.values()):
-            # Если есть узлы атак, размещаем новые узлы вокруг них
-            exploit_nodes = [node for node in self.nodes.values() if node['type'] in ['exploitation', 'exploitation_success']]
-            if exploit_nodes:
-                center_node = exploit_nodes[0]
-                angle = (node_id * 2 * math.pi / max(total_nodes, 1)) + random.uniform(-0.2, 0.2)
-                radius = 100 + (total_nodes * 3)
-                x = center_node['position'][0] + radius * math.cos(angle)
-                y = center_node['position'][1] + radius * math.sin(angle)
-                return [x, y]
-        
-        # Стандартное распределение по кругу
-        angle = (node_id * 2 * math.pi / max(total_nodes, 1)) + random.uniform(-0.1, 0.1)
-        radius = 150 + (total_nodes * 5)
-        
-        center_x, center_y = 400, 250
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
+    def generate_node_position(self, node_id: int, near: Optional[int] = None) -> List[float]:
+        """
+        Начальная позиция нового узла
         
+        Узел добавляется в силовую раскладку: рядом с near, если он задан,
+        иначе на окраине графа. При первом ребре узел переносится к своему
+        соседу, дальше его двигает раскладка.
+        """
+        position = self.GRAPH_CENTER if not len(self.layout) else None
+        x, y = self.layout.add_node(node_id, near=near, position=position)
+        self.layout_wakeup.set()
         return [x, y]
     
     def add_edge(self, source_id: int, target_id: int):
@@ -248,6 +273,8 @@ class GraphView:
                 'target': target_id,
                 'color': edge_color
             })
+            self.layout.add_edge(source_id, target_id)
+            self.layout_wakeup.set()
             
             # Обновляем статистику
             self.update_statistics()
@@ -281,126 +308,105 @@ class GraphView:
         """Обновить отображение графа"""
         self.render_graph()
     
-    def render_graph(self):
-        """Отрисовать граф на canvas"""
-        dpg.delete_item("graph_canvas", children_only=True)
-        
-        # Рисуем фон
-        self.draw_background()
-        
-        # Рисуем связи
-        self.draw_edges()
+    def start_layout(self):
+        """Запуск фонового потока силовой раскладки"""
+        if self.layout_running:
+            return
+        self.layout_running = True
+        self.layout_thread = threading.Thread(target=self._layout_loop, daemon=True, name="GraphLayout")
+        self.layout_thread.start()
+    
+    def stop_layout(self):
+        """Остановка потока раскладки"""
+        self.layout_running = False
+        self.layout_wakeup.set()
+        if self.layout_thread:
+            self.layout_thread.join(timeout=1.0)
+            self.layout_thread = None
+    
+    def _layout_loop(self):
+        """Итерации раскладки вне потока отрисовки; поток спит, пока граф не изменится"""
+        while self.layout_running:
+            if self.layout.settled:
+                self.layout_wakeup.wait()
+                self.layout_wakeup.clear()
+                continue
+            self.layout.step(self.LAYOUT_ITERATIONS_PER_TICK)
+            time.sleep(self.LAYOUT_TICK_INTERVAL)
+    
+    def poll_layout(self) -> bool:
+        """
+        Обновление сцены, если раскладка сдвинула узлы (вызывается раз в кадр)
         
-        # Рисуем узлы
-        self.draw_nodes()
+        Returns:
+            True, если сцена была обновлена
+        """
+        if self.layout.version == self.layout_version:
+            return False
+        self.layout_version = self.layout.version
+        self.renderer.update()
+        return True
+    
+    def get_node_position(self, node_id: int) -> List[float]:
+        """Текущая позиция узла в раскладке"""
+        return list(self.layout.position(node_id))
+    
+    def screen_to_world(self, position: List[float]) -> Tuple[float, float]:
+        """Обратная трансформация: координаты холста -> координаты раскладки"""
+        return (
+            position[0] / self.graph_scale - self.graph_offset[0],
+            position[1] / self.graph_scale - self.graph_offset[1]
+        )
+    
+    def node_at(self, position: List[float]) -> Optional[int]:
+        """
+        Узел под точкой холста
         
-        # Рисуем информацию о выбранном узле
+        Кандидаты берутся из ячеек сетки вокруг точки (радиус - самый крупный
+        узел), затем выбирается ближайший, в круг которого попадает точка.
+        """
+        self.spatial_index.sync(self.layout)
+        x, y = self.screen_to_world(position)
+        tolerance = self.HIT_TOLERANCE_PX / self.graph_scale
+        max_size = max(self.get_node_size('exploitation_success'), self.get_node_size('initial_target'))
+        index = self.spatial_index
+        for row in index.query_radius(x, y, max_size + tolerance).tolist():
+            node_id = index.ids[row]
+            node = self.nodes.get(node_id)
+            if node is None:
+                continue
+            px, py = index.positions[row]
+            if (px - x) ** 2 + (py - y) ** 2 <= (node['size'] + tolerance) ** 2:
+                return node_id
+        return None
+    
+    def nodes_in_rect(self, start: List[float], end: List[float]) -> List[int]:
+        """Узлы внутри прямоугольника холста"""
+        self.spatial_index.sync(self.layout)
+        x1, y1 = self.screen_to_world(start)
+        x2, y2 = self.screen_to_world(end)
+        ids = self.spatial_index.ids_in_rect(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        return [node_id for node_id in ids if node_id in self.nodes]
+    
+    def select_node(self, node_id: Optional[int]):
+        """Выбор одного узла (None - снять выделение)"""
+        self.selected_node = node_id
+        self.selected_nodes.clear()
         self.update_node_info()
+        self.refresh_view()
     
-    def draw_background(self):
-        """Рисуем фон с сеткой"""
-        canvas_width = dpg.get_item_width("graph_canvas")
-        canvas_height = dpg.get_item_height("graph_canvas")
-        
-        # Фон
-        dpg.draw_rectangle(
-            [0, 0],
-            [canvas_width, canvas_height],
-            fill=self.colors['background'],
-            parent="graph_canvas"
-        )
+    def render_graph(self):
+        """Полная перерисовка графа на canvas"""
+        self.layout_version = self.layout.version
+        self.renderer.reset()
+        self.renderer.update()
         
-        # Сетка (упрощенная)
-        grid_size = 50 * self.graph_scale
-        for x in range(0, canvas_width, int(grid_size)):
-            dpg.draw_line(
-                [x, 0],
-                [x, canvas_height],
-                color=self.colors['grid'],
-                thickness=1,
-                parent="graph_canvas"
-            )
-        
-        for y in range(0, canvas_height, int(grid_size)):
-            dpg.draw_line(
-                [0, y],
-                [canvas_width, y],
-                color=self.colors['grid'],
-                thickness=1,
-                parent="graph_canvas"
-            )
-    
-    def draw_edges(self):
-        """Рисуем связи между узлами"""
-        for edge in self.edges:
-            source_node = self.nodes.get(edge['source'])
-            target_node = self.nodes.get(edge['target'])
-            
-            if source_node and target_node:
-                source_pos = self.apply_transform(source_node['position'])
-                target_pos = self.apply_transform(target_node['position'])
-                
-                # Толщина связи зависит от типов узлов
-                thickness = 2
-                if (source_node['type'] in ['exploitation', 'exploitation_success'] or 
-                    target_node['type'] in ['exploitation', 'exploitation_success']):
-                    thickness = 4  # Толще для атакующих связей
-                
-                dpg.draw_line(
-                    source_pos,
-                    target_pos,
-                    color=edge['color'],
-                    thickness=thickness * self.graph_scale,
-                    parent="graph_canvas"
-                )
+        # Рисуем информацию о выбранном узле
+        self.update_node_info()
     
-    def draw_nodes(self):
-        """Рисуем узлы графа"""
-        for node_id, node in self.nodes.items():
-            position = self.apply_transform(node['position'])
-            size = node['size'] * self.graph_scale
-            color = node['color']
-            
-            # Рисуем круг узла
-            dpg.draw_circle(
-                position,
-                size,
-                fill=color,
-                color=[255, 255, 255, 150],
-                thickness=2,
-                parent="graph_canvas"
-            )
-            
-            # Для узлов успешной эксплуатации добавляем эффект "пульсации"
-            if node['type'] == 'exploitation_success':
-                dpg.draw_circle(
-                    position,
-                    size + 5 * self.graph_scale,
-                    color=[255, 20, 147, 100],
-                    thickness=2,
-                    parent="graph_canvas"
-                )
-            
-            # Рисуем текст метки (упрощенный)
-            if self.graph_scale > 0.5:  # Показываем текст только при достаточном масштабе
-                label = self.get_node_label(node)
-                dpg.draw_text(
-                    [position[0] - len(label) * 3, position[1] + size + 5],
-                    label,
-                    color=self.colors['text'],
-                    size=12 * self.graph_scale,
-                    parent="graph_canvas"
-                )
-            
-            # Выделение выбранного узла
-            if node_id == self.selected_node:
-                dpg.draw_circle(
-                    position,
-                    size + 3,
-                    color=[255, 255, 0, 200],
-                    thickness=3,
-                    parent="graph_canvas"
-                )
+    def refresh_view(self):
+        """Обновление сцены после панорамирования или масштабирования"""
+        self.renderer.update()
     
     def get_node_label(self, node: Dict) -> str:
         """Получить метку для узла"""
@@ -437,7 +443,7 @@ class GraphView:
     def on_scale_change(self):
         """Обработчик изменения масштаба"""
         self.graph_scale = dpg.get_value("graph_scale_slider")
-        self.render_graph()
+        self.refresh_view()
     
     def on_canvas_click(self):
         """Обработчик клика по canvas"""
@@ -446,7 +452,10 @@ class GraphView:
             self.graph_scale = 1.0
             self.graph_offset = [0, 0]
             dpg.set_value("graph_scale_slider", 1.0)
-            self.render_graph()
+            self.refresh_view()
+        elif dpg.is_mouse_button_clicked(dpg.mvMouseButton_Left) and dpg.is_item_hovered("graph_canvas"):
+            # Выбор узла под курсором
+            self.select_node(self.node_at(dpg.get_drawing_mouse_pos()))
     
     def on_canvas_drag(self):
         """Обработчик перетаскивания canvas"""
@@ -455,7 +464,41 @@ class GraphView:
             self.graph_offset[0] += drag_delta[0] / self.graph_scale
             self.graph_offset[1] += drag_delta[1] / self.graph_scale
             dpg.reset_mouse_drag_delta()
-            self.render_graph()
+            self.refresh_view()
+        elif dpg.is_mouse_button_dragging(dpg.mvMouseButton_Right, 0):
+            # Рамка выделения
+            position = dpg.get_drawing_mouse_pos()
+            if self.band_start is None:
+                if not dpg.is_item_hovered("graph_canvas"):
+                    return
+                self.band_start = position
+            x1, y1 = self.screen_to_world(self.band_start)
+            x2, y2 = self.screen_to_world(position)
+            self.selection_band = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+            self.refresh_view()
+    
+    def on_canvas_release(self):
+        """Завершение выделения рамкой"""
+        if self.band_start is None:
+            return
+        self.selected_nodes = set(self.nodes_in_rect(self.band_start, dpg.get_drawing_mouse_pos()))
+        self.band_start = None
+        self.selection_band = None
+        dpg.set_value("node_info", f"Выделено узлов: {len(self.selected_nodes)}")
+        self.refresh_view()
+    
+    def on_canvas_hover(self):
+        """Подсказка для узла под курсором"""
+        node_id = self.node_at(dpg.get_drawing_mouse_pos()) if dpg.is_item_hovered("graph_canvas") else None
+        if node_id == self.hovered_node:
+            return
+        self.hovered_node = node_id
+        if node_id is None:
+            dpg.configure_item("graph_tooltip", show=False)
+            return
+        node = self.nodes[node_id]
+        dpg.set_value("graph_tooltip_text", f"{self.get_node_label(node)}\nТип: {node['type']}")
+        dpg.configure_item("graph_tooltip", show=True)
     
     def on_canvas_scroll(self):
         """Обработчик прокрутки колесика мыши"""
@@ -465,7 +508,7 @@ class GraphView:
         
         self.graph_scale = new_scale
         dpg.set_value("graph_scale_slider", new_scale)
-        self.render_graph()
+        self.refresh_view()
     
     def update_node_info(self):
         """Обновить информацию о выбранном узле"""
@@ -520,15 +563,19 @@ class GraphView:
     
     def clear_graph_display(self):
         """Очистить отображение графа"""
-        dpg.delete_item("graph_canvas", children_only=True)
+        self.renderer.reset()
     
     def clear_graph(self):
         """Полностью очистить граф"""
         self.nodes.clear()
         self.edges.clear()
         self.node_positions.clear()
+        self.layout.clear()
         self.next_node_id = 1
         self.selected_node = None
+        self.selected_nodes.clear()
+        self.hovered_node = None
+        self.spatial_index.clear()
         self.graph_scale = 1.0
         self.graph_offset = [0, 0]
         dpg.set_value("graph_scale_slider", 1.0)
@@ -543,7 +590,10 @@ class GraphView:
         
         graph_data = {
             'export_time': datetime.now().isoformat(),
-            'nodes': list(self.nodes.values()),
+            'nodes': [
+                {**node, 'position': self.get_node_position(node_id)}
+                for node_id, node in self.nodes.items()
+            ],
             'edges': self.edges,
             'metadata': {
                 'total_nodes': len(self.nodes),
@@ -600,5 +650,8 @@ if __name__ == "__main__":
     dpg.create_viewport(width=800, height=600, title="Graph View Test")
     dpg.setup_dearpygui()
     dpg.show_viewport()
-    dpg.start_dearpygui()
+    while dpg.is_dearpygui_running():
+        graph.poll_layout()
+        dpg.render_dearpygui_frame()
+    graph.stop_layout()
     dpg.destroy_context()
@@ -2,27 +2,86 @@
 Таблица хостов с реальной функциональностью
 """
 import dearpygui.dearpygui as dpg
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 import logging
+import bisect
+import socket
 from datetime import datetime
 import csv
 import json
+from gui.search_index import SearchIndex
 
 class HostsTable:
     """
     Расширенная таблица хостов с реальной функциональностью
+    
+    Таблица виртуализирована: виджеты создаются один раз для VISIBLE_ROWS
+    строк, а прокрутка лишь переназначает, какие хосты в них показаны.
+    Для хостов хранится готовая модель строки и упорядоченный индекс по
+    колонке сортировки, поэтому изменение одного хоста - это вставка в
+    индекс и перерисовка только изменившихся видимых строк.
     """
     
-    def __init__(self, engine=None):
+    # Число строк, для которых создаются виджеты
+    VISIBLE_ROWS = 16
+    # Строк за одно деление колеса мыши
+    WHEEL_STEP = 3
+    
+    # (заголовок, идентификатор, ширина)
+    COLUMNS = [
+        ("Select", "select", 60),
+        ("IP Address", "ip", 120),
+        ("Hostname", "hostname", 150),
+        ("Ports", "ports", 80),
+        ("Services", "services", 100),
+        ("OS", "os", 120),
+        ("Status", "status", 100),
+        ("Vulnerabilities", "vulnerabilities", 120),
+        ("Last Seen", "last_seen", 120),
+        ("Tags", "tags", 150),
+        ("Actions", "actions", 120)
+    ]
+    
+    # Колонки с текстом, значение и цвет которых берутся из модели строки
+    CELL_COLUMNS = ("hostname", "ports", "services", "os", "status", "vulnerabilities", "last_seen", "tags")
+    UNSORTABLE_COLUMNS = frozenset({"select", "actions"})
+    
+    STATUS_COLORS = {
+        'active': [72, 199, 116],
+        'inactive': [255, 92, 87],
+        'unknown': [255, 179, 64]
+    }
+    MUTED_COLOR = [150, 150, 160]
+    
+    def __init__(self, engine=None, search_index: Optional[SearchIndex] = None):
         self.logger = logging.getLogger('RapidRecon.HostsTable')
         self.engine = engine
+        # Поисковый индекс может быть общим с деревом сети
+        self.search_index = search_index if search_index is not None else SearchIndex()
         self.hosts_data = {}
-        self.filtered_hosts = {}
         self.selected_hosts = set()
-        self.current_sort_column = None
+        self.current_sort_column = "ip"
         self.sort_ascending = True
         self.on_host_select_callback = None
         
+        # Модель строк: ip -> готовые (текст, цвет) ячеек
+        self._rows: Dict[str, Tuple] = {}
+        # Ключи сортировки и упорядоченный индекс всех хостов по текущей колонке
+        self._sort_keys: Dict[str, Tuple] = {}
+        self._sort_index: List[Tuple[Tuple, str]] = []
+        # Отфильтрованное подмножество индекса (в том же порядке)
+        self._view: List[Tuple[Tuple, str]] = []
+        self._filters = ("", "All", "All")
+        
+        # Окно прокрутки и то, что сейчас показано в каждой строке-виджете
+        self.scroll_offset = 0
+        self._slot_state: List[Optional[Tuple]] = [None] * self.VISIBLE_ROWS
+    
+    @property
+    def filtered_hosts(self) -> Dict[str, Dict]:
+        """Хосты, прошедшие фильтры, в порядке сортировки"""
+        return {ip: self.hosts_data[ip] for ip in self._iter_view()}
+    
     def create_table_panel(self, parent: str) -> str:
         """Создание панели таблицы хостов"""
         with dpg.child_window(parent=parent, border=False) as table_panel:
@@ -31,7 +90,7 @@ class HostsTable:
                 dpg.add_text("Discovered Hosts")
                 dpg.add_text("(0)", tag="table_stats", color=[150, 150, 160])
                 dpg.add_button(
-                    label="Refresh", 
+                    label="Refresh",
                     callback=self._refresh_table
                 )
             
@@ -39,7 +98,7 @@ class HostsTable:
             with dpg.group(horizontal=True):
                 dpg.add_input_text(
                     tag="hosts_search",
-                    hint="Search hosts...",
+                    hint="Search IP, hostname, service, CVE, tag...",
                     width=200,
                     callback=self._on_search
                 )
@@ -51,7 +110,7 @@ class HostsTable:
                     callback=self._apply_filters
                 )
                 dpg.add_combo(
-                    tag="vuln_filter", 
+                    tag="vuln_filter",
                     items=["All", "Has Vulns", "No Vulns"],
                     default_value="All",
                     width=100,
@@ -62,7 +121,7 @@ class HostsTable:
                     callback=self._scan_selected_hosts
                 )
                 dpg.add_button(
-                    label="Add to Scope", 
+                    label="Add to Scope",
                     callback=self._add_selected_to_scope
                 )
                 dpg.add_button(
@@ -70,23 +129,36 @@ class HostsTable:
                     callback=self._export_selected_hosts
                 )
             
-            # Таблица хостов
+            # Таблица хостов и полоса прокрутки окна строк
             with dpg.child_window(height=450, border=True):
-                self._create_hosts_table()
+                with dpg.group(horizontal=True):
+                    self._create_hosts_table()
+                    dpg.add_slider_int(
+                        tag="hosts_scroll",
+                        vertical=True,
+                        height=400,
+                        width=20,
+                        min_value=0,
+                        max_value=0,
+                        format="",
+                        callback=self._on_scroll
+                    )
             
             # Статус бар
             with dpg.group(horizontal=True):
                 dpg.add_text("Ready", tag="table_status")
                 dpg.add_text("Selected: 0", tag="selected_count", color=[123, 97, 255])
         
+        self._create_wheel_handler()
+        self._render_window()
         return table_panel
     
     def _create_hosts_table(self):
-        """Создание таблицы хостов"""
+        """Создание таблицы хостов с фиксированным набором строк"""
         # Создаем таблицу только если она не существует
         if dpg.does_item_exist("hosts_table"):
             return
-            
+        
         with dpg.table(
             tag="hosts_table",
             header_row=True,
@@ -99,141 +171,339 @@ class HostsTable:
             reorderable=True,
             hideable=True,
             sortable=True,
+            callback=self._on_sort,
+            width=-30,
             height=400
         ):
             # Колонки таблицы
-            columns = [
-                ("Select", "select", 60),
-                ("IP Address", "ip", 120),
-                ("Hostname", "hostname", 150),
-                ("Ports", "ports", 80),
-                ("Services", "services", 100),
-                ("OS", "os", 120),
-                ("Status", "status", 100),
-                ("Vulnerabilities", "vulnerabilities", 120),
-                ("Last Seen", "last_seen", 120),
-                ("Tags", "tags", 150),
-                ("Actions", "actions", 120)
-            ]
-            
-            for col_name, col_id, width in columns:
+            for col_name, col_id, width in self.COLUMNS:
                 dpg.add_table_column(
                     label=col_name,
                     tag=f"col_{col_id}",
                     width_fixed=True,
-                    width=width
+                    width=width,
+                    no_sort=col_id in self.UNSORTABLE_COLUMNS,
+                    default_sort=col_id == self.current_sort_column
                 )
+            
+            # Строки-виджеты создаются один раз; слот передается через user_data
+            for slot in range(self.VISIBLE_ROWS):
+                with dpg.table_row(tag=f"hosts_row_{slot}", show=False):
+                    dpg.add_checkbox(
+                        tag=f"hosts_row_{slot}_select",
+                        user_data=slot,
+                        callback=self._on_slot_select
+                    )
+                    dpg.add_selectable(
+                        tag=f"hosts_row_{slot}_ip",
+                        label="",
+                        user_data=slot,
+                        callback=self._on_slot_click
+                    )
+                    for col_id in self.CELL_COLUMNS:
+                        dpg.add_text("", tag=f"hosts_row_{slot}_{col_id}")
+                    with dpg.group(horizontal=True):
+                        dpg.add_button(
+                            label="View",
+                            width=50,
+                            user_data=slot,
+                            callback=self._on_slot_view
+                        )
+                        dpg.add_button(
+                            label="Scope",
+                            width=50,
+                            user_data=slot,
+                            callback=self._on_slot_scope
+                        )
+        
+        self._slot_state = [None] * self.VISIBLE_ROWS
+    
+    def _create_wheel_handler(self):
+        """Прокрутка окна строк колесом мыши над таблицей"""
+        if dpg.does_item_exist("hosts_table_handlers"):
+            return
+        with dpg.handler_registry(tag="hosts_table_handlers"):
+            dpg.add_mouse_wheel_handler(callback=self._on_mouse_wheel)
     
     def update_table(self, hosts: Dict):
-        """Обновление таблицы хостов реальными данными"""
+        """Полная перестройка индекса таблицы по словарю хостов"""
         try:
             self.hosts_data = hosts
-            self.filtered_hosts = hosts.copy()
-            
-            # Обновляем статистику
-            total_hosts = len(hosts)
-            dpg.set_value("table_stats", f"({total_hosts})")
-            
-            # Очищаем таблицу (только строки)
-            if dpg.does_item_exist("hosts_table"):
-                # Получаем все дочерние элементы таблицы (строки)
-                children = dpg.get_item_children("hosts_table", 1)
-                for child in children:
-                    if child != "hosts_table":
-                        dpg.delete_item(child)
-            
-            # Заполняем таблицу данными
-            self._populate_table()
-            
-            # Обновляем статус
-            dpg.set_value("table_status", f"Showing {len(self.filtered_hosts)} of {total_hosts} hosts")
-            
+            self._rows = {}
+            self._sort_keys = {}
+            self.search_index.clear('host')
+            for ip, host in hosts.items():
+                self._rows[ip] = self._build_row(ip, host)
+                self._sort_keys[ip] = self._sort_key(ip, host)
+                self.search_index.index_host(ip, host)
+            self._sort_index = sorted((key, ip) for ip, key in self._sort_keys.items())
+            self._rebuild_view()
+            self._render_window()
+        
         except Exception as e:
             self.logger.error(f"Error updating table: {e}")
             dpg.set_value("table_status", f"Error: {e}")
     
-    def _populate_table(self):
-        """Заполнение таблицы реальными данными"""
+    def update_hosts(self, ips, hosts: Optional[Dict] = None):
+        """
+        Обновление таблицы по изменившимся хостам
+        
+        Args:
+            ips: Адреса добавленных, измененных или удаленных хостов
+            hosts: Словарь хостов; если это другой объект, чем текущий,
+                индекс перестраивается целиком
+        """
+        if hosts is not None and hosts is not self.hosts_data:
+            self.update_table(hosts)
+            return
+        
+        try:
+            for ip in ips:
+                self._reindex_host(ip)
+            self._render_window()
+        
+        except Exception as e:
+            self.logger.error(f"Error updating hosts: {e}")
+    
+    def _reindex_host(self, ip: str):
+        """Перемещение одного хоста в индексе сортировки и в отфильтрованном виде"""
+        old_key = self._sort_keys.pop(ip, None)
+        if old_key is not None:
+            entry = (old_key, ip)
+            self._remove_entry(self._sort_index, entry)
+            self._remove_entry(self._view, entry)
+            del self._rows[ip]
+        
+        host = self.hosts_data.get(ip)
+        if host is None:
+            self.selected_hosts.discard(ip)
+            self.search_index.remove('host', ip)
+            return
+        
+        self._rows[ip] = self._build_row(ip, host)
+        self.search_index.index_host(ip, host)
+        key = self._sort_keys[ip] = self._sort_key(ip, host)
+        entry = (key, ip)
+        bisect.insort(self._sort_index, entry)
+        if self._matches(ip):
+            bisect.insort(self._view, entry)
+    
+    @staticmethod
+    def _remove_entry(index: List[Tuple[Tuple, str]], entry: Tuple[Tuple, str]):
+        """Удаление элемента из упорядоченного списка"""
+        position = bisect.bisect_left(index, entry)
+        if position < len(index) and index[position] == entry:
+            del index[position]
+    
+    def _build_row(self, ip: str, host: Dict) -> Tuple:
+        """Модель строки: готовые тексты и цвета ячеек"""
+        hostname = host.get('hostname', 'Unknown') or 'Unknown'
+        ports = host.get('ports', [])
+        services = host.get('services', [])
+        vulns = host.get('vulnerabilities', [])
+        status = host.get('status', 'unknown')
+        tags = host.get('tags', [])
+        
+        cells = (
+            (hostname, None),
+            (str(len(ports)), [123, 97, 255] if ports else self.MUTED_COLOR),
+            (str(len(services)), [86, 156, 214] if services else self.MUTED_COLOR),
+            (host.get('os', 'Unknown'), None),
+            (status, self._get_status_color(status)),
+            (str(len(vulns)), [255, 100, 100] if vulns else self.MUTED_COLOR),
+            (str(host.get('last_seen', 'Unknown')), None),
+            (", ".join(tags[:2]) if tags else "None", None)
+        )
+        return cells
+    
+    def _sort_key(self, ip: str, host: Dict) -> Tuple:
+        """Ключ сортировки хоста по текущей колонке"""
+        column = self.current_sort_column
+        if column in ("ports", "services", "vulnerabilities"):
+            return (len(host.get(column, [])),)
+        if column == "tags":
+            return (", ".join(host.get('tags', [])).lower(),)
+        if column in ("hostname", "os", "status", "last_seen"):
+            return (str(host.get(column, '')).lower(),)
+        return self._ip_sort_key(ip)
+    
+    @staticmethod
+    def _ip_sort_key(ip: str) -> Tuple:
+        """IP-адреса сортируются численно, остальные имена - после них по алфавиту"""
+        # inet_pton дает адрес в сетевом порядке байт: сравнение байтовых
+        # строк одной длины совпадает с численным
+        for version, family in ((4, socket.AF_INET), (6, socket.AF_INET6)):
+            try:
+                return (0, version, socket.inet_pton(family, ip))
+            except (OSError, ValueError):
+                continue
+        return (1, 0, ip.lower())
+    
+    def _query(self) -> Tuple[str, List[str], List[str]]:
+        """Текущие фильтры как запрос к поисковому индексу"""
+        search, status_filter, vuln_filter = self._filters
+        require, exclude = [], []
+        if status_filter != "All":
+            require.append(f"status:{status_filter.lower()}")
+        if vuln_filter == "Has Vulns":
+            require.append("has_vulns")
+        elif vuln_filter == "No Vulns":
+            exclude.append("has_vulns")
+        return search, require, exclude
+    
+    def _matches(self, ip: str) -> bool:
+        """Проверка хоста по текущим фильтрам"""
+        return self.search_index.matches('host', ip, *self._query())
+    
+    def _rebuild_view(self):
+        """Пересчет отфильтрованного вида по индексу сортировки"""
+        if self._filters == ("", "All", "All"):
+            self._view = list(self._sort_index)
+            return
+        
+        found = self.search_index.search('host', *self._query())
+        if len(found) * 8 < len(self._sort_index):
+            # Мало совпадений - сортируем их, а не обходим весь индекс
+            sort_keys = self._sort_keys
+            self._view = sorted((sort_keys[ip], ip) for ip in found if ip in sort_keys)
+        else:
+            self._view = [entry for entry in self._sort_index if entry[1] in found]
+    
+    def _iter_view(self):
+        """Адреса отфильтрованных хостов с учетом направления сортировки"""
+        entries = self._view if self.sort_ascending else reversed(self._view)
+        for _, ip in entries:
+            yield ip
+    
+    def _view_ip(self, position: int) -> str:
+        """Адрес хоста на позиции position отфильтрованного вида"""
+        if self.sort_ascending:
+            return self._view[position][1]
+        return self._view[len(self._view) - 1 - position][1]
+    
+    def _max_offset(self) -> int:
+        return max(0, len(self._view) - self.VISIBLE_ROWS)
+    
+    def _render_window(self):
+        """Отрисовка видимого окна строк; изменяются только слоты с новым содержимым"""
         if not dpg.does_item_exist("hosts_table"):
-            self.logger.warning("Hosts table not found, creating...")
-            self._create_hosts_table()
             return
+        
+        max_offset = self._max_offset()
+        self.scroll_offset = min(max(0, self.scroll_offset), max_offset)
+        
+        for slot in range(self.VISIBLE_ROWS):
+            position = self.scroll_offset + slot
+            if position < len(self._view):
+                ip = self._view_ip(position)
+                state = (ip, self._rows[ip], ip in self.selected_hosts)
+            else:
+                state = None
             
-        for ip, host in self.filtered_hosts.items():
-            with dpg.table_row(parent="hosts_table", tag=f"row_{ip}"):
-                # Checkbox для выбора
-                dpg.add_checkbox(
-                    tag=f"select_{ip}",
-                    callback=lambda s, d, ip=ip: self._on_host_select(ip, d)
-                )
-                
-                # IP Address (кликабельный)
-                dpg.add_selectable(
-                    label=ip,
-                    callback=lambda s, d, ip=ip: self._on_host_click(ip)
-                )
-                
-                # Hostname
-                hostname = host.get('hostname', 'Unknown')
-                dpg.add_text(hostname if hostname else 'Unknown')
-                
-                # Ports
-                ports = host.get('ports', [])
-                ports_text = f"{len(ports)}" if ports else "0"
-                port_color = [123, 97, 255] if ports else [150, 150, 160]
-                dpg.add_text(ports_text, color=port_color)
-                
-                # Services
-                services = host.get('services', [])
-                services_text = f"{len(services)}" if services else "0"
-                service_color = [86, 156, 214] if services else [150, 150, 160]
-                dpg.add_text(services_text, color=service_color)
-                
-                # OS
-                os_text = host.get('os', 'Unknown')
-                dpg.add_text(os_text)
-                
-                # Status
-                status = host.get('status', 'unknown')
-                status_color = self._get_status_color(status)
-                dpg.add_text(status, color=status_color)
-                
-                # Vulnerabilities
-                vulns = host.get('vulnerabilities', [])
-                vulns_text = f"{len(vulns)}" if vulns else "0"
-                vulns_color = [255, 100, 100] if vulns else [150, 150, 160]
-                dpg.add_text(vulns_text, color=vulns_color)
-                
-                # Last Seen
-                last_seen = host.get('last_seen', 'Unknown')
-                dpg.add_text(str(last_seen))
-                
-                # Tags
-                tags = host.get('tags', [])
-                tags_text = ", ".join(tags[:2]) if tags else "None"
-                dpg.add_text(tags_text)
-                
-                # Actions
-                with dpg.group(horizontal=True):
-                    dpg.add_button(
-                        label="View",
-                        width=50,
-                        callback=lambda s, d, ip=ip: self._show_host_details(ip)
-                    )
-                    dpg.add_button(
-                        label="Scope",
-                        width=50,
-                        callback=lambda s, d, ip=ip: self._add_host_to_scope(ip)
-                    )
+            if state == self._slot_state[slot]:
+                continue
+            self._slot_state[slot] = state
+            self._render_slot(slot, state)
+        
+        if dpg.does_item_exist("hosts_scroll"):
+            dpg.configure_item("hosts_scroll", max_value=max_offset)
+            dpg.set_value("hosts_scroll", max_offset - self.scroll_offset)
+        
+        total = len(self.hosts_data)
+        shown = len(self._view)
+        dpg.set_value("table_stats", f"({total})")
+        if shown:
+            first = self.scroll_offset + 1
+            last = min(shown, self.scroll_offset + self.VISIBLE_ROWS)
+            dpg.set_value("table_status", f"Showing {shown} of {total} hosts (rows {first}-{last})")
+        else:
+            dpg.set_value("table_status", f"Showing 0 of {total} hosts")
+    
+    def _render_slot(self, slot: int, state: Optional[Tuple]):
+        """Заполнение одной строки-виджета"""
+        row_tag = f"hosts_row_{slot}"
+        if state is None:
+            dpg.configure_item(row_tag, show=False)
+            return
+        
+        ip, cells, selected = state
+        dpg.set_value(f"{row_tag}_select", selected)
+        dpg.configure_item(f"{row_tag}_ip", label=ip)
+        for col_id, (text, color) in zip(self.CELL_COLUMNS, cells):
+            dpg.set_value(f"{row_tag}_{col_id}", text)
+            if color is not None:
+                dpg.configure_item(f"{row_tag}_{col_id}", color=color)
+        dpg.configure_item(row_tag, show=True)
+    
+    def _slot_ip(self, slot: int) -> Optional[str]:
+        """Адрес хоста, показанного в слоте"""
+        state = self._slot_state[slot] if 0 <= slot < len(self._slot_state) else None
+        return state[0] if state else None
+    
+    def _on_slot_select(self, sender, app_data, user_data):
+        ip = self._slot_ip(user_data)
+        if ip:
+            self._on_host_select(ip, app_data)
+            self._slot_state[user_data] = (ip, self._rows[ip], ip in self.selected_hosts)
+    
+    def _on_slot_click(self, sender, app_data, user_data):
+        ip = self._slot_ip(user_data)
+        if ip:
+            self._on_host_click(ip)
+    
+    def _on_slot_view(self, sender, app_data, user_data):
+        ip = self._slot_ip(user_data)
+        if ip:
+            self._show_host_details(ip)
+    
+    def _on_slot_scope(self, sender, app_data, user_data):
+        ip = self._slot_ip(user_data)
+        if ip:
+            self._add_host_to_scope(ip)
+    
+    def _on_scroll(self, sender, app_data):
+        """Полоса прокрутки: верх слайдера - начало списка"""
+        self.scroll_offset = self._max_offset() - int(app_data)
+        self._render_window()
+    
+    def _on_mouse_wheel(self, sender, app_data):
+        if dpg.does_item_exist("hosts_table") and dpg.is_item_hovered("hosts_table"):
+            self.scroll_to(self.scroll_offset - int(app_data) * self.WHEEL_STEP)
+    
+    def scroll_to(self, offset: int):
+        """Прокрутка окна строк к позиции offset"""
+        self.scroll_offset = offset
+        self._render_window()
+    
+    def _on_sort(self, sender, sort_specs):
+        """Сортировка по клику на заголовок колонки"""
+        if not sort_specs:
+            return
+        column, direction = sort_specs[0]
+        alias = dpg.get_item_alias(column) if isinstance(column, int) else column
+        self.sort_by(str(alias or "").replace("col_", "", 1), direction >= 0)
+    
+    def sort_by(self, column: str, ascending: bool = True):
+        """
+        Сортировка таблицы по колонке
+        
+        Смена только направления не пересортировывает индекс: вид читается
+        с другого конца.
+        """
+        if column in self.UNSORTABLE_COLUMNS or column not in {col_id for _, col_id, _ in self.COLUMNS}:
+            return
+        
+        if column != self.current_sort_column:
+            self.current_sort_column = column
+            self._sort_keys = {ip: self._sort_key(ip, host) for ip, host in self.hosts_data.items()}
+            self._sort_index = sorted((key, ip) for ip, key in self._sort_keys.items())
+            self._rebuild_view()
+        self.sort_ascending = ascending
+        self._render_window()
     
     def _get_status_color(self, status: str) -> List[int]:
         """Получение цвета для статуса"""
-        colors = {
-            'active': [72, 199, 116],
-            'inactive': [255, 92, 87],
-            'unknown': [255, 179, 64]
-        }
-        return colors.get(status.lower(), [150, 150, 160])
+        return self.STATUS_COLORS.get(status.lower(), self.MUTED_COLOR)
     
     def _on_host_select(self, ip: str, selected: bool):
         """Обработчик выбора хоста"""
@@ -335,7 +605,7 @@ class HostsTable:
                 if 'in_scope' not in self.hosts_data[ip]['tags']:
                     self.hosts_data[ip]['tags'].append('in_scope')
             
-            self.update_table(self.hosts_data)
+            self.update_hosts([ip])
             dpg.set_value("table_status", f"Added {ip} to scope")
             
         except Exception as e:
@@ -399,6 +669,7 @@ class HostsTable:
             for ip in self.selected_hosts:
                 if self._add_host_to_scope_silent(ip):
                     count += 1
+            self.update_hosts(list(self.selected_hosts))
             
             self.logger.info(f"Added {count} hosts to scope")
             dpg.set_value("table_status", f"Added {count} hosts to scope")
@@ -475,45 +746,25 @@ class HostsTable:
         self._apply_filters()
     
     def _apply_filters(self):
-        """Применение фильтров"""
-        search_text = dpg.get_value("hosts_search", "").lower()
-        status_filter = dpg.get_value("status_filter", "All")
-        vuln_filter = dpg.get_value("vuln_filter", "All")
-        
-        self.filtered_hosts = {}
-        
-        for ip, host in self.hosts_data.items():
-            # Поиск по IP и hostname
-            matches_search = (
-                not search_text or
-                search_text in ip.lower() or
-                search_text in host.get('hostname', '').lower()
-            )
-            
-            # Фильтр по статусу
-            matches_status = (
-                status_filter == "All" or
-                host.get('status', 'unknown').lower() == status_filter.lower()
-            )
-            
-            # Фильтр по уязвимостям
-            has_vulns = len(host.get('vulnerabilities', [])) > 0
-            matches_vuln = (
-                vuln_filter == "All" or
-                (vuln_filter == "Has Vulns" and has_vulns) or
-                (vuln_filter == "No Vulns" and not has_vulns)
-            )
-            
-            if matches_search and matches_status and matches_vuln:
-                self.filtered_hosts[ip] = host
+        """Применение фильтров к индексу (виджеты строк не пересоздаются)"""
+        filters = (
+            (dpg.get_value("hosts_search") or "").lower(),
+            dpg.get_value("status_filter") or "All",
+            dpg.get_value("vuln_filter") or "All"
+        )
+        if filters == self._filters:
+            return
         
-        # Обновляем таблицу
-        self._populate_table()
-        dpg.set_value("table_status", f"Showing {len(self.filtered_hosts)} of {len(self.hosts_data)} hosts")
+        self._filters = filters
+        self._rebuild_view()
+        self.scroll_offset = 0
+        self._render_window()
     
     def _refresh_table(self):
-        """Обновление таблицы"""
-        self.update_table(self.hosts_data)
+        """Обновление таблицы: видимые хосты перечитываются и строки перерисовываются"""
+        visible = [ip for ip in map(self._slot_ip, range(self.VISIBLE_ROWS)) if ip]
+        self._slot_state = [None] * self.VISIBLE_ROWS
+        self.update_hosts(visible)
         dpg.set_value("table_status", "Table refreshed")
     
     def _save_to_scope_file(self, ip: str):
@@ -532,17 +783,13 @@ class HostsTable:
     
     def select_all_hosts(self, select: bool = True):
         """Выбрать/снять выделение со всех хостов"""
-        for ip in self.filtered_hosts:
+        for ip in self._iter_view():
             if select:
                 self.selected_hosts.add(ip)
             else:
                 self.selected_hosts.discard(ip)
-            
-            try:
-                dpg.set_value(f"select_{ip}", select)
-            except Exception:
-                pass  # Элемент может не существовать
         
+        self._render_window()
         dpg.set_value("selected_count", f"Selected: {len(self.selected_hosts)}")
     
     def set_host_select_callback(self, callback: Callable):
@@ -556,13 +803,14 @@ class HostsTable:
     def clear(self):
         """Очистка таблицы"""
         self.hosts_data.clear()
-        self.filtered_hosts.clear()
         self.selected_hosts.clear()
-        if dpg.does_item_exist("hosts_table"):
-            children = dpg.get_item_children("hosts_table", 1)
-            for child in children:
-                if child != "hosts_table":
-                    dpg.delete_item(child)
+        self._rows.clear()
+        self._sort_keys.clear()
+        self.search_index.clear('host')
+        self._sort_index = []
+        self._view = []
+        self.scroll_offset = 0
+        self._render_window()
         dpg.set_value("table_status", "Table cleared")
         dpg.set_value("selected_count", "Selected: 0")
         dpg.set_value("table_stats", "(0)")
@@ -578,11 +826,11 @@ class HostsTable:
     def add_host(self, ip: str, host_data: Dict):
         """Добавить хост в таблицу"""
         self.hosts_data[ip] = host_data
-        self.update_table(self.hosts_data)
+        self.update_hosts([ip])
     
     def remove_host(self, ip: str):
         """Удалить хост из таблицы"""
         if ip in self.hosts_data:
             del self.hosts_data[ip]
             self.selected_hosts.discard(ip)
-            self.update_table(self.hosts_data)
+            self.update_hosts([ip])
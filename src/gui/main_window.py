@@ -2,7 +2,7 @@
 Главное окно RapidRecon - модульная архитектура
 """
 import dearpygui.dearpygui as dpg
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import traceback
 import sys
@@ -18,6 +18,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from gui.network_tree import NetworkTree
 from gui.hosts_table import HostsTable
+from gui.search_index import SearchIndex
 from gui.scope_manager import ScopeManager
 from gui.controls_panel import ControlsPanel
 
@@ -70,9 +71,10 @@ class MainWindow:
         self.module_manager = module_manager
         self.logger = logging.getLogger('RapidRecon.GUI')
         
-        # Модули интерфейса
-        self.network_tree = NetworkTree()
-        self.hosts_table = HostsTable(engine)
+        # Модули интерфейса (поисковый индекс общий для дерева и таблицы)
+        self.search_index = SearchIndex()
+        self.network_tree = NetworkTree(self.search_index)
+        self.hosts_table = HostsTable(engine, self.search_index)
         self.scope_manager = ScopeManager()
         self.controls_panel = ControlsPanel(engine)
         
@@ -85,10 +87,17 @@ class MainWindow:
         # Данные
         self.hosts_data = {}
         self.nodes_data = {}
+        # Номер последнего примененного изменения движка (engine.changes_since)
+        self.engine_change_seq = 0
+        # Счетчики портов и сервисов по hosts_data, обновляются вместе с хостами
+        self.host_totals = {'ports': 0, 'services': 0}
+        # Хосты, измененные с последней передачи в таблицу хостов
+        self.dirty_hosts = set()
         
         # Статистика
         self.last_stats_update = 0
         self.stats_update_interval = 1.0  # секунды
+        self.last_engine_update = 0  # Время последней пачки событий движка
         
         # Поток для мониторинга движка
         self.monitor_thread = None
@@ -157,8 +166,7 @@ class MainWindow:
                 # Проверяем состояние каждую секунду
                 time.sleep(1.0)
                 
-                # Обновляем данные из движка
-                self.update_engine_data()
+                # Данные узлов обновляет поток GUI по событиям движка (process_engine_events)
                 
                 # Обновляем статистику
                 current_time = time.time()
@@ -357,7 +365,7 @@ class MainWindow:
             
             # Table
             self.hosts_table.create_table_panel("content_area")
-            self.hosts_table.update_table(self.hosts_data)
+            self.hosts_table.update_hosts([], self.hosts_data)
     
     def create_scope_manager_tab(self):
         """Создание вкладки Scope Manager"""
@@ -405,8 +413,8 @@ class MainWindow:
                     self.update_activity_log(f"🎯 Target {target} added to engine queue")
                     
                     # Проверяем состояние очереди
-                    if hasattr(self.engine, 'pending_scans'):
-                        queue_size = self.engine.pending_scans.qsize()
+                    if hasattr(self.engine, 'get_pending_count'):
+                        queue_size = self.engine.get_pending_count()
                         self.update_activity_log(f"📋 Scan queue size: {queue_size}")
                         self.logger.info(f"Queue size after adding target: {queue_size}")
                     
@@ -456,8 +464,8 @@ class MainWindow:
                     # Проверяем состояние после запуска
                     if hasattr(self.engine, 'is_running'):
                         self.logger.info(f"Engine running state after start: {self.engine.is_running}")
-                    if hasattr(self.engine, 'pending_scans'):
-                        queue_size = self.engine.pending_scans.qsize()
+                    if hasattr(self.engine, 'get_pending_count'):
+                        queue_size = self.engine.get_pending_count()
                         self.logger.info(f"Queue size after engine start: {queue_size}")
                         
                 else:
@@ -498,8 +506,8 @@ class MainWindow:
         self.logger.info(f"Available engine methods: {engine_methods}")
         
         # Проверяем состояние
-        if hasattr(self.engine, 'pending_scans'):
-            queue_size = self.engine.pending_scans.qsize()
+        if hasattr(self.engine, 'get_pending_count'):
+            queue_size = self.engine.get_pending_count()
             self.update_activity_log(f"📋 Current queue size: {queue_size}")
         
         if hasattr(self.engine, 'discovered_nodes'):
@@ -601,85 +609,174 @@ class MainWindow:
         """Экспорт дерева сети"""
         self.update_activity_log("Exporting network tree...")
     
+    # События, после которых нужно перечитать данные движка
+    DATA_EVENTS = frozenset({
+        'resync', 'node_discovered', 'node_added', 'node_updated',
+        'module_results', 'progress_update', 'scan_resumed'
+    })
+    
+    def process_engine_events(self):
+        """Разбор событий движка, накопленных с прошлого кадра"""
+        event_bus = getattr(self.engine, 'event_bus', None)
+        if event_bus is None:
+            return
+        
+        events = event_bus.drain()
+        if events:
+            self.handle_engine_events(events)
+    
     def handle_engine_event(self, event_type: str, data: Any = None):
-        """Обработка событий от движка"""
+        """Обработка одного события от движка"""
+        self.handle_engine_events([(event_type, data)])
+    
+    def handle_engine_events(self, events: List[Tuple[str, Any]]):
+        """
+        Обработка пачки событий от движка за один кадр
+        
+        События уже объединены шиной: для node_discovered, module_results и
+        т.п. данные - список, для progress_update - последнее значение.
+        Данные и представления обновляются один раз на пачку.
+        """
         try:
-            self.logger.info(f"GUI received event: {event_type}")
+            self.last_engine_update = time.time()
+            refresh = False
             
-            if event_type in ['node_discovered', 'node_added', 'module_results', 'progress_update']:
+            for event_type, data in events:
+                self.logger.debug(f"GUI received event: {event_type}")
+                if event_type in self.DATA_EVENTS:
+                    refresh = True
+                self._log_engine_event(event_type, data)
+            
+            if refresh:
                 # Обновляем данные из движка
-                self.update_engine_data()
+                changed_nodes = self.update_engine_data()
+                changed_hosts = self._take_dirty_hosts()
                 
-                # Обновляем UI
-                if self.current_tab == "network_tree":
-                    self.network_tree.update_tree(self.nodes_data, self.hosts_data)
-                elif self.current_tab == "hosts_table":
-                    self.hosts_table.update_table(self.hosts_data)
+                # Таблица и дерево обновляются по измененным узлам и хостам;
+                # их виджеты перерисовываются, только если вкладка открыта
+                self.hosts_table.update_hosts(changed_hosts, self.hosts_data)
+                self.network_tree.update_tree(self.nodes_data, self.hosts_data, changed_nodes, changed_hosts)
                 
                 # Обновляем статистику
                 self.update_statistics()
                 
-                # Логируем событие
-                if event_type == 'node_discovered':
-                    node_info = data.data if hasattr(data, 'data') else str(data)
-                    self.update_activity_log(f"New node discovered: {node_info}")
-                elif event_type == 'module_results':
-                    module_name = data.get('module', 'unknown') if isinstance(data, dict) else 'unknown'
-                    self.update_activity_log(f"Module completed: {module_name}")
-                elif event_type == 'progress_update':
-                    if isinstance(data, dict):
-                        pending = data.get('pending_tasks', 0)
-                        completed = data.get('completed_tasks', 0)
-                        self.update_activity_log(f"Progress: {completed} completed, {pending} pending")
-                
         except Exception as e:
             self.logger.error(f"Error handling engine event: {e}")
     
-    def update_engine_data(self):
-        """Обновление данных из движка"""
+    def _log_engine_event(self, event_type: str, data: Any):
+        """Запись события движка в лог активности"""
+        if event_type == 'node_discovered':
+            nodes = data if isinstance(data, list) else [data]
+            if len(nodes) == 1:
+                node_info = nodes[0].data if hasattr(nodes[0], 'data') else str(nodes[0])
+                self.update_activity_log(f"New node discovered: {node_info}")
+            else:
+                self.update_activity_log(f"New nodes discovered: {len(nodes)}")
+        elif event_type == 'module_results':
+            items = data if isinstance(data, list) else [data]
+            module_names = sorted({
+                item.get('results', {}).get('module', 'unknown') if isinstance(item, dict) else 'unknown'
+                for item in items
+            })
+            self.update_activity_log(f"Module completed: {', '.join(module_names)} ({len(items)})")
+        elif event_type == 'progress_update':
+            if isinstance(data, dict):
+                pending = data.get('pending_tasks', 0)
+                completed = data.get('completed_tasks', 0)
+                self.update_activity_log(f"Progress: {completed} completed, {pending} pending")
+        elif event_type == 'resync':
+            self.logger.debug("Буфер событий переполнен, полная синхронизация с движком")
+    
+    def update_engine_data(self) -> List[str]:
+        """
+        Применение изменений движка с прошлого обновления
+        
+        Узлы забираются из ленты изменений engine.changes_since(), поэтому
+        стоимость обновления пропорциональна числу изменившихся узлов.
+        
+        Returns:
+            Идентификаторы добавленных или измененных узлов
+        """
         try:
-            # Получаем данные напрямую из движка
-            if hasattr(self.engine, 'discovered_nodes'):
-                engine_nodes = self.engine.discovered_nodes
-                
-                # Конвертируем в словарь для network_tree
-                self.nodes_data = {}
-                for i, node in enumerate(engine_nodes):
-                    node_id = getattr(node, 'node_id', f"node_{i}")
-                    self.nodes_data[node_id] = {
-                        'id': node_id,
-                        'type': getattr(node, 'type', 'unknown'),
-                        'label': getattr(node, 'data', 'Unknown'),
-                        'data': getattr(node, 'data', {}),
-                        'timestamp': getattr(node, 'timestamp', time.time()),
-                        'ports': getattr(node, 'ports', []),
-                        'services': getattr(node, 'services', []),
-                        'vulnerabilities': getattr(node, 'vulnerabilities', [])
-                    }
-            
-            # Обновляем hosts_data из движка
-            if hasattr(self.engine, 'hosts_data'):
-                engine_hosts = self.engine.hosts_data
-                if isinstance(engine_hosts, dict):
-                    self.hosts_data = engine_hosts.copy()
-                else:
-                    # Если hosts_data это не словарь, создаем из discovered_nodes
-                    self.hosts_data = {}
-                    for node in getattr(self.engine, 'discovered_nodes', []):
-                        if hasattr(node, 'type') and getattr(node, 'type').name in ['ACTIVE_HOST', 'IP_ADDRESS']:
-                            ip = getattr(node, 'data', 'unknown')
-                            self.hosts_data[ip] = {
-                                'hostname': getattr(node, 'data', 'Unknown'),
-                                'status': 'active',
-                                'ports': getattr(node, 'ports', []),
-                                'services': getattr(node, 'services', []),
-                                'os': 'Unknown',
-                                'last_seen': datetime.now().strftime("%H:%M:%S"),
-                                'tags': ['discovered']
-                            }
+            if not hasattr(self.engine, 'changes_since'):
+                return []
+            
+            self.engine_change_seq, changed_nodes = self.engine.changes_since(self.engine_change_seq)
+            for node in changed_nodes:
+                self._apply_engine_node(node)
+            return [node.node_id for node in changed_nodes]
             
         except Exception as e:
             self.logger.error(f"Error updating engine data: {e}")
+            return []
+    
+    def _apply_engine_node(self, node):
+        """Обновление nodes_data и hosts_data по одному узлу движка"""
+        node_type = getattr(node, 'type', 'unknown')
+        node_type = getattr(node_type, 'value', node_type)
+        node_data = getattr(node, 'data', 'Unknown')
+        
+        node_entry = self.nodes_data[node.node_id] = {
+            'id': node.node_id,
+            'type': node_type,
+            'label': node_data,
+            'data': node_data,
+            'timestamp': getattr(node, 'timestamp', time.time()),
+            'ports': list(getattr(node, 'ports', [])),
+            'services': list(getattr(node, 'services', [])),
+            'vulnerabilities': list(getattr(node, 'vulnerabilities', []))
+        }
+        self.search_index.index_node(node.node_id, node_entry)
+        
+        # Хосты собираются из узлов хостов, портов, сервисов и уязвимостей
+        if node_type in ('active_host', 'ip_address'):
+            self._get_host_entry(node_data)
+        elif node_type == 'open_ports':
+            self._merge_host_items(node_data, 'ports', getattr(node, 'ports', []))
+        elif node_type == 'vulnerability_scan':
+            services = [
+                f"{service.get('port')}/{service.get('service', service.get('type', 'unknown'))}"
+                if isinstance(service, dict) else str(service)
+                for service in getattr(node, 'services', [])
+            ]
+            self._merge_host_items(node_data, 'services', services)
+        elif node_type == 'vulnerability':
+            metadata = getattr(node, 'metadata', {}) or {}
+            if metadata.get('target'):
+                self._merge_host_items(metadata['target'], 'vulnerabilities', [str(node_data)])
+    
+    def _get_host_entry(self, ip: str) -> Dict[str, Any]:
+        """Запись хоста в hosts_data (создается при первом упоминании)"""
+        self.dirty_hosts.add(ip)
+        host = self.hosts_data.get(ip)
+        if host is None:
+            host = self.hosts_data[ip] = {
+                'hostname': ip,
+                'status': 'active',
+                'ports': [],
+                'services': [],
+                'vulnerabilities': [],
+                'os': 'Unknown',
+                'last_seen': datetime.now().strftime("%H:%M:%S"),
+                'tags': ['discovered']
+            }
+        return host
+    
+    def _merge_host_items(self, ip: str, field: str, items: List[Any]):
+        """Добавление новых портов/сервисов/уязвимостей хоста"""
+        host = self._get_host_entry(ip)
+        values = host[field]
+        for item in items:
+            if item not in values:
+                values.append(item)
+                if field in self.host_totals:
+                    self.host_totals[field] += 1
+        host['last_seen'] = datetime.now().strftime("%H:%M:%S")
+    
+    def _take_dirty_hosts(self) -> List[str]:
+        """Забрать накопленные измененные хосты"""
+        dirty, self.dirty_hosts = list(self.dirty_hosts), set()
+        return dirty
     
     def update_statistics(self):
         """Обновление статистики на боковой панели"""
@@ -690,8 +787,8 @@ class MainWindow:
             # Рассчитываем статистику
             total_nodes = len(self.nodes_data)
             total_hosts = len(self.hosts_data)
-            total_services = sum(len(host.get('services', [])) for host in self.hosts_data.values())
-            total_ports = sum(len(host.get('ports', [])) for host in self.hosts_data.values())
+            total_services = self.host_totals['services']
+            total_ports = self.host_totals['ports']
             
             # Получаем статистику из движка
             engine_stats = self.engine.get_statistics() if hasattr(self.engine, 'get_statistics') else {}
@@ -717,6 +814,9 @@ class MainWindow:
             self.logger.info("Запуск графического интерфейса...")
             
             while dpg.is_dearpygui_running():
+                # Забираем события движка один раз за кадр
+                self.process_engine_events()
+                
                 # Рендерим кадр
                 dpg.render_dearpygui_frame()
             
@@ -2,22 +2,100 @@
 Дерево сети в стиле Obsidian
 """
 import dearpygui.dearpygui as dpg
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Iterable, Set
 import logging
 from datetime import datetime
+from gui.search_index import SearchIndex
+
+class TreeCategory:
+    """
+    Состояние категории дерева
+    
+    Категория хранит упорядоченный список идентификаторов своих элементов
+    независимо от виджетов. Виджеты элементов создаются только для
+    раскрытой категории и только для первых limit элементов.
+    """
+    
+    __slots__ = ('key', 'label', 'ids', 'members', 'rendered', 'limit',
+                 'expanded', 'dirty', 'reset', 'changed')
+    
+    def __init__(self, key: str, label: str):
+        self.key = key
+        self.label = label
+        self.ids: List[str] = []
+        self.members: Set[str] = set()
+        self.rendered = 0
+        self.limit = 0
+        self.expanded = False
+        # dirty - нужно обновить заголовок, reset - перерисовать элементы с нуля,
+        # changed - изменившиеся элементы, которые уже отрисованы
+        self.dirty = True
+        self.reset = True
+        self.changed: Set[str] = set()
+    
+    def add(self, item_id: str) -> bool:
+        """Добавление элемента в конец категории"""
+        if item_id in self.members:
+            return False
+        self.members.add(item_id)
+        self.ids.append(item_id)
+        self.dirty = True
+        return True
+    
+    def discard(self, item_id: str):
+        """Удаление элемента (редкая операция - категория перерисовывается)"""
+        if item_id in self.members:
+            self.members.discard(item_id)
+            self.ids.remove(item_id)
+            self.dirty = self.reset = True
+    
+    def assign(self, ids: List[str]):
+        """Полная замена состава категории"""
+        if ids != self.ids:
+            self.ids = ids
+            self.members = set(ids)
+            self.dirty = self.reset = True
+
 
 class NetworkTree:
     """
     Древовидное представление сети в стиле Obsidian
+    
+    Категории рендерятся лениво: элементы создаются при раскрытии категории
+    порциями по PAGE_SIZE и удаляются при сворачивании. Обновления данных
+    помечают только затронутые категории, остальные не трогаются.
     """
     
-    def __init__(self):
+    PAGE_SIZE = 100
+    
+    # (ключ категории, подпись, тип узла движка)
+    NODE_CATEGORIES = [
+        ("targets", "🎯 Initial Targets", "initial_target"),
+        ("subdomains", "🌐 Subdomains", "subdomain"),
+        ("hosts", "💻 Active Hosts", "active_host"),
+        ("ports", "🔓 Open Ports", "open_ports"),
+        ("services", "⚙️ Services", "service"),
+        ("vulns", "🔴 Vulnerabilities", "vulnerability"),
+        ("exploits", "💥 Exploitation", "exploitation")
+    ]
+    HOSTS_CATEGORY = "hosts_manager"
+    
+    def __init__(self, search_index: Optional[SearchIndex] = None):
         self.logger = logging.getLogger('RapidRecon.NetworkTree')
         self.nodes_data = {}
         self.hosts_data = {}
         self.selected_node = None
         self.on_node_select_callback = None
+        # Поисковый индекс может быть общим с таблицей хостов
+        self.search_index = search_index if search_index is not None else SearchIndex()
+        self.search_text = ""
         
+        self.categories: Dict[str, TreeCategory] = {
+            key: TreeCategory(key, label) for key, label, _ in self.NODE_CATEGORIES
+        }
+        self.categories[self.HOSTS_CATEGORY] = TreeCategory(self.HOSTS_CATEGORY, "🏠 Hosts")
+        self.category_by_type = {node_type: key for key, _, node_type in self.NODE_CATEGORIES}
+    
     def create_tree_panel(self, parent: str) -> str:
         """Создание панели дерева сети"""
         with dpg.child_window(parent=parent, border=False) as tree_panel:
@@ -29,19 +107,22 @@ class NetworkTree:
             # Поиск и фильтры
             with dpg.group(horizontal=True):
                 dpg.add_input_text(
-                    hint="Search nodes...",
+                    hint="Search IP, hostname, service, CVE...",
                     width=-1,
                     callback=self._on_search
                 )
             
-            # Дерево сети
+            # Дерево сети: категории создаются сразу, их элементы - при раскрытии
             with dpg.child_window(height=500, border=True):
-                dpg.add_tree_node(
+                with dpg.tree_node(
                     tag="network_tree_root",
                     label="Discovered Infrastructure (0)",
                     default_open=True,
                     indent=10
-                )
+                ):
+                    dpg.add_text("No nodes discovered yet...", tag="network_tree_empty")
+                    for category in self.categories.values():
+                        self._create_category(category)
             
             # Действия с деревом
             with dpg.group(horizontal=True):
@@ -51,122 +132,252 @@ class NetworkTree:
                     callback=self._expand_all
                 )
                 dpg.add_button(
-                    label="📊 Statistics", 
+                    label="📊 Statistics",
                     width=120,
                     callback=self._show_statistics
                 )
         
         return tree_panel
     
-    def update_tree(self, nodes: Dict, hosts: Dict):
-        """Обновление дерева на основе новых данных"""
+    def _create_category(self, category: TreeCategory):
+        """Создание пустой категории и привязка обработчика раскрытия"""
+        if not dpg.does_item_exist("network_tree_handlers"):
+            with dpg.item_handler_registry(tag="network_tree_handlers"):
+                dpg.add_item_toggled_open_handler(callback=self._on_category_toggled)
+        
+        tag = f"cat_{category.key}"
+        with dpg.tree_node(label=category.label, tag=tag, user_data=category.key, show=False):
+            dpg.add_group(tag=f"{tag}_items")
+            dpg.add_button(
+                label="Show more",
+                tag=f"{tag}_more",
+                user_data=category.key,
+                show=False,
+                callback=self._on_show_more
+            )
+        dpg.bind_item_handler_registry(tag, "network_tree_handlers")
+        
+        # Виджеты категории новые - состояние отрисовки сбрасывается
+        category.rendered = 0
+        category.expanded = False
+        category.dirty = category.reset = True
+        category.changed.clear()
+    
+    def update_tree(self, nodes: Dict, hosts: Dict,
+                    changed_nodes: Optional[Iterable[str]] = None,
+                    changed_hosts: Optional[Iterable[str]] = None):
+        """
+        Обновление дерева на основе новых данных
+        
+        Args:
+            nodes: nodes_data главного окна
+            hosts: hosts_data главного окна
+            changed_nodes: Измененные узлы; None - пересчитать все категории
+            changed_hosts: Измененные хосты
+        """
         try:
+            full = (
+                changed_nodes is None
+                or nodes is not self.nodes_data
+                or hosts is not self.hosts_data
+            )
             self.nodes_data = nodes
             self.hosts_data = hosts
             
-            # Очищаем старое дерево
-            if dpg.does_item_exist("network_tree_root"):
-                dpg.delete_item("network_tree_root", children_only=True)
-            
-            # Обновляем статистику в заголовке
-            total_nodes = len(nodes)
-            dpg.set_value("tree_stats", f"({total_nodes})")
-            dpg.configure_item("network_tree_root", label=f"Discovered Infrastructure ({total_nodes})")
-            
-            if not nodes:
-                dpg.add_text("No nodes discovered yet...", parent="network_tree_root")
-                return
-            
-            # Группируем узлы по типам
-            nodes_by_type = self._group_nodes_by_type(nodes)
-            
-            # Создаем основные категории
-            self._create_category("🎯 Initial Targets", nodes_by_type.get('initial_target', []), "targets")
-            self._create_category("🌐 Subdomains", nodes_by_type.get('subdomain', []), "subdomains") 
-            self._create_category("💻 Active Hosts", nodes_by_type.get('active_host', []), "hosts")
-            self._create_category("🔓 Open Ports", nodes_by_type.get('open_ports', []), "ports")
-            self._create_category("⚙️ Services", nodes_by_type.get('service', []), "services")
-            self._create_category("🔴 Vulnerabilities", nodes_by_type.get('vulnerability', []), "vulns")
-            self._create_category("💥 Exploitation", nodes_by_type.get('exploitation', []), "exploits")
+            if full:
+                self._rebuild_categories()
+            else:
+                self._apply_changes(changed_nodes, changed_hosts or ())
             
-            # Добавляем хосты из host manager
-            if hosts:
-                self._create_hosts_category(hosts)
-                
+            self._sync_widgets()
+        
         except Exception as e:
             self.logger.error(f"Error updating tree: {e}")
     
-    def _group_nodes_by_type(self, nodes: Dict) -> Dict[str, List]:
-        """Группировка узлов по типам"""
-        grouped = {}
-        for node_id, node in nodes.items():
-            node_type = node.get('type', 'unknown')
-            if node_type not in grouped:
-                grouped[node_type] = []
-            grouped[node_type].append(node)
-        return grouped
-    
-    def _create_category(self, label: str, nodes: List, tag_suffix: str):
-        """Создание категории узлов"""
-        if not nodes:
+    def _rebuild_categories(self):
+        """Пересчет состава всех категорий (без виджетов)"""
+        grouped = {key: [] for key in self.categories}
+        for node_id, node in self._filter_items('node', self.nodes_data).items():
+            key = self.category_by_type.get(node.get('type', 'unknown'))
+            if key:
+                grouped[key].append(node_id)
+        grouped[self.HOSTS_CATEGORY] = list(self._filter_items('host', self.hosts_data))
+        
+        for key, ids in grouped.items():
+            self.categories[key].assign(ids)
+    
+    def _apply_changes(self, changed_nodes: Iterable[str], changed_hosts: Iterable[str]):
+        """Добавление новых и пометка измененных элементов в их категориях"""
+        for node_id in changed_nodes:
+            node = self.nodes_data.get(node_id)
+            key = self.category_by_type.get(node.get('type', 'unknown')) if node else None
+            if key:
+                self._touch(self.categories[key], 'node', node_id)
+        
+        hosts_category = self.categories[self.HOSTS_CATEGORY]
+        for ip in changed_hosts:
+            if ip in self.hosts_data:
+                self._touch(hosts_category, 'host', ip)
+            else:
+                hosts_category.discard(ip)
+    
+    def _touch(self, category: TreeCategory, kind: str, item_id: str):
+        """Учет нового или измененного элемента категории"""
+        if self.search_text and not self.search_index.matches(kind, item_id, self.search_text):
+            category.discard(item_id)
             return
+        if not category.add(item_id) and category.expanded:
+            category.changed.add(item_id)
+            category.dirty = True
+    
+    def _sync_widgets(self):
+        """Приведение виджетов к состоянию категорий (только помеченные категории)"""
+        if not dpg.does_item_exist("network_tree_root"):
+            return
+        
+        total_nodes = len(self.nodes_data)
+        dpg.set_value("tree_stats", f"({total_nodes})")
+        dpg.configure_item("network_tree_root", label=f"Discovered Infrastructure ({total_nodes})")
+        dpg.configure_item("network_tree_empty", show=not self.nodes_data)
+        
+        for category in self.categories.values():
+            if category.dirty:
+                self._sync_category(category)
+    
+    def _sync_category(self, category: TreeCategory):
+        """Обновление одной категории"""
+        tag = f"cat_{category.key}"
+        dpg.configure_item(tag, label=f"{category.label} ({len(category.ids)})", show=bool(category.ids))
+        
+        if category.reset:
+            dpg.delete_item(f"{tag}_items", children_only=True)
+            category.rendered = 0
+            category.changed.clear()
+        
+        if category.expanded:
+            # Перерисовываем только уже показанные элементы, которые изменились
+            for item_id in category.changed:
+                self._rerender_item(category, item_id)
+            self._render_items(category)
+        
+        category.dirty = category.reset = False
+        category.changed.clear()
+    
+    def _render_items(self, category: TreeCategory):
+        """Догрузка элементов категории до ее текущего лимита"""
+        tag = f"cat_{category.key}"
+        end = min(category.limit, len(category.ids))
+        for item_id in category.ids[category.rendered:end]:
+            self._create_item(category, item_id, f"{tag}_items")
+        category.rendered = max(category.rendered, end)
+        
+        remaining = len(category.ids) - category.rendered
+        dpg.configure_item(
+            f"{tag}_more",
+            label=f"Show more ({remaining} remaining)",
+            show=remaining > 0
+        )
+    
+    def _create_item(self, category: TreeCategory, item_id: str, parent: str, before: Any = 0):
+        """Создание виджета элемента категории"""
+        if category.key == self.HOSTS_CATEGORY:
+            host = self.hosts_data.get(item_id)
+            if host is not None:
+                self._create_host_item(item_id, host, parent, before)
+        else:
+            node = self.nodes_data.get(item_id)
+            if node is not None:
+                self._create_node_item(node, parent, before)
+    
+    def _rerender_item(self, category: TreeCategory, item_id: str):
+        """Пересоздание одного отрисованного элемента на том же месте"""
+        item_tag = self._item_tag(category, item_id)
+        if not dpg.does_item_exist(item_tag):
+            return
+        
+        position = category.ids.index(item_id)
+        before = 0
+        if position + 1 < category.rendered:
+            before = self._item_tag(category, category.ids[position + 1])
+        dpg.delete_item(item_tag)
+        self._create_item(category, item_id, f"cat_{category.key}_items", before)
+    
+    def _item_tag(self, category: TreeCategory, item_id: str) -> str:
+        return f"tree_host_{item_id}" if category.key == self.HOSTS_CATEGORY else f"node_{item_id}"
+    
+    def _on_category_toggled(self, sender, app_data):
+        """Раскрытие/сворачивание категории"""
+        key = dpg.get_item_user_data(app_data)
+        category = self.categories.get(key)
+        if category is None:
+            return
+        self._set_expanded(category, bool(dpg.get_value(app_data)))
+    
+    def _set_expanded(self, category: TreeCategory, expanded: bool):
+        """Отрисовка первой порции при раскрытии, удаление элементов при сворачивании"""
+        category.expanded = expanded
+        tag = f"cat_{category.key}"
+        dpg.delete_item(f"{tag}_items", children_only=True)
+        category.rendered = 0
+        category.changed.clear()
+        
+        if expanded:
+            category.limit = self.PAGE_SIZE
+            self._render_items(category)
+        else:
+            category.limit = 0
+            dpg.configure_item(f"{tag}_more", show=False)
+    
+    def _on_show_more(self, sender, app_data, user_data):
+        """Следующая порция элементов категории"""
+        category = self.categories.get(user_data)
+        if category is None:
+            return
+        category.limit = category.rendered + self.PAGE_SIZE
+        self._render_items(category)
+    
+    def _create_host_item(self, ip: str, host: Dict, parent: str, before: Any = 0):
+        """Создание элемента хоста"""
+        with dpg.tree_node(label=f"📡 {ip}", tag=f"tree_host_{ip}", parent=parent, before=before):
+            # Основная информация о хосте
+            dpg.add_text(f"Hostname: {host.get('hostname', 'Unknown')}")
+            dpg.add_text(f"Status: {host.get('status', 'unknown')}")
+            dpg.add_text(f"OS: {host.get('os', 'Unknown')}")
+            dpg.add_text(f"Last Seen: {host.get('last_seen', 'Unknown')}")
             
-        with dpg.tree_node(
-            label=f"{label} ({len(nodes)})", 
-            parent="network_tree_root",
-            tag=f"cat_{tag_suffix}"
-        ):
-            for node in nodes:
-                self._create_node_item(node)
-    
-    def _create_hosts_category(self, hosts: Dict):
-        """Создание категории хостов"""
-        with dpg.tree_node(
-            label=f"🏠 Hosts ({len(hosts)})",
-            parent="network_tree_root", 
-            tag="cat_hosts_manager"
-        ):
-            for ip, host in hosts.items():
-                with dpg.tree_node(label=f"📡 {ip}"):
-                    # Основная информация о хосте
-                    dpg.add_text(f"Hostname: {host.get('hostname', 'Unknown')}")
-                    dpg.add_text(f"Status: {host.get('status', 'unknown')}")
-                    dpg.add_text(f"OS: {host.get('os', 'Unknown')}")
-                    dpg.add_text(f"Last Seen: {host.get('last_seen', 'Unknown')}")
-                    
-                    # Порты
-                    ports = host.get('ports', [])
-                    if ports:
-                        with dpg.tree_node(label=f"🔓 Ports ({len(ports)})"):
-                            for port in ports:
-                                dpg.add_text(f"Port {port}")
-                    
-                    # Сервисы
-                    services = host.get('services', [])
-                    if services:
-                        with dpg.tree_node(label=f"⚙️ Services ({len(services)})"):
-                            for service in services:
-                                dpg.add_text(service)
-                    
-                    # Уязвимости
-                    vulns = host.get('vulnerabilities', [])
-                    if vulns:
-                        with dpg.tree_node(label=f"🔴 Vulnerabilities ({len(vulns)})"):
-                            for vuln in vulns:
-                                dpg.add_text(vuln, color=[255, 100, 100])
-                    
-                    # Действия
-                    with dpg.tree_node(label="🚀 Actions"):
-                        dpg.add_button(
-                            label="🔍 Scan Ports",
-                            callback=lambda s, d, ip=ip: self._scan_host_ports(ip)
-                        )
-                        dpg.add_button(
-                            label="🔎 Service Detection", 
-                            callback=lambda s, d, ip=ip: self._detect_services(ip)
-                        )
-    
-    def _create_node_item(self, node: Dict):
+            # Порты
+            ports = host.get('ports', [])
+            if ports:
+                with dpg.tree_node(label=f"🔓 Ports ({len(ports)})"):
+                    for port in ports:
+                        dpg.add_text(f"Port {port}")
+            
+            # Сервисы
+            services = host.get('services', [])
+            if services:
+                with dpg.tree_node(label=f"⚙️ Services ({len(services)})"):
+                    for service in services:
+                        dpg.add_text(service)
+            
+            # Уязвимости
+            vulns = host.get('vulnerabilities', [])
+            if vulns:
+                with dpg.tree_node(label=f"🔴 Vulnerabilities ({len(vulns)})"):
+                    for vuln in vulns:
+                        dpg.add_text(vuln, color=[255, 100, 100])
+            
+            # Действия
+            with dpg.tree_node(label="🚀 Actions"):
+                dpg.add_button(
+                    label="🔍 Scan Ports",
+                    callback=lambda s, d, ip=ip: self._scan_host_ports(ip)
+                )
+                dpg.add_button(
+                    label="🔎 Service Detection",
+                    callback=lambda s, d, ip=ip: self._detect_services(ip)
+                )
+    
+    def _create_node_item(self, node: Dict, parent: str, before: Any = 0):
         """Создание элемента узла"""
         node_id = node.get('id', 'unknown')
         node_type = node.get('type', 'unknown')
@@ -175,7 +386,7 @@ class NetworkTree:
         # Иконки для разных типов узлов
         icons = {
             'initial_target': '🎯',
-            'subdomain': '🌐', 
+            'subdomain': '🌐',
             'active_host': '💻',
             'open_ports': '🔓',
             'service': '⚙️',
@@ -185,7 +396,7 @@ class NetworkTree:
         
         icon = icons.get(node_type, '•')
         
-        with dpg.tree_node(label=f"{icon} {label}", tag=f"node_{node_id}"):
+        with dpg.tree_node(label=f"{icon} {label}", tag=f"node_{node_id}", parent=parent, before=before):
             # Основная информация
             dpg.add_text(f"Type: {node_type}")
             dpg.add_text(f"ID: {node_id}")
@@ -236,41 +447,36 @@ class NetworkTree:
     
     def _on_search(self, sender, app_data):
         """Обработчик поиска"""
-        search_text = app_data.lower()
-        self._filter_tree(search_text)
+        self._filter_tree(app_data)
     
     def _filter_tree(self, search_text: str):
-        """Фильтрация дерева по тексту"""
-        if not search_text:
-            # Показываем все элементы
-            for i in range(dpg.get_item_children("network_tree_root", 1)):
-                child = dpg.get_item_children("network_tree_root", 1)[i]
-                dpg.show_item(child)
-            return
+        """
+        Фильтрация дерева по тексту
         
-        # Скрываем/показываем элементы на основе поиска
-        for i in range(dpg.get_item_children("network_tree_root", 1)):
-            child = dpg.get_item_children("network_tree_root", 1)[i]
-            child_label = dpg.get_item_label(child).lower()
-            
-            if search_text in child_label:
-                dpg.show_item(child)
-                # Раскрываем родительские элементы
-                parent = dpg.get_item_parent(child)
-                if dpg.does_item_exist(parent):
-                    dpg.configure_item(parent, default_open=True)
-            else:
-                dpg.hide_item(child)
+        Совпадения берутся из поискового индекса, а не из подписей виджетов;
+        дерево перестраивается только из найденных узлов и хостов.
+        """
+        self.search_text = (search_text or "").strip().lower()
+        self.update_tree(self.nodes_data, self.hosts_data)
+        
+        # При активном поиске найденное сразу раскрывается
+        if self.search_text:
+            self._expand_all()
+    
+    def _filter_items(self, kind: str, items: Dict) -> Dict:
+        """Элементы nodes_data/hosts_data, подходящие под строку поиска"""
+        if not self.search_text:
+            return items
+        found = self.search_index.search(kind, self.search_text)
+        return {item_id: item for item_id, item in items.items() if item_id in found}
     
     def _expand_all(self):
-        """Развернуть все узлы дерева"""
-        def expand_recursive(item):
-            dpg.configure_item(item, default_open=True)
-            children = dpg.get_item_children(item, 1)
-            for child in children:
-                expand_recursive(child)
-        
-        expand_recursive("network_tree_root")
+        """Развернуть все категории (первая порция элементов каждой)"""
+        for category in self.categories.values():
+            tag = f"cat_{category.key}"
+            if category.ids and not category.expanded and dpg.does_item_exist(tag):
+                dpg.set_value(tag, True)
+                self._set_expanded(category, True)
     
     def _show_statistics(self):
         """Показать статистику сети"""
@@ -317,6 +523,7 @@ class NetworkTree:
         """Очистка дерева"""
         self.nodes_data.clear()
         self.hosts_data.clear()
-        if dpg.does_item_exist("network_tree_root"):
-            dpg.delete_item("network_tree_root", children_only=True)
-            dpg.add_text("No nodes discovered yet...", parent="network_tree_root")
+        self.search_index.clear('node')
+        for category in self.categories.values():
+            category.assign([])
+        self._sync_widgets()
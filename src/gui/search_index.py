@@ -0,0 +1,281 @@
+"""
+Поисковый индекс GUI - общий для таблицы хостов и дерева сети
+"""
+import heapq
+from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
+import logging
+
+
+class SearchIndex:
+    """
+    Инкрементальный поисковый индекс по хостам и узлам
+
+    Документ - хост (kind="host") или узел движка (kind="node"). Для
+    каждого документа индексируются поля: IP, имя хоста, сервисы, CVE,
+    теги. Индекс обновляется по одному документу при поступлении данных,
+    поэтому поиск не обходит ни все хосты, ни виджеты DearPyGui:
+
+    * триграммы значений полей -> множества документов; запрос от 3
+      символов - пересечение множеств и проверка подстроки у кандидатов;
+    * запрос из 1-2 символов триграммами не покрыть - он ищется линейным
+      проходом по сохраненным значениям (так ".1" и "68" находят
+      192.168.1.10);
+    * фасеты (kind:host, status:active, has_vulns, type:...) хранятся
+      битовыми масками в int и комбинируются побитовыми операциями.
+
+    Номера удаленных документов переиспользуются (сначала меньшие), поэтому
+    ширина масок ограничена максимальным числом документов в индексе, а не
+    числом когда-либо проиндексированных - полная перестройка таблицы хостов
+    (clear('host') и повторная индексация) не раздувает индекс.
+    """
+
+    GRAM = 3
+    # Ключи словарей сервисов и уязвимостей, попадающие в поиск
+    ITEM_KEYS = ('cve', 'id', 'name', 'type', 'service', 'product', 'version', 'port', 'ip', 'host', 'title')
+
+    def __init__(self):
+        self.logger = logging.getLogger('RapidRecon.SearchIndex')
+        # (kind, id) <-> порядковый номер документа
+        self._ordinals: Dict[Tuple[str, str], int] = {}
+        self._doc_ids: List[Optional[Tuple[str, str]]] = []
+        # Освободившиеся номера документов (min-heap)
+        self._free: List[int] = []
+        # Индексированные значения, триграммы и фасеты каждого документа
+        self._values: Dict[int, Tuple[str, ...]] = {}
+        self._doc_grams: Dict[int, Set[str]] = {}
+        self._doc_facets: Dict[int, Tuple[str, ...]] = {}
+
+        # Триграммы -> номера документов
+        self._grams: Dict[str, Set[int]] = {}
+        self._facets: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Индексация
+    # ------------------------------------------------------------------
+
+    def index_host(self, ip: str, host: Dict[str, Any]):
+        """Индексация хоста из hosts_data"""
+        status = str(host.get('status', 'unknown')).lower()
+        vulns = host.get('vulnerabilities', [])
+        self.update(
+            'host', ip,
+            [ip, host.get('hostname', '')]
+            + self._item_values(host.get('services', []))
+            + self._item_values(vulns)
+            + list(host.get('tags', [])),
+            [f"status:{status}"] + (['has_vulns'] if vulns else [])
+        )
+
+    def index_node(self, node_id: str, node: Dict[str, Any]):
+        """Индексация узла из nodes_data"""
+        vulns = node.get('vulnerabilities', [])
+        self.update(
+            'node', node_id,
+            [node.get('label', ''), node.get('type', '')]
+            + self._item_values(node.get('services', []))
+            + self._item_values(vulns),
+            [f"type:{node.get('type', 'unknown')}"]
+            + (['has_vulns'] if vulns or node.get('type') == 'vulnerability' else [])
+        )
+
+    @classmethod
+    def _item_values(cls, items: Iterable[Any]) -> List[str]:
+        """Строковые значения сервисов/уязвимостей (словари раскрываются по ITEM_KEYS)"""
+        values = []
+        for item in items:
+            if isinstance(item, dict):
+                values.extend(str(item[key]) for key in cls.ITEM_KEYS if item.get(key) not in (None, ''))
+            else:
+                values.append(str(item))
+        return values
+
+    def update(self, kind: str, doc_id: str, values: Iterable[Any], facets: Iterable[str] = ()):
+        """Добавление или переиндексация документа"""
+        values = tuple(dict.fromkeys(str(value).lower() for value in values if value not in (None, '')))
+        grams = set()
+        for value in values:
+            grams.update(value[i:i + self.GRAM] for i in range(len(value) - self.GRAM + 1))
+        facets = tuple(dict.fromkeys((f"kind:{kind}",) + tuple(facets)))
+
+        key = (kind, doc_id)
+        ordinal = self._ordinals.get(key)
+        old_facets: Tuple[str, ...] = ()
+        if ordinal is None:
+            if self._free:
+                ordinal = heapq.heappop(self._free)
+                self._doc_ids[ordinal] = key
+            else:
+                ordinal = len(self._doc_ids)
+                self._doc_ids.append(key)
+            self._ordinals[key] = ordinal
+        else:
+            # Маски не изменившихся фасетов не переписываются
+            old_facets = self._doc_facets.get(ordinal, ())
+            self._unindex(ordinal, keep_facets=facets)
+
+        self._values[ordinal] = values
+        self._doc_grams[ordinal] = grams
+        self._doc_facets[ordinal] = facets
+
+        index = self._grams
+        for gram in grams:
+            postings = index.get(gram)
+            if postings is None:
+                index[gram] = {ordinal}
+            else:
+                postings.add(ordinal)
+        bit = 1 << ordinal
+        for facet in facets:
+            if facet not in old_facets:
+                self._facets[facet] = self._facets.get(facet, 0) | bit
+
+    def remove(self, kind: str, doc_id: str):
+        """Удаление документа из индекса"""
+        ordinal = self._ordinals.pop((kind, doc_id), None)
+        if ordinal is None:
+            return
+        self._unindex(ordinal)
+        self._doc_ids[ordinal] = None
+        heapq.heappush(self._free, ordinal)
+
+    def clear(self, kind: Optional[str] = None):
+        """Удаление всех документов (или только документов вида kind)"""
+        if kind is None:
+            self.__init__()
+            return
+        for key in [key for key in self._ordinals if key[0] == kind]:
+            self.remove(*key)
+
+    def _unindex(self, ordinal: int, keep_facets: Iterable[str] = ()):
+        """Удаление постингов документа, кроме фасетов keep_facets (номер документа сохраняется)"""
+        for gram in self._doc_grams.pop(ordinal, ()):
+            postings = self._grams[gram]
+            postings.discard(ordinal)
+            if not postings:
+                del self._grams[gram]
+        mask = ~(1 << ordinal)
+        for facet in self._doc_facets.pop(ordinal, ()):
+            if facet in keep_facets:
+                continue
+            self._facets[facet] &= mask
+            if not self._facets[facet]:
+                del self._facets[facet]
+        self._values.pop(ordinal, None)
+
+    # ------------------------------------------------------------------
+    # Поиск
+    # ------------------------------------------------------------------
+
+    def search(self, kind: str, text: str = '', require: Iterable[str] = (),
+               exclude: Iterable[str] = ()) -> Set[str]:
+        """
+        Поиск документов вида kind
+
+        Args:
+            kind: "host" или "node"
+            text: Подстрока значения поля
+            require: Фасеты, которые должны быть у документа
+            exclude: Фасеты, которых у документа быть не должно
+
+        Returns:
+            Идентификаторы найденных документов
+        """
+        text = text.strip().lower()
+        if not text:
+            # Только фасеты - пересечение битовых масок
+            mask = self._facet_mask(kind, require, exclude)
+            return {self._doc_ids[ordinal][1] for ordinal in self._iter_bits(mask)}
+
+        # Кандидатов по тексту проверяем по фасетам документа: сдвиг большой
+        # маски на каждый кандидат стоил бы O(N)
+        doc_ids = self._doc_ids
+        candidates = self._text_candidates(text)
+        if not require and not exclude:
+            return {doc_ids[ordinal][1] for ordinal in candidates if doc_ids[ordinal][0] == kind}
+
+        doc_facets = self._doc_facets
+        found = set()
+        for ordinal in candidates:
+            doc_kind, doc_id = doc_ids[ordinal]
+            if doc_kind == kind and self._has_facets(doc_facets[ordinal], require, exclude):
+                found.add(doc_id)
+        return found
+
+    def matches(self, kind: str, doc_id: str, text: str = '', require: Iterable[str] = (),
+                exclude: Iterable[str] = ()) -> bool:
+        """Проверка одного документа по запросу (для инкрементальных обновлений)"""
+        ordinal = self._ordinals.get((kind, doc_id))
+        if ordinal is None:
+            return False
+        if not self._has_facets(self._doc_facets[ordinal], require, exclude):
+            return False
+
+        text = text.strip().lower()
+        if not text:
+            return True
+        return any(text in value for value in self._values[ordinal])
+
+    @staticmethod
+    def _has_facets(facets: Tuple[str, ...], require: Iterable[str], exclude: Iterable[str]) -> bool:
+        return all(facet in facets for facet in require) and not any(facet in facets for facet in exclude)
+
+    def _facet_mask(self, kind: str, require: Iterable[str], exclude: Iterable[str]) -> int:
+        mask = self._facets.get(f"kind:{kind}", 0)
+        for facet in require:
+            mask &= self._facets.get(facet, 0)
+        for facet in exclude:
+            mask &= ~self._facets.get(facet, 0)
+        return mask
+
+    def _text_candidates(self, text: str) -> Iterable[int]:
+        """Номера документов, содержащих text"""
+        if len(text) < self.GRAM:
+            # Короче триграммы - линейная проверка подстроки во всех значениях
+            return [
+                ordinal for ordinal, values in self._values.items()
+                if any(text in value for value in values)
+            ]
+
+        postings = []
+        for i in range(len(text) - self.GRAM + 1):
+            gram_postings = self._grams.get(text[i:i + self.GRAM])
+            if not gram_postings:
+                return ()
+            postings.append(gram_postings)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for gram_postings in postings[1:]:
+            candidates &= gram_postings
+            if not candidates:
+                return ()
+
+        if len(postings) == 1:
+            # Запрос - ровно одна триграмма, проверка не нужна
+            return candidates
+
+        # Триграммы могут совпасть в разных местах значения - проверяем подстроку
+        values = self._values
+        return [
+            ordinal for ordinal in candidates
+            if any(text in value for value in values[ordinal])
+        ]
+
+    @staticmethod
+    def _iter_bits(mask: int) -> Iterable[int]:
+        """Номера установленных битов маски"""
+        bits = bin(mask)[:1:-1]
+        position = bits.find('1')
+        while position != -1:
+            yield position
+            position = bits.find('1', position + 1)
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика индекса"""
+        return {
+            'documents': len(self._ordinals),
+            'grams': len(self._grams),
+            'facets': {facet: bin(mask).count('1') for facet, mask in self._facets.items()}
+        }
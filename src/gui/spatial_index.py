@@ -0,0 +1,155 @@
+"""
+Пространственный индекс узлов графа - равномерная сетка
+"""
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    Равномерная сетка над позициями узлов раскладки
+
+    Узлы упорядочены по ключу ячейки (cx * BASE + cy), поэтому ячейки
+    одного столбца сетки с подряд идущими cy лежат в отсортированном
+    массиве непрерывно: запрос прямоугольника - это два searchsorted на
+    столбец и точная проверка координат только у попавших узлов, т.е.
+    O(столбцы * log n + k) вместо обхода всех узлов.
+
+    Индекс синхронизируется с ForceLayout по его версии. Если после
+    итерации раскладки ни один узел не сменил ячейку (типично для
+    остывающего графа), пересортировка не выполняется.
+    """
+
+    _KEY_OFFSET = 1 << 20
+    _KEY_BASE = 1 << 21
+
+    def __init__(self, cell_size: float = 160.0):
+        self.logger = logging.getLogger('RapidRecon.SpatialGrid')
+        self.cell_size = float(cell_size)
+
+        # Снимок раскладки: идентификаторы, позиции и строка каждого узла
+        self.ids: List[Any] = []
+        self.positions = np.zeros((0, 2))
+        self.rows: Dict[Any, int] = {}
+        self.version = -1
+
+        self._cell_keys = np.zeros(0, dtype=np.int64)
+        self._order = np.zeros(0, dtype=np.int64)
+        self._sorted_keys = np.zeros(0, dtype=np.int64)
+        self._column_range = (0, -1)
+
+        self.stats = {'syncs': 0, 'resorts': 0}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ------------------------------------------------------------------
+    # Синхронизация
+    # ------------------------------------------------------------------
+
+    def sync(self, layout) -> bool:
+        """
+        Обновление индекса по раскладке, если она изменилась
+
+        Returns:
+            True, если позиции обновлены
+        """
+        if layout.version == self.version:
+            return False
+        self.version = layout.version
+        ids, positions = layout.snapshot()
+        self.rebuild(ids, positions)
+        return True
+
+    def rebuild(self, ids: List[Any], positions: np.ndarray):
+        """Индексация позиций (идентификаторы только дописываются, кроме очистки)"""
+        if len(ids) < len(self.ids) or ids[:1] != self.ids[:1]:
+            self.rows = {}
+        for row in range(len(self.rows), len(ids)):
+            self.rows[ids[row]] = row
+        self.ids = ids
+        self.positions = positions
+        self.stats['syncs'] += 1
+
+        cells = self._cells(positions)
+        keys = cells[:, 0] * self._KEY_BASE + cells[:, 1]
+        if len(keys) == len(self._cell_keys) and np.array_equal(keys, self._cell_keys):
+            return
+
+        self._cell_keys = keys
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+        if len(cells):
+            self._column_range = (int(cells[:, 0].min()), int(cells[:, 0].max()))
+        else:
+            self._column_range = (0, -1)
+        self.stats['resorts'] += 1
+
+    def clear(self):
+        """Очистка индекса"""
+        self.__init__(self.cell_size)
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(points / self.cell_size).astype(np.int64) + self._KEY_OFFSET
+
+    # ------------------------------------------------------------------
+    # Запросы
+    # ------------------------------------------------------------------
+
+    def position(self, node_id: Any) -> Optional[Tuple[float, float]]:
+        """Позиция узла в последнем снимке"""
+        row = self.rows.get(node_id)
+        if row is None:
+            return None
+        x, y = self.positions[row]
+        return float(x), float(y)
+
+    def query_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> np.ndarray:
+        """Строки снимка узлов внутри прямоугольника"""
+        if not len(self.ids) or min_x > max_x or min_y > max_y:
+            return np.zeros(0, dtype=np.int64)
+
+        low = self._cells(np.array([min_x, min_y]))
+        high = self._cells(np.array([max_x, max_y]))
+        # Столбцы вне занятого диапазона пусты
+        first = max(int(low[0]), self._column_range[0])
+        last = min(int(high[0]), self._column_range[1])
+        if first > last:
+            return np.zeros(0, dtype=np.int64)
+
+        columns = np.arange(first, last + 1, dtype=np.int64) * self._KEY_BASE
+        starts = np.searchsorted(self._sorted_keys, columns + low[1], side='left')
+        ends = np.searchsorted(self._sorted_keys, columns + high[1], side='right')
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64)
+
+        # Объединение диапазонов [starts, ends) без цикла Python
+        flat = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        rows = self._order[flat]
+
+        points = self.positions[rows]
+        inside = (
+            (points[:, 0] >= min_x) & (points[:, 0] <= max_x)
+            & (points[:, 1] >= min_y) & (points[:, 1] <= max_y)
+        )
+        return rows[inside]
+
+    def query_radius(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Строки узлов в круге, от ближнего к дальнему"""
+        rows = self.query_rect(x - radius, y - radius, x + radius, y + radius)
+        if not len(rows):
+            return rows
+        delta = self.positions[rows] - (x, y)
+        distance = np.einsum('ij,ij->i', delta, delta)
+        inside = distance <= radius * radius
+        rows, distance = rows[inside], distance[inside]
+        return rows[np.argsort(distance, kind='stable')]
+
+    def ids_in_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[Any]:
+        """Идентификаторы узлов внутри прямоугольника"""
+        ids = self.ids
+        return [ids[row] for row in self.query_rect(min_x, min_y, max_x, max_y).tolist()]
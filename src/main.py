@@ -50,7 +50,6 @@ class RapidRecon:
         self.is_running = False
         self.engine_thread: Optional[threading.Thread] = None
         self.event_loop: Optional[asyncio.AbstractEventLoop] = None
-        self.last_update_time = 0
         self.update_interval = 0.5
         
         # Инициализация компонентов
@@ -108,8 +107,9 @@ class RapidRecon:
                 discovered = self.module_manager.discover_modules()
                 self.logger.info(f"🔍 Обнаружено модулей: {len(discovered)}")
             
-            # Инициализация движка БЕЗ параметров конфигурации
-            self.engine = PropagationEngine(update_callback=self.on_engine_update)
+            # Инициализация движка БЕЗ параметров конфигурации.
+            # События движка GUI забирает из engine.event_bus раз в кадр
+            self.engine = PropagationEngine()
             
             # Загрузка и регистрация модулей
             self.load_and_register_modules()
@@ -154,30 +154,6 @@ class RapidRecon:
         except Exception as e:
             self.logger.error(f"❌ Ошибка загрузки модулей: {e}")
     
-    def on_engine_update(self, event_type: str, data: Any = None):
-        """
-        Callback при обновлении движка для синхронизации с GUI
-        """
-        try:
-            current_time = time.time()
-            
-            # Ограничиваем частоту обновлений чтобы не перегружать GUI
-            if current_time - self.last_update_time < self.update_interval:
-                return
-                
-            self.last_update_time = current_time
-            
-            # Передаем событие в GUI
-            if self.gui:
-                self.gui.handle_engine_event(event_type, data)
-            
-            # Логируем важные события
-            if event_type in ['vulnerability_found', 'exploitation_success']:
-                self.logger.info(f"Engine event: {event_type} - {data}")
-                
-        except Exception as e:
-            self.logger.warning(f"Ошибка в engine callback: {e}")
-    
     def setup_signal_handlers(self):
         """Настройка обработчиков сигналов для graceful shutdown"""
         def signal_handler(signum, frame):
@@ -349,7 +325,7 @@ class RapidRecon:
             'engine_status': engine_stats,
             'threads_active': threading.active_count(),
             'uptime': getattr(self, 'start_time', 0),
-            'last_update': self.last_update_time,
+            'last_update': getattr(self.gui, 'last_engine_update', 0),
             'active_profile': getattr(self.config_manager, 'active_profile', 'normal'),
             'vulnerabilities_found': engine_stats.get('vulnerabilities_found', 0),
             'exploits_successful': engine_stats.get('exploits_successful', 0)
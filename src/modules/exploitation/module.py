@@ -3,12 +3,15 @@ import paramiko
 from typing import List, Dict, Any
 import subprocess
 import requests
+from core.rate_limiter import FallbackPacer, governed_slot
 
 class Exploitation:
     def __init__(self, rate_limit: int = 1):
         self.rate_limit = rate_limit
         self.name = "exploitation"
         self.exploit_db = self.load_exploit_db()
+        self.rate_governor = None  # Общий RateGovernor, назначается движком
+        self._fallback_pacer = FallbackPacer()
     
     def load_exploit_db(self) -> Dict[str, Dict]:
         """База эксплойтов"""
@@ -43,14 +46,26 @@ class Exploitation:
         results = {"exploitation_results": [], "module": self.name}
         
         for vuln in vulnerabilities_data:
-            exploit_result = await self.attempt_exploitation(vuln)
+            async with self.rate_slot(self.get_vulnerability_host(vuln)):
+                exploit_result = await self.attempt_exploitation(vuln)
             if exploit_result:
                 results["exploitation_results"].append(exploit_result)
-            
-            await asyncio.sleep(1 / self.rate_limit)
         
         return results
     
+    @staticmethod
+    def get_vulnerability_host(vulnerability: Any) -> Any:
+        """Хост, на котором находится уязвимость"""
+        if isinstance(vulnerability, dict):
+            service_info = vulnerability.get('service')
+            if isinstance(service_info, dict):
+                return service_info.get('host')
+        return None
+    
+    def rate_slot(self, host: Any):
+        """Слот попытки эксплуатации с учетом ограничения скорости"""
+        return governed_slot(self.rate_governor, self.name, host, self._fallback_pacer.slot(self.rate_limit))
+    
     async def attempt_exploitation(self, vulnerability: Dict) -> Dict[str, Any]:
         """Попытка эксплуатации уязвимости"""
         vuln_type = vulnerability.get('type', '')
@@ -1,26 +1,39 @@
 import asyncio
 import subprocess
 from typing import List, Dict, Any
+from core.rate_limiter import FallbackPacer, governed_slot
 
 class PingScanner:
     def __init__(self, rate_limit: int = 10):
         self.rate_limit = rate_limit
         self.name = "ping_scanner"
+        self.rate_governor = None  # Общий RateGovernor, назначается движком
+        self._fallback_pacer = FallbackPacer()
     
     async def scan(self, targets: List[str]) -> Dict[str, Any]:
         results = {"active_hosts": [], "module": self.name}
         
-        for target in targets:
-            if await self.ping_host(target):
+        # Хосты пингуются параллельно, темп задает регулятор нагрузки
+        alive = await asyncio.gather(*(self.ping_limited(target) for target in targets))
+        
+        for target, is_alive in zip(targets, alive):
+            if is_alive:
                 results["active_hosts"].append({
                     "ip": target,
                     "hostname": target,
                     "status": "active"
                 })
-            await asyncio.sleep(1 / self.rate_limit)
         
         return results
     
+    async def ping_limited(self, host: str) -> bool:
+        async with self.rate_slot(host):
+            return await self.ping_host(host)
+    
+    def rate_slot(self, host: str):
+        """Слот запроса к хосту с учетом ограничения скорости"""
+        return governed_slot(self.rate_governor, self.name, host, self._fallback_pacer.slot(self.rate_limit))
+    
     async def ping_host(self, host: str) -> bool:
         try:
             process = await asyncio.create_subprocess_exec(
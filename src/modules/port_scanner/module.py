@@ -1,14 +1,68 @@
 import asyncio
+import ipaddress
 import socket
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Tuple
 import logging
 
+from core.rate_limiter import governed_slot
+from .planner import ScanPlanner
+from .rtt import RTTTable
+
 class PortScanner:
     """
     Модуль сканирования портов для RapidRecon
     Поддерживает асинхронное сканирование с ограничением скорости
+    
+    Для портов вне COMMON_SERVICES соединение проверки не закрывается сразу:
+    баннер читается в том же соединении отдельной задачей, уже после
+    освобождения слота регулятора, слота хоста в планировщике и воркера,
+    поэтому чтение баннеров идет параллельно со следующими проверками.
+    
+    Проверки идут скользящим окном: max_port_workers воркеров держат в
+    полете столько же проверок и сразу берут следующую, как только
+    завершилась предыдущая, поэтому порт с таймаутом не задерживает
+    остальные. Пары (хост, порт) всех целей берутся из ScanPlanner и
+    чередуются по кругу, а число одновременных проверок одного хоста
+    ограничено max_host_concurrency. Прогресс по хостам ведется отдельно для
+    каждого вызова scan_hosts, доступен через get_progress() и передается в
+    progress_callback.
+    
+    При adaptive_timeout таймаут соединения свой у каждого хоста: он
+    выводится из RTT, замеренного по ответам хоста (RTTTable), в пределах
+    [min_timeout, max_timeout]; timeout из конфигурации действует до первых
+    замеров. Имена хостов разрешаются один раз до начала проверок, и все
+    соединения идут на адрес, поэтому замер RTT не включает DNS.
+    
+    Доступность хоста сначала ищется в общем кэше движка (liveness), куда
+    попадают хосты, найденные ping_scanner; неизвестный хост проверяется
+    параллельно на портах alive_ports.
     """
     
+    COMMON_SERVICES = {
+        21: {"service": "ftp", "confidence": 0.9},
+        22: {"service": "ssh", "confidence": 0.95},
+        23: {"service": "telnet", "confidence": 0.9},
+        25: {"service": "smtp", "confidence": 0.9},
+        53: {"service": "dns", "confidence": 0.8},
+        80: {"service": "http", "confidence": 0.95},
+        110: {"service": "pop3", "confidence": 0.9},
+        143: {"service": "imap", "confidence": 0.9},
+        443: {"service": "https", "confidence": 0.95},
+        993: {"service": "imaps", "confidence": 0.9},
+        995: {"service": "pop3s", "confidence": 0.9},
+        3306: {"service": "mysql", "confidence": 0.8},
+        5432: {"service": "postgresql", "confidence": 0.8},
+        8080: {"service": "http-proxy", "confidence": 0.7},
+        8443: {"service": "https-alt", "confidence": 0.7},
+        27017: {"service": "mongodb", "confidence": 0.8}
+    }
+    BANNER_SIZE = 1024
+    # Порты проверки доступности хоста: хост жив, если ответил на любом
+    # (соединение установлено или отклонено)
+    ALIVE_PORTS = [80, 443, 22, 8080, 8443, 445, 3389, 25]
+    # Минимальный интервал между отчетами о прогрессе одного хоста
+    PROGRESS_INTERVAL = 0.5
+    
     def __init__(self, rate_limit: int = 10, config: Dict = None):
         self.rate_limit = rate_limit
         self.config = config or {}
@@ -20,6 +74,30 @@ class PortScanner:
         self.timeout = self.config.get("timeout", 1.0)
         self.max_ports_per_scan = self.config.get("max_ports_per_scan", 1000)
         self.scan_method = self.config.get("scan_method", "connect")  # connect или syn (заглушка)
+        self.banner_grab = self.config.get("banner_grab", True)
+        self.banner_timeout = self.config.get("banner_timeout", 1.0)
+        self.max_port_workers = self.config.get("max_port_workers", 50)
+        self.max_host_concurrency = self.config.get("max_host_concurrency", 10)
+        self.randomize_ports = self.config.get("randomize_ports", False)
+        self.adaptive_timeout = self.config.get("adaptive_timeout", True)
+        self.rtt = RTTTable(
+            initial_timeout=self.timeout,
+            min_timeout=self.config.get("min_timeout", 0.1),
+            max_timeout=self.config.get("max_timeout", 5.0),
+            multiplier=self.config.get("rtt_multiplier", 2.0)
+        )
+        self.alive_ports = self.config.get("alive_ports", self.ALIVE_PORTS)
+        
+        # Общий RateGovernor назначается движком; без него - локальный лимит параллельных проверок
+        self.rate_governor = None
+        self._fallback_semaphore = asyncio.Semaphore(self.rate_limit * 10)
+        # Общий кэш доступности хостов назначается движком
+        self.liveness = None
+        
+        # Прогресс выполняющихся вызовов scan_hosts: хост -> проверено/всего/открыто.
+        # Завершенные хосты удаляются после итогового отчета; callback(host, progress)
+        self._active_progress: List[Dict[str, Dict[str, Any]]] = []
+        self.progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
         
         self.logger.info(f"Инициализирован PortScanner с {len(self.common_ports)} портами, timeout={self.timeout}s")
     
@@ -68,9 +146,10 @@ class PortScanner:
         }
         
         try:
-            for target in targets:
-                self.logger.info(f"Сканирование портов для {target}")
-                open_ports = await self.scan_ports(target)
+            # Порты всех хостов проверяются вперемешку общим пулом воркеров
+            scanned = await self.scan_hosts(targets)
+            
+            for target, open_ports in scanned.items():
                 results["open_ports"][target] = open_ports
                 
                 # Логируем результаты
@@ -79,10 +158,6 @@ class PortScanner:
                     self.logger.info(f"Найдено открытых портов на {target}: {port_list}")
                 else:
                     self.logger.info(f"Открытых портов не найдено на {target}")
-                
-                # Ограничение скорости сканирования
-                if len(targets) > 1:
-                    await asyncio.sleep(1 / self.rate_limit)
         
         except Exception as e:
             self.logger.error(f"Ошибка при сканировании портов: {e}")
@@ -91,62 +166,294 @@ class PortScanner:
         self.logger.info("Сканирование портов завершено")
         return results
     
-    async def scan_ports(self, host: str) -> List[Dict]:
+    async def scan_stream(self, targets: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Потоковое сканирование портов: открытые порты выдаются по мере обнаружения
+        
+        Args:
+            targets: Список IP-адресов или хостов для сканирования
+            
+        Yields:
+            Dict в формате scan() с портами, найденными с момента прошлой выдачи
+        """
+        self.logger.info(f"Начато потоковое сканирование портов для {len(targets)} целей")
+        found: asyncio.Queue = asyncio.Queue()
+        
+        async def scan_all():
+            try:
+                await self.scan_hosts(targets, on_open=lambda host, port_info: found.put_nowait((host, port_info)))
+            except Exception as e:
+                self.logger.error(f"Ошибка при сканировании портов: {e}")
+            finally:
+                found.put_nowait(None)  # Маркер завершения сканирования
+        
+        runner = asyncio.create_task(scan_all())
+        finished = False
+        try:
+            while not finished:
+                # Выдаем все порты, накопившиеся к этому моменту, одной порцией
+                items = [await found.get()]
+                while not found.empty():
+                    items.append(found.get_nowait())
+                
+                open_ports: Dict[str, List[Dict]] = {}
+                for item in items:
+                    if item is None:
+                        finished = True
+                        continue
+                    host, port_info = item
+                    open_ports.setdefault(host, []).append(port_info)
+                
+                if open_ports:
+                    yield {"open_ports": open_ports, "module": self.name}
+        finally:
+            runner.cancel()
+        
+        self.logger.info("Потоковое сканирование портов завершено")
+    
+    async def scan_ports(self, host: str,
+                         on_open: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict]:
         """
         Сканирование портов на конкретном хосте
         
         Args:
             host: IP-адрес или хост для сканирования
+            on_open: Вызывается для каждого открытого порта сразу после обнаружения
             
         Returns:
             List с информацией об открытых портах
         """
-        open_ports = []
-        
-        # Проверяем доступность хоста перед сканированием
-        if not await self.is_host_alive(host):
-            self.logger.warning(f"Хост {host} недоступен, пропускаем сканирование портов")
-            return open_ports
-        
-        # Создаем задачи для асинхронного сканирования портов
-        tasks = []
-        for port in self.common_ports:
-            task = self.check_port(host, port)
-            tasks.append(task)
-        
-        # Запускаем все задачи параллельно с ограничением
-        semaphore = asyncio.Semaphore(self.rate_limit * 10)  # Увеличиваем лимит для параллельных проверок
-        
-        async def bounded_check(host, port):
-            async with semaphore:
-                return await self.check_port(host, port)
-        
-        # Выполняем проверки портов
-        port_results = []
-        for i in range(0, len(tasks), self.rate_limit * 5):
-            batch = tasks[i:i + self.rate_limit * 5]
-            batch_results = await asyncio.gather(*batch, return_exceptions=True)
-            port_results.extend(batch_results)
+        self.logger.info(f"Сканирование портов для {host}")
+        report = (lambda _host, port_info: on_open(port_info)) if on_open else None
+        scanned = await self.scan_hosts([host], on_open=report)
+        return scanned.get(host, [])
+    
+    async def scan_hosts(self, targets: List[str],
+                         on_open: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, List[Dict]]:
+        """
+        Сканирование портов нескольких хостов с чередованием
+        
+        Доступность хостов проверяется параллельно, затем окно из
+        max_port_workers воркеров берет пары (хост, порт) из ScanPlanner: у
+        каждого хоста в полете не больше max_host_concurrency проверок, а
+        порты разных хостов идут вперемешку, так что длинный список портов
+        одного хоста не задерживает остальные. Время сканирования
+        определяется пропускной способностью окна, а не числом таймаутов.
+        
+        Args:
+            targets: Список IP-адресов или хостов
+            on_open: Вызывается с (хост, информация о порте) для каждого открытого порта
             
-            # Задержка между батчами для соблюдения rate limit
-            if i + self.rate_limit * 5 < len(tasks):
-                await asyncio.sleep(0.1)
-        
-        # Обрабатываем результаты
-        for port, is_open in zip(self.common_ports, port_results):
-            if is_open and not isinstance(is_open, Exception):
-                service_info = await self.detect_service(host, port)
-                open_ports.append({
-                    "port": port,
-                    "protocol": "tcp",
-                    "status": "open",
-                    "service": service_info.get("service", "unknown"),
-                    "banner": service_info.get("banner", ""),
-                    "confidence": service_info.get("confidence", 0.0)
-                })
+        Returns:
+            Dict хост -> список открытых портов (по возрастанию номера)
+        """
+        hosts = list(dict.fromkeys(targets))
+        open_ports: Dict[str, List[Dict]] = {host: [] for host in hosts}
+        
+        # Имена разрешаются до окна проверок: соединения и замеры RTT идут по адресу
+        resolved = await asyncio.gather(*(self.resolve_host(host) for host in hosts))
+        addresses = {}
+        for host, address in zip(hosts, resolved):
+            if address is None:
+                self.logger.warning(f"Не удалось разрешить имя {host}, пропускаем сканирование портов")
+            else:
+                addresses[host] = address
+        
+        alive = await self.check_hosts_alive(list(addresses.values()))
+        live_hosts = []
+        for host, is_alive in zip(addresses, alive):
+            if is_alive:
+                live_hosts.append(host)
+            else:
+                self.logger.warning(f"Хост {host} недоступен, пропускаем сканирование портов")
+        
+        planner = ScanPlanner(live_hosts, self.common_ports,
+                              host_concurrency=self.max_host_concurrency,
+                              randomize=self.randomize_ports)
+        slot_freed = asyncio.Condition()
+        loop = asyncio.get_running_loop()
+        progress = {
+            host: {
+                "total": len(self.common_ports),
+                "checked": 0,
+                "open": 0,
+                "started": loop.time(),
+                "reported": 0.0
+            }
+            for host in live_hosts
+        }
+        
+        async def next_work() -> Optional[Tuple[str, int]]:
+            # Ждем, пока у какого-нибудь хоста освободится слот
+            async with slot_freed:
+                while True:
+                    work = planner.take()
+                    if work is not None or planner.exhausted:
+                        return work
+                    await slot_freed.wait()
+        
+        # Чтения баннеров из соединений открытых портов, идут вне окна проверок
+        banner_reads = set()
+        
+        async def report_open(host: str, port: int, connection):
+            port_info = await self.describe_port(port, connection)
+            open_ports[host].append(port_info)
+            if on_open:
+                on_open(host, port_info)
+            self.update_progress(progress, host, True)
+        
+        async def worker():
+            while True:
+                work = await next_work()
+                if work is None:
+                    return
+                host, port = work
+                try:
+                    is_open, connection = await self.probe_port(addresses[host], port)
+                finally:
+                    async with slot_freed:
+                        planner.release(host)
+                        slot_freed.notify_all()
+                if not is_open:
+                    self.update_progress(progress, host, False)
+                elif connection is None:
+                    await report_open(host, port, None)
+                else:
+                    read = asyncio.ensure_future(report_open(host, port, connection))
+                    banner_reads.add(read)
+                    read.add_done_callback(banner_reads.discard)
+                    if len(banner_reads) >= self.max_port_workers:
+                        # Открытых соединений не больше окна проверок
+                        await asyncio.wait(set(banner_reads), return_when=asyncio.FIRST_COMPLETED)
+        
+        if planner.total:
+            self.logger.info(
+                f"Сканирование {planner.total} портов на {len(live_hosts)} хостах, "
+                f"до {self.max_host_concurrency} проверок на хост"
+            )
+            self._active_progress.append(progress)
+            try:
+                await asyncio.gather(*(worker() for _ in range(max(1, min(self.max_port_workers, planner.total)))))
+                await asyncio.gather(*banner_reads)
+            finally:
+                for read in list(banner_reads):
+                    read.cancel()
+                self._active_progress.remove(progress)
         
+        for ports in open_ports.values():
+            ports.sort(key=lambda port_info: port_info["port"])
         return open_ports
     
+    @staticmethod
+    async def resolve_host(host: str) -> Optional[str]:
+        """IP-адрес хоста (адрес возвращается как есть) или None, если имя не разрешилось"""
+        try:
+            return str(ipaddress.ip_address(host))
+        except ValueError:
+            pass
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except (OSError, UnicodeError):
+            return None
+        return infos[0][4][0] if infos else None
+    
+    def update_progress(self, scan_progress: Dict[str, Dict[str, Any]], host: str, found_open: bool):
+        """
+        Учет завершенной проверки хоста и отчет о прогрессе (не чаще PROGRESS_INTERVAL)
+        
+        Args:
+            scan_progress: Прогресс вызова scan_hosts; хост удаляется из него после итогового отчета
+        """
+        progress = scan_progress[host]
+        progress["checked"] += 1
+        if found_open:
+            progress["open"] += 1
+        
+        now = asyncio.get_running_loop().time()
+        finished = progress["checked"] >= progress["total"]
+        if finished:
+            del scan_progress[host]
+            self.logger.info(
+                f"{host}: проверено {progress['checked']} портов, открыто {progress['open']}, "
+                f"{now - progress['started']:.1f}s"
+            )
+        if self.progress_callback is None:
+            return
+        if not finished and now - progress["reported"] < self.PROGRESS_INTERVAL:
+            return
+        progress["reported"] = now
+        try:
+            self.progress_callback(host, dict(progress))
+        except Exception as e:
+            self.logger.debug(f"Ошибка progress_callback для {host}: {e}")
+    
+    def get_progress(self) -> Dict[str, Dict[str, Any]]:
+        """Прогресс хостов, которые сканируются сейчас: total, checked, open (сумма по вызовам)"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for scan_progress in self._active_progress:
+            for host, progress in scan_progress.items():
+                totals = merged.setdefault(host, {"total": 0, "checked": 0, "open": 0})
+                for key in totals:
+                    totals[key] += progress[key]
+        return merged
+    
+    async def probe_port(self, host: str, port: int) -> Tuple[bool, Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]]:
+        """
+        Проверка порта; для чтения баннера соединение остается открытым
+        
+        Returns:
+            (открыт ли порт, (reader, writer) для баннера или None)
+        """
+        # Каждая проверка проходит через регулятор нагрузки (темп и лимит на хост)
+        keep_open = self.banner_grab and port not in self.COMMON_SERVICES
+        try:
+            return await self.bounded_probe(host, port, keep_open)
+        except Exception:
+            return False, None
+    
+    async def describe_port(self, port: int,
+                            connection: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None) -> Dict[str, Any]:
+        """
+        Информация об открытом порте
+        
+        Args:
+            connection: Соединение проверки - из него читается баннер, затем оно закрывается
+            
+        Returns:
+            Dict с портом, сервисом и баннером
+        """
+        banner = await self.read_banner(*connection) if connection else ""
+        service_info = self.identify_service(port, banner)
+        return {
+            "port": port,
+            "protocol": "tcp",
+            "status": "open",
+            "service": service_info.get("service", "unknown"),
+            "banner": service_info.get("banner", ""),
+            "confidence": service_info.get("confidence", 0.0)
+        }
+    
+    async def bounded_probe(self, host: str, port: int,
+                            keep_open: bool) -> Tuple[bool, Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]]:
+        """
+        Проверка порта в слоте ограничения скорости
+        
+        Args:
+            keep_open: Не закрывать соединение открытого порта (для чтения баннера)
+            
+        Returns:
+            (открыт ли порт, (reader, writer) открытого соединения или None)
+        """
+        async with self.rate_slot(host):
+            if not keep_open:
+                return await self.check_port(host, port), None
+            connection = await self.open_connection(host, port)
+            return connection is not None, connection
+    
+    def rate_slot(self, host: str):
+        """Слот запроса к хосту с учетом ограничения скорости"""
+        return governed_slot(self.rate_governor, self.name, host, self._fallback_semaphore)
+    
     async def check_port(self, host: str, port: int) -> bool:
         """
         Проверка открыт ли порт на хосте
@@ -171,38 +478,135 @@ class PortScanner:
     
     async def connect_scan(self, host: str, port: int) -> bool:
         """TCP Connect сканирование"""
+        connection = await self.open_connection(host, port)
+        if connection is None:
+            return False
+        await self.close_connection(connection[1])
+        return True
+    
+    async def open_connection(self, host: str, port: int) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        """TCP-соединение с портом или None, если порт закрыт/недоступен"""
+        connection, _ = await self._connect(host, port)
+        return connection
+    
+    async def port_responds(self, host: str, port: int) -> bool:
+        """Хост ответил на порту: соединение установлено или отклонено (RST)"""
+        connection, responded = await self._connect(host, port)
+        if connection is not None:
+            await self.close_connection(connection[1])
+        return responded
+    
+    async def _connect(self, host: str, port: int) -> Tuple[Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]], bool]:
+        """
+        Попытка TCP-соединения с замером RTT
+        
+        Замер точен, когда host - уже разрешенный адрес (так вызывает scan_hosts).
+        
+        Returns:
+            (reader, writer) или None, и признак ответа хоста (соединение или отказ)
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         try:
-            reader, writer = await asyncio.wait_for(
+            connection = await asyncio.wait_for(
                 asyncio.open_connection(host, port),
-                timeout=self.timeout
+                timeout=self.connect_timeout(host)
             )
-            writer.close()
-            await writer.wait_closed()
-            return True
-        except (asyncio.TimeoutError, ConnectionRefusedError, OSError):
-            return False
+        except ConnectionRefusedError:
+            # RST пришел через один RTT - это тоже замер
+            self.rtt.observe(host, loop.time() - started)
+            return None, True
+        except (asyncio.TimeoutError, OSError):
+            return None, False
         except Exception as e:
             self.logger.debug(f"Неожиданная ошибка при connect сканировании {host}:{port}: {e}")
-            return False
+            return None, False
+        self.rtt.observe(host, loop.time() - started)
+        return connection, True
+    
+    def connect_timeout(self, host: str) -> float:
+        """Таймаут соединения с хостом: по его RTT или фиксированный timeout"""
+        if not self.adaptive_timeout:
+            return self.timeout
+        return self.rtt.timeout(host)
+    
+    @staticmethod
+    async def close_connection(writer: asyncio.StreamWriter):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+    
+    async def read_banner(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> str:
+        """Чтение баннера из открытого соединения (окно banner_timeout), соединение закрывается"""
+        try:
+            banner = await asyncio.wait_for(reader.read(self.BANNER_SIZE), timeout=self.banner_timeout)
+            return banner.decode('utf-8', errors='ignore').strip()
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            return ""
+        finally:
+            await self.close_connection(writer)
     
     async def is_host_alive(self, host: str) -> bool:
         """
         Проверка доступности хоста
         
+        Сначала используется общий кэш доступности, затем параллельная
+        проверка портов alive_ports: ответ на любом порту, в том числе отказ
+        в соединении, означает, что хост доступен.
+        
         Args:
             host: IP-адрес или хост для проверки
             
         Returns:
             True если хост доступен
         """
+        if self.liveness is not None:
+            known = self.liveness.get(host)
+            if known is not None:
+                return known
+        
+        probes = [asyncio.ensure_future(self.liveness_probe(host, port)) for port in self.alive_ports]
+        alive = False
         try:
-            # Пытаемся подключиться к порту 80 или 443 для проверки доступности
-            for port in [80, 443, 22]:
-                if await self.connect_scan(host, port):
-                    return True
-            return False
-        except:
-            return False
+            for probe in asyncio.as_completed(probes):
+                if await probe:
+                    alive = True
+                    break
+        except Exception:
+            alive = False
+        finally:
+            for probe in probes:
+                probe.cancel()
+        
+        if self.liveness is not None:
+            self.liveness.mark(host, alive, source=self.name)
+        return alive
+    
+    async def check_hosts_alive(self, hosts: List[str]) -> List[bool]:
+        """
+        Доступность списка хостов в окне max_port_workers соединений
+        
+        Каждый хост проверяется параллельно на всех alive_ports, поэтому
+        одновременно проверяется max_port_workers // len(alive_ports) хостов:
+        пачка из сотен целей не превращается в тысячи соединений разом.
+        """
+        alive = [False] * len(hosts)
+        pending = iter(enumerate(hosts))
+        
+        async def worker():
+            for index, host in pending:
+                alive[index] = await self.is_host_alive(host)
+        
+        window = max(1, self.max_port_workers // max(1, len(self.alive_ports)))
+        await asyncio.gather(*(worker() for _ in range(min(window, len(hosts)))))
+        return alive
+    
+    async def liveness_probe(self, host: str, port: int) -> bool:
+        """Проверка доступности на одном порту в слоте регулятора нагрузки"""
+        async with self.rate_slot(host):
+            return await self.port_responds(host, port)
     
     async def detect_service(self, host: str, port: int) -> Dict[str, Any]:
         """
@@ -215,43 +619,26 @@ class PortScanner:
         Returns:
             Dict с информацией о сервисе
         """
-        common_services = {
-            21: {"service": "ftp", "confidence": 0.9},
-            22: {"service": "ssh", "confidence": 0.95},
-            23: {"service": "telnet", "confidence": 0.9},
-            25: {"service": "smtp", "confidence": 0.9},
-            53: {"service": "dns", "confidence": 0.8},
-            80: {"service": "http", "confidence": 0.95},
-            110: {"service": "pop3", "confidence": 0.9},
-            143: {"service": "imap", "confidence": 0.9},
-            443: {"service": "https", "confidence": 0.95},
-            993: {"service": "imaps", "confidence": 0.9},
-            995: {"service": "pop3s", "confidence": 0.9},
-            3306: {"service": "mysql", "confidence": 0.8},
-            5432: {"service": "postgresql", "confidence": 0.8},
-            8080: {"service": "http-proxy", "confidence": 0.7},
-            8443: {"service": "https-alt", "confidence": 0.7},
-            27017: {"service": "mongodb", "confidence": 0.8}
-        }
-        
         # Возвращаем известный сервис или пытаемся получить баннер
-        if port in common_services:
-            return common_services[port]
-        
-        # Пытаемся получить баннер для неизвестных портов
-        banner = await self.get_banner(host, port)
+        if port in self.COMMON_SERVICES:
+            return self.COMMON_SERVICES[port]
+        return self.identify_service(port, await self.get_banner(host, port))
+    
+    def identify_service(self, port: int, banner: str = "") -> Dict[str, Any]:
+        """Сервис по номеру порта и уже полученному баннеру"""
+        if port in self.COMMON_SERVICES:
+            return self.COMMON_SERVICES[port]
         if banner:
             return {
                 "service": "unknown",
                 "banner": banner,
                 "confidence": 0.5
             }
-        
         return {"service": "unknown", "confidence": 0.1}
     
     async def get_banner(self, host: str, port: int) -> str:
         """
-        Попытка получения баннера с сервиса
+        Попытка получения баннера с сервиса (отдельным соединением)
         
         Args:
             host: IP-адрес или хост
@@ -260,26 +647,10 @@ class PortScanner:
         Returns:
             Баннер сервиса или пустая строка
         """
-        try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(host, port),
-                timeout=2.0
-            )
-            
-            # Ждем данные от сервиса
-            try:
-                banner = await asyncio.wait_for(reader.read(1024), timeout=1.0)
-                banner_text = banner.decode('utf-8', errors='ignore').strip()
-                writer.close()
-                await writer.wait_closed()
-                return banner_text
-            except:
-                writer.close()
-                await writer.wait_closed()
-                return ""
-                
-        except:
+        connection = await self.open_connection(host, port)
+        if connection is None:
             return ""
+        return await self.read_banner(*connection)
     
     def update_config(self, new_config: Dict[str, Any]):
         """
@@ -292,6 +663,18 @@ class PortScanner:
         self.common_ports = self.get_ports_from_config()
         self.timeout = self.config.get("timeout", self.timeout)
         self.rate_limit = self.config.get("rate_limit", self.rate_limit)
+        self.banner_grab = self.config.get("banner_grab", self.banner_grab)
+        self.banner_timeout = self.config.get("banner_timeout", self.banner_timeout)
+        self.max_port_workers = self.config.get("max_port_workers", self.max_port_workers)
+        self.max_host_concurrency = self.config.get("max_host_concurrency", self.max_host_concurrency)
+        self.randomize_ports = self.config.get("randomize_ports", self.randomize_ports)
+        self.adaptive_timeout = self.config.get("adaptive_timeout", self.adaptive_timeout)
+        self.rtt.initial_timeout = self.timeout
+        self.rtt.min_timeout = self.config.get("min_timeout", self.rtt.min_timeout)
+        self.rtt.max_timeout = self.config.get("max_timeout", self.rtt.max_timeout)
+        self.rtt.multiplier = self.config.get("rtt_multiplier", self.rtt.multiplier)
+        self.alive_ports = self.config.get("alive_ports", self.alive_ports)
+        self._fallback_semaphore = asyncio.Semaphore(self.rate_limit * 10)
         
         self.logger.info(f"Конфигурация PortScanner обновлена: {len(self.common_ports)} портов")
 
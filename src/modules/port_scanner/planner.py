@@ -0,0 +1,79 @@
+"""
+Планировщик сканирования портов - чередование хостов и лимит на хост
+"""
+import random
+from collections import deque, OrderedDict
+from typing import List, Dict, Optional, Tuple, Deque
+
+
+class ScanPlanner:
+    """
+    Набор работ (хост, порт) по всем целям с чередованием хостов
+
+    Хосты стоят в кольце: take() выдает порт следующего по кругу хоста, у
+    которого есть непроверенные порты и свободен слот (в полете меньше
+    host_concurrency проверок), и переносит хост в конец кольца. Поэтому
+    1000 портов одного хоста не занимают все воркеры, пока остальные хосты
+    простаивают, а нагрузка на каждый хост ограничена.
+
+    При randomize порядок портов у каждого хоста - случайная перестановка,
+    а начальный порядок хостов перемешан.
+    """
+
+    def __init__(self, hosts: List[str], ports: List[int], host_concurrency: int = 10,
+                 randomize: bool = False, seed: Optional[int] = None):
+        self.host_concurrency = max(1, host_concurrency)
+        rng = random.Random(seed)
+
+        hosts = list(dict.fromkeys(hosts))
+        if randomize:
+            rng.shuffle(hosts)
+
+        self._pending: 'OrderedDict[str, Deque[int]]' = OrderedDict()
+        for host in hosts:
+            host_ports = list(ports)
+            if randomize:
+                rng.shuffle(host_ports)
+            self._pending[host] = deque(host_ports)
+
+        self._in_flight: Dict[str, int] = {host: 0 for host in hosts}
+        self.total = len(hosts) * len(ports)
+        self.issued = 0
+        self.completed = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """Все порты выданы"""
+        return not self._pending
+
+    @property
+    def finished(self) -> bool:
+        """Все выданные проверки завершены и выдавать больше нечего"""
+        return not self._pending and self.completed == self.issued
+
+    def take(self) -> Optional[Tuple[str, int]]:
+        """
+        Следующая работа
+
+        Returns:
+            (хост, порт) или None, если у всех хостов с портами заняты слоты
+        """
+        for host, ports in self._pending.items():
+            if self._in_flight[host] < self.host_concurrency:
+                break
+        else:
+            return None
+
+        port = ports.popleft()
+        if ports:
+            self._pending.move_to_end(host)
+        else:
+            del self._pending[host]
+        self._in_flight[host] += 1
+        self.issued += 1
+        return host, port
+
+    def release(self, host: str):
+        """Проверка хоста завершена - слот свободен"""
+        self._in_flight[host] -= 1
+        self.completed += 1
@@ -0,0 +1,89 @@
+"""
+Оценка RTT хостов и адаптивные таймауты проверок (как RTO в TCP, RFC 6298)
+"""
+from typing import Dict, Optional
+
+
+class HostRTT:
+    """
+    Сглаженное RTT одного хоста
+
+    Первый замер R: SRTT = R, RTTVAR = R / 2. Последующие:
+    RTTVAR = (1 - BETA) * RTTVAR + BETA * |SRTT - R|,
+    SRTT = (1 - ALPHA) * SRTT + ALPHA * R.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+
+    __slots__ = ('srtt', 'rttvar', 'samples')
+
+    def __init__(self):
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.samples = 0
+
+    def observe(self, rtt: float):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.samples += 1
+
+
+class RTTTable:
+    """
+    Адаптивные таймауты соединений по хостам
+
+    Замеры дают только соединения, на которые хост ответил: установленное
+    соединение (SYN/ACK) и отказ (RST) - оба занимают один RTT. Таймауты
+    замеров не дают: на фильтруемых портах они ожидаемы и ничего не говорят
+    о задержке до хоста.
+
+    Таймаут хоста - SRTT + K * RTTVAR, умноженный на запас multiplier и
+    ограниченный [min_timeout, max_timeout]: для близких хостов он короче
+    начального, для далеких - длиннее. Пока у хоста нет замеров,
+    используется initial_timeout.
+    """
+
+    K = 4
+
+    def __init__(self, initial_timeout: float = 1.0, min_timeout: float = 0.1,
+                 max_timeout: float = 5.0, multiplier: float = 2.0):
+        self.initial_timeout = initial_timeout
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self.hosts: Dict[str, HostRTT] = {}
+
+    def observe(self, host: str, rtt: float):
+        """Замер RTT по ответу хоста"""
+        estimate = self.hosts.get(host)
+        if estimate is None:
+            estimate = self.hosts[host] = HostRTT()
+        estimate.observe(max(rtt, 0.0))
+
+    def timeout(self, host: str) -> float:
+        """Текущий таймаут соединения с хостом"""
+        estimate = self.hosts.get(host)
+        if estimate is None or estimate.srtt is None:
+            return self.initial_timeout
+        rto = (estimate.srtt + self.K * estimate.rttvar) * self.multiplier
+        return min(max(rto, self.min_timeout), self.max_timeout)
+
+    def clear(self):
+        self.hosts.clear()
+
+    def get_statistics(self) -> Dict[str, Dict[str, float]]:
+        """SRTT, RTTVAR и таймаут по хостам (в секундах)"""
+        return {
+            host: {
+                'srtt': round(estimate.srtt, 4),
+                'rttvar': round(estimate.rttvar, 4),
+                'timeout': round(self.timeout(host), 4),
+                'samples': estimate.samples
+            }
+            for host, estimate in self.hosts.items() if estimate.srtt is not None
+        }
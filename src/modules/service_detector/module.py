@@ -1,5 +1,6 @@
 import asyncio
 from typing import Dict, Any, List
+from core.rate_limiter import FallbackPacer, governed_slot
 
 class ServiceDetector:
     def __init__(self, rate_limit: int = 5):
@@ -13,23 +14,37 @@ class ServiceDetector:
             53: "dns",
             25: "smtp"
         }
+        self.rate_governor = None  # Общий RateGovernor, назначается движком
+        self._fallback_pacer = FallbackPacer()
     
     async def scan(self, open_ports_data: Dict[str, Any]) -> Dict[str, Any]:
         results = {"services": {}, "module": self.name}
         
+        probes = []
         for host, ports in open_ports_data.items():
             results["services"][host] = []
             for port_info in ports:
-                service = await self.detect_service(host, port_info["port"])
-                results["services"][host].append({
-                    **port_info,
-                    "service": service,
-                    "banner": await self.get_banner(host, port_info["port"])
-                })
-            await asyncio.sleep(1 / self.rate_limit)
+                probes.append((host, port_info))
+        
+        # Порты всех хостов проверяются параллельно, темп задает регулятор нагрузки
+        detected = await asyncio.gather(*(self.detect_limited(host, port_info) for host, port_info in probes))
+        for (host, _), service_info in zip(probes, detected):
+            results["services"][host].append(service_info)
         
         return results
     
+    async def detect_limited(self, host: str, port_info: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.rate_slot(host):
+            return {
+                **port_info,
+                "service": await self.detect_service(host, port_info["port"]),
+                "banner": await self.get_banner(host, port_info["port"])
+            }
+    
+    def rate_slot(self, host: str):
+        """Слот запроса к хосту с учетом ограничения скорости"""
+        return governed_slot(self.rate_governor, self.name, host, self._fallback_pacer.slot(self.rate_limit))
+    
     async def detect_service(self, host: str, port: int) -> str:
         return self.service_signatures.get(port, "unknown")
     
@@ -1,39 +1,259 @@
 import asyncio
-from typing import List, Dict, Any
+import random
+import string
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+import logging
+
+from core.rate_limiter import FallbackPacer, governed_slot
+from .resolver import DNSResolver, DNSCache, DNSAnswer
 
 class SubdomainScanner:
+    """
+    Поиск поддоменов перебором через неблокирующий резолвер
+    
+    Зоны с wildcard DNS распознаются пробными запросами случайных имен:
+    ответы, совпадающие с отпечатком wildcard (адреса и CNAME), не считаются
+    найденными поддоменами. Ответы резолвера кэшируются с учетом TTL, кэш
+    общий для всех целей.
+    """
+    
+    WILDCARD_PROBES = 3
+    WILDCARD_LABEL_LENGTH = 16
+    # Дополнительные пробы на один неизвестный ответ и всего на зону
+    # (wildcard, отдающий адреса из пула)
+    WILDCARD_EXTRA_PROBES = 4
+    WILDCARD_MAX_EXTRA_PROBES = 64
+    # Пока wildcard не удалось проверить (таймауты), повторная проверка через
+    WILDCARD_RETRY_TTL = 30
+    
     def __init__(self, rate_limit: int = 5):
         self.rate_limit = rate_limit
         self.name = "subdomain_scanner"
+        self.logger = logging.getLogger('SubdomainScanner')
         self.common_subdomains = ["www", "api", "dev", "test", "admin", "mail", "ftp"]
+        self.rate_governor = None  # Общий RateGovernor, назначается движком
+        self._fallback_pacer = FallbackPacer(hold=False)
+        
+        # Неблокирующий резолвер: сотни запросов в полете через UDP-сокеты
+        self.config: Dict[str, Any] = {}
+        self.use_brute_force = False
+        self.wordlist_path = None
+        self.max_in_flight = 500
+        self.cache = DNSCache()
+        self.resolver = DNSResolver(cache=self.cache)
+        
+        # Зона -> (истекает, отпечаток wildcard или None)
+        self.wildcard_probes = self.WILDCARD_PROBES
+        self.wildcards: Dict[str, Tuple[float, Optional[Set[str]]]] = {}
+        self._wildcard_locks: Dict[str, asyncio.Lock] = {}
+        self._extra_probes: Dict[str, int] = {}
+        self.stats = {'wildcard_filtered': 0, 'wildcard_zones': 0}
+    
+    def update_config(self, new_config: Dict[str, Any]):
+        """
+        Обновление конфигурации сканера
+        
+        Args:
+            new_config: Новая конфигурация (dns_servers, dns_timeout, dns_retries,
+                max_in_flight, wordlist, use_brute_force, rate_limit, cache_size,
+                negative_ttl, wildcard_probes)
+        """
+        self.config.update(new_config)
+        self.rate_limit = self.config.get("rate_limit", self.rate_limit)
+        self.use_brute_force = self.config.get("use_brute_force", self.use_brute_force)
+        self.wordlist_path = self.config.get("wordlist", self.wordlist_path)
+        self.max_in_flight = self.config.get("max_in_flight", self.max_in_flight)
+        
+        if self.config.get("dns_servers"):
+            self.set_dns_servers(self.config["dns_servers"])
+        self.resolver.set_limits(
+            timeout=self.config.get("dns_timeout"),
+            retries=self.config.get("dns_retries"),
+            max_in_flight=self.max_in_flight
+        )
+        self.cache.max_entries = self.config.get("cache_size", self.cache.max_entries)
+        self.cache.negative_ttl = self.config.get("negative_ttl", self.cache.negative_ttl)
+        self.wildcard_probes = self.config.get("wildcard_probes", self.wildcard_probes)
+    
+    def set_dns_servers(self, servers: Any) -> bool:
+        """
+        Список DNS-серверов: список или строка "8.8.8.8,1.1.1.1" (как в GUI)
+        
+        Returns:
+            False, если список отклонен (пуст или есть некорректный адрес)
+        """
+        if isinstance(servers, str):
+            servers = servers.split(",")
+        try:
+            self.resolver.set_nameservers([server.strip() for server in servers])
+        except ValueError as e:
+            self.logger.error(f"Некорректный список DNS-серверов {servers}: {e}")
+            return False
+        return True
     
     async def scan(self, targets: List[str]) -> Dict[str, Any]:
         results = {"subdomains": [], "module": self.name}
         
-        for target in targets:
-            if "." in target:  # Это домен
-                found_subs = await self.find_subdomains(target)
-                results["subdomains"].extend(found_subs)
-            await asyncio.sleep(1 / self.rate_limit)
+        domains = [target for target in targets if "." in target]  # Только домены
+        found_per_domain = await asyncio.gather(*(self.find_subdomains(domain) for domain in domains))
+        for found_subs in found_per_domain:
+            results["subdomains"].extend(found_subs)
         
         return results
     
+    def get_wordlist(self) -> List[str]:
+        """Слова для перебора: wordlist из конфигурации при use_brute_force, иначе common_subdomains"""
+        if not self.use_brute_force or not self.wordlist_path:
+            return self.common_subdomains
+        
+        path = Path(self.wordlist_path)
+        if not path.exists():
+            self.logger.warning(f"Wordlist не найден: {path}, используются стандартные поддомены")
+            return self.common_subdomains
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            words = (line.strip().lower() for line in f)
+            return list(dict.fromkeys(word for word in words if word and not word.startswith('#')))
+    
     async def find_subdomains(self, domain: str) -> List[Dict]:
+        """
+        Перебор поддоменов пулом из max_in_flight воркеров
+        
+        Кандидаты берутся из общего итератора по мере освобождения воркеров,
+        поэтому словарь на 100k слов не превращается в 100k задач.
+        """
+        words = self.get_wordlist()
+        candidates = iter([f"{sub}.{domain}" for sub in words])
+        wildcard = await self.get_wildcard(domain)
+        
         found = []
-        for sub in self.common_subdomains:
-            subdomain = f"{sub}.{domain}"
-            if await self.check_subdomain(subdomain):
-                found.append({
+        async def worker():
+            for subdomain in candidates:
+                answer = await self.check_limited(subdomain)
+                if answer is None or not answer.exists:
+                    continue
+                if wildcard is not None and await self.matches_wildcard(answer, domain, wildcard):
+                    self.stats['wildcard_filtered'] += 1
+                    continue
+                found.append(({
                     "subdomain": subdomain,
                     "type": "subdomain",
-                    "source": domain
-                })
+                    "source": domain,
+                    "addresses": answer.addresses
+                }, set(answer.addresses) | set(answer.cnames)))
+        
+        await asyncio.gather(*(worker() for _ in range(max(1, min(self.max_in_flight, len(words))))))
+        if wildcard is not None:
+            # Отпечаток мог пополниться после того, как ответ был принят
+            kept = [item for item in found if not item[1] <= wildcard]
+            self.stats['wildcard_filtered'] += len(found) - len(kept)
+            found = kept
+        found = [item for item, _ in found]
+        self.logger.info(
+            f"{domain}: проверено {len(words)} кандидатов, найдено {len(found)}"
+            + (" (wildcard-зона)" if wildcard is not None else "")
+        )
         return found
     
+    async def check_limited(self, subdomain: str) -> Optional[DNSAnswer]:
+        # Ответ из кэша не расходует лимит запросов
+        cached = self.resolver.cached(subdomain)
+        if cached is not None:
+            return cached
+        async with self.rate_slot():
+            return await self.resolve_subdomain(subdomain)
+    
+    async def get_wildcard(self, zone: str) -> Optional[Set[str]]:
+        """
+        Отпечаток wildcard DNS зоны
+        
+        Разрешаются WILDCARD_PROBES случайных имен вида <случайная метка>.zone;
+        если хоть одно разрешилось - зона wildcard, а объединение адресов и
+        CNAME ответов становится ее отпечатком. Результат хранится до
+        истечения TTL ответов.
+        
+        Returns:
+            Множество адресов/CNAME wildcard или None, если wildcard нет
+        """
+        entry = self.wildcards.get(zone)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        lock = self._wildcard_locks.setdefault(zone, asyncio.Lock())
+        async with lock:
+            entry = self.wildcards.get(zone)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            
+            answers = await asyncio.gather(*(self._probe_wildcard(zone) for _ in range(self.wildcard_probes)))
+            resolved = [answer for answer in answers if answer.exists]
+            if resolved:
+                fingerprint = set()
+                for answer in resolved:
+                    fingerprint.update(answer.addresses)
+                    fingerprint.update(answer.cnames)
+                ttl = min(answer.ttl or self.cache.min_ttl for answer in resolved)
+                if entry is None or entry[1] is None:
+                    self.stats['wildcard_zones'] += 1
+                    self.logger.info(f"Зона {zone} отвечает на любые имена (wildcard): {sorted(fingerprint)}")
+            else:
+                fingerprint = None
+                if all(answer.rcode == DNSResolver.RCODE_TIMEOUT for answer in answers):
+                    ttl = self.WILDCARD_RETRY_TTL
+                else:
+                    ttl = max((answer.ttl or self.cache.negative_ttl for answer in answers))
+            
+            ttl = min(max(ttl, self.cache.min_ttl), self.cache.max_ttl)
+            self.wildcards[zone] = (time.monotonic() + ttl, fingerprint)
+            return fingerprint
+    
+    async def matches_wildcard(self, answer: DNSAnswer, zone: str, fingerprint: Set[str]) -> bool:
+        """
+        Ответ совпадает с отпечатком wildcard
+        
+        Wildcard может отдавать адреса из пула, поэтому ответ вне отпечатка
+        проверяется еще несколькими пробами: их ответы дополняют отпечаток.
+        Число таких проб на зону ограничено, чтобы зона с множеством
+        настоящих поддоменов не удваивала число запросов.
+        """
+        values = set(answer.addresses) | set(answer.cnames)
+        for _ in range(self.WILDCARD_EXTRA_PROBES):
+            if values <= fingerprint:
+                return True
+            if self._extra_probes.get(zone, 0) >= self.WILDCARD_MAX_EXTRA_PROBES:
+                break
+            self._extra_probes[zone] = self._extra_probes.get(zone, 0) + 1
+            probe = await self._probe_wildcard(zone)
+            fingerprint.update(probe.addresses)
+            fingerprint.update(probe.cnames)
+        return values <= fingerprint
+    
+    async def _probe_wildcard(self, zone: str) -> DNSAnswer:
+        label = ''.join(random.choices(string.ascii_lowercase + string.digits, k=self.WILDCARD_LABEL_LENGTH))
+        async with self.rate_slot():
+            return await self.resolver.resolve(f"{label}.{zone}", use_cache=False)
+    
+    def rate_slot(self):
+        """
+        Слот DNS-запроса с учетом ограничения скорости
+        
+        Запросы уходят к DNS-серверам, а не к цели, поэтому учитываются только
+        глобальный лимит и лимит модуля: лимит одновременных запросов к хосту
+        ограничил бы зону десятками запросов в полете вместо max_in_flight.
+        """
+        return governed_slot(self.rate_governor, self.name, None, self._fallback_pacer.slot(self.rate_limit))
+    
+    async def resolve_subdomain(self, subdomain: str) -> Optional[DNSAnswer]:
+        """Ответ резолвера для поддомена (None для некорректного имени)"""
+        try:
+            return await self.resolver.resolve(subdomain)
+        except ValueError:
+            return None  # Пустая или слишком длинная метка
+    
     async def check_subdomain(self, subdomain: str) -> bool:
         try:
-            import socket
-            socket.gethostbyname(subdomain)
-            return True
-        except:
+            answer = await self.resolve_subdomain(subdomain)
+            return answer is not None and answer.exists
+        except Exception:
             return False
@@ -0,0 +1,496 @@
+"""
+Асинхронный DNS-резолвер RapidRecon - запросы по UDP без блокировки event loop
+"""
+import asyncio
+import ipaddress
+import random
+import socket
+import struct
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+
+
+class DNSError(Exception):
+    """Ошибка разбора DNS-ответа"""
+
+
+class DNSAnswer:
+    """
+    Результат разрешения имени
+
+    rcode - код ответа сервера (0 - NOERROR, 3 - NXDOMAIN) или
+    DNSResolver.RCODE_TIMEOUT, если ни один сервер не ответил.
+    """
+
+    __slots__ = ('name', 'rcode', 'addresses', 'cnames', 'ttl', 'nameserver')
+
+    def __init__(self, name: str, rcode: int, addresses: List[str] = None,
+                 cnames: List[str] = None, ttl: Optional[int] = None, nameserver: str = None):
+        self.name = name
+        self.rcode = rcode
+        self.addresses = addresses or []
+        self.cnames = cnames or []
+        self.ttl = ttl
+        self.nameserver = nameserver
+
+    @property
+    def exists(self) -> bool:
+        """Имя разрешилось в адреса"""
+        return bool(self.addresses)
+
+    @property
+    def nxdomain(self) -> bool:
+        return self.rcode == DNSResolver.RCODE_NXDOMAIN
+
+    def __repr__(self) -> str:
+        return f"DNSAnswer({self.name!r}, rcode={self.rcode}, addresses={self.addresses})"
+
+
+class DNSCache:
+    """
+    TTL-кэш ответов, общий для всех целей сканера
+
+    Кэшируются положительные ответы (по минимальному TTL записей) и
+    отрицательные - NXDOMAIN и NOERROR без адресов (по TTL из SOA зоны,
+    RFC 2308, либо negative_ttl). Таймауты и SERVFAIL не кэшируются.
+    При переполнении вытесняются самые старые записи.
+    """
+
+    def __init__(self, max_entries: int = 100000, min_ttl: int = 30, max_ttl: int = 3600,
+                 negative_ttl: int = 300):
+        self.max_entries = max_entries
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self._entries: 'OrderedDict[Tuple[str, int], Tuple[float, DNSAnswer]]' = OrderedDict()
+        self.stats = {'hits': 0, 'negative_hits': 0, 'expired': 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str, type_code: int) -> Optional[DNSAnswer]:
+        """Ответ из кэша, если он еще не истек"""
+        key = (name, type_code)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, answer = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            self.stats['expired'] += 1
+            return None
+        self.stats['hits'] += 1
+        if not answer.exists:
+            self.stats['negative_hits'] += 1
+        return answer
+
+    def put(self, name: str, type_code: int, answer: DNSAnswer):
+        """Сохранение ответа (кэшируемы только NOERROR и NXDOMAIN)"""
+        if answer.rcode not in (0, DNSResolver.RCODE_NXDOMAIN):
+            return
+        ttl = answer.ttl
+        if ttl is None:
+            ttl = self.negative_ttl
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+
+        key = (name, type_code)
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + ttl, answer)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class _ResolverProtocol(asyncio.DatagramProtocol):
+    """UDP-сокет одного DNS-сервера; ответы передаются резолверу"""
+
+    def __init__(self, resolver: 'DNSResolver', server_index: int):
+        self.resolver = resolver
+        self.server_index = server_index
+
+    def datagram_received(self, data: bytes, addr):
+        self.resolver._on_datagram(self.server_index, data)
+
+    def error_received(self, exc: Exception):
+        self.resolver.logger.debug(f"Ошибка UDP-сокета DNS-сервера #{self.server_index}: {exc}")
+
+
+class DNSResolver:
+    """
+    Неблокирующий DNS-резолвер поверх asyncio datagram endpoints
+
+    На каждый DNS-сервер открывается один UDP-сокет; запросы различаются по
+    идентификатору транзакции, поэтому через сокет одновременно идут сотни
+    запросов. Повторы при таймауте или SERVFAIL/REFUSED отправляются на
+    следующий сервер списка. Число запросов в полете ограничено
+    max_in_flight.
+
+    Сервер задается как "8.8.8.8", "127.0.0.1:5353" или "[::1]:53" - так
+    резолвер проверяется на локальном тестовом DNS-сервере.
+
+    Если передан DNSCache, повторные запросы того же имени (в том числе
+    отрицательные) отвечаются из кэша до истечения TTL.
+    """
+
+    QTYPES = {'A': 1, 'CNAME': 5, 'AAAA': 28}
+    RCODE_NXDOMAIN = 3
+    RCODE_TIMEOUT = -1
+    # Запрос прерван сменой списка серверов - повторяется без расхода попытки
+    RCODE_RESET = -2
+    MAX_RESETS = 3
+    # Коды, при которых имеет смысл спросить другой сервер
+    RETRY_RCODES = (2, 5)  # SERVFAIL, REFUSED
+
+    def __init__(self, nameservers: Optional[List[str]] = None, timeout: float = 2.0,
+                 retries: int = 2, max_in_flight: int = 500, cache: Optional[DNSCache] = None):
+        self.logger = logging.getLogger('DNSResolver')
+        self.cache = cache
+        self.timeout = timeout
+        self.retries = retries
+        self.max_in_flight = max_in_flight
+
+        # Сокеты и ожидающие ответы привязаны к event loop, в котором созданы
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transports: Dict[int, asyncio.DatagramTransport] = {}
+        self._pending: Dict[Tuple[int, int], Tuple[asyncio.Future, bytes, int]] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._next_server = 0
+
+        self.nameservers: List[Tuple[str, int]] = []
+        self.set_nameservers(nameservers or ["8.8.8.8", "1.1.1.1"])
+
+        self.stats = {'queries': 0, 'sent': 0, 'timeouts': 0, 'answered': 0, 'nxdomain': 0, 'errors': 0}
+
+    # ------------------------------------------------------------------
+    # Настройка
+    # ------------------------------------------------------------------
+
+    def set_nameservers(self, nameservers: List[str]):
+        """
+        Замена списка DNS-серверов (сокеты пересоздаются при следующем запросе)
+
+        Raises:
+            ValueError: Список пуст или хоть один сервер задан некорректно -
+                тогда текущий список не меняется
+        """
+        parsed = [self.parse_nameserver(server) for server in nameservers if str(server).strip()]
+        if not parsed:
+            raise ValueError("Список DNS-серверов пуст")
+        # Из другого потока (GUI) список меняется в потоке event loop, где его читает resolve()
+        loop = self._loop
+        try:
+            in_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            in_loop = False
+        if loop is not None and loop.is_running() and not in_loop:
+            loop.call_soon_threadsafe(self._apply_nameservers, parsed)
+        else:
+            self._apply_nameservers(parsed)
+
+    def _apply_nameservers(self, nameservers: List[Tuple[str, int]]):
+        self.nameservers = nameservers
+        self._close_transports()
+
+    def set_limits(self, timeout: Optional[float] = None, retries: Optional[int] = None,
+                   max_in_flight: Optional[int] = None):
+        """Изменение таймаута, числа повторов и лимита запросов в полете"""
+        if timeout is not None:
+            self.timeout = timeout
+        if retries is not None:
+            self.retries = retries
+        if max_in_flight is not None and max_in_flight != self.max_in_flight:
+            self.max_in_flight = max_in_flight
+            self._semaphore = None  # Запросы в полете освободят старый семафор
+
+    @staticmethod
+    def parse_nameserver(server: str) -> Tuple[str, int]:
+        """"8.8.8.8" / "127.0.0.1:5353" / "[::1]:53" -> (адрес, порт)"""
+        server = str(server).strip()
+        port = '53'
+        if server.startswith('['):
+            host, bracket, port = server[1:].partition(']')
+            if not bracket or (port and not port.startswith(':')):
+                raise ValueError(f"Некорректный DNS-сервер: {server!r}")
+            port = port[1:] or '53'
+        elif server.count(':') == 1:
+            host, port = server.split(':')
+        else:
+            host = server
+        try:
+            address = str(ipaddress.ip_address(host))
+            port_number = int(port)
+        except ValueError:
+            raise ValueError(f"Некорректный DNS-сервер: {server!r}") from None
+        if not 0 < port_number < 65536:
+            raise ValueError(f"Некорректный порт DNS-сервера: {server!r}")
+        return address, port_number
+
+    async def _ensure_transports(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Новый event loop (например, перезапуск движка) - старые сокеты непригодны
+            self._close_transports()
+            self._loop = loop
+            self._semaphore = None
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        nameservers = self.nameservers
+        for index, (host, port) in enumerate(nameservers):
+            if index in self._transports:
+                continue
+            family = socket.AF_INET6 if ':' in host else socket.AF_INET
+            try:
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda index=index: _ResolverProtocol(self, index),
+                    remote_addr=(host, port),
+                    family=family
+                )
+            except OSError as e:
+                # Запросы к этому серверу завершатся таймаутом и уйдут на следующий
+                self.stats['errors'] += 1
+                self.logger.debug(f"Не удалось открыть сокет DNS-сервера {host}:{port}: {e}")
+                continue
+            if self.nameservers is not nameservers:
+                # Список сменился, пока открывался сокет - он к старому серверу
+                transport.close()
+                return
+            if index in self._transports:
+                # Сокет уже открыл параллельный запрос
+                transport.close()
+            else:
+                self._transports[index] = transport
+
+    def _close_transports(self):
+        for transport in self._transports.values():
+            transport.close()
+        self._transports.clear()
+        # Ожидающие запросы повторяются в resolve() на новых сокетах
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.set_result((self.RCODE_RESET, [], [], None))
+        self._pending.clear()
+
+    async def close(self):
+        """Закрытие сокетов"""
+        self._close_transports()
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # Разрешение имен
+    # ------------------------------------------------------------------
+
+    async def resolve(self, name: str, qtype: str = 'A', use_cache: bool = True) -> DNSAnswer:
+        """
+        Разрешение имени
+
+        Args:
+            name: Доменное имя
+            qtype: Тип записи (A, AAAA, CNAME)
+            use_cache: Использовать кэш (случайные пробные имена его только засоряют)
+
+        Returns:
+            DNSAnswer; при отсутствии ответа от всех серверов rcode = RCODE_TIMEOUT
+        """
+        name = name.rstrip('.').lower()
+        type_code = self.QTYPES[qtype]
+        self.stats['queries'] += 1
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(name, type_code)
+            if cached is not None:
+                return cached
+
+        await self._ensure_transports()
+
+        async with self._semaphore:
+            attempts = resets = 0
+            while True:
+                # Сокеты могли закрыться при смене списка серверов - открываются заново
+                await self._ensure_transports()
+                server_index = self._next_server % len(self.nameservers)
+                self._next_server += 1
+                answer = await self._query(server_index, name, type_code)
+                if answer.rcode == self.RCODE_RESET and resets < self.MAX_RESETS:
+                    resets += 1
+                    continue
+                if answer.rcode == self.RCODE_RESET:
+                    answer = DNSAnswer(name, self.RCODE_TIMEOUT, nameserver=answer.nameserver)
+                attempts += 1
+                if attempts > self.retries:
+                    break
+                if answer.rcode != self.RCODE_TIMEOUT and answer.rcode not in self.RETRY_RCODES:
+                    break
+
+        if answer.rcode == self.RCODE_TIMEOUT:
+            self.stats['timeouts'] += 1
+        elif answer.nxdomain:
+            self.stats['nxdomain'] += 1
+        else:
+            self.stats['answered'] += 1
+        if use_cache and self.cache is not None:
+            self.cache.put(name, type_code, answer)
+        return answer
+
+    def cached(self, name: str, qtype: str = 'A') -> Optional[DNSAnswer]:
+        """Ответ из кэша без сетевого запроса"""
+        if self.cache is None:
+            return None
+        return self.cache.get(name.rstrip('.').lower(), self.QTYPES[qtype])
+
+    async def _query(self, server_index: int, name: str, type_code: int) -> DNSAnswer:
+        """Один запрос к одному серверу"""
+        transport = self._transports.get(server_index)
+        host, port = self.nameservers[server_index]
+        nameserver = f"{host}:{port}"
+        if transport is None or transport.is_closing():
+            return DNSAnswer(name, self.RCODE_TIMEOUT, nameserver=nameserver)
+
+        txid = random.getrandbits(16)
+        while (server_index, txid) in self._pending:
+            txid = random.getrandbits(16)
+
+        question = self.encode_question(name, type_code)
+        future = self._loop.create_future()
+        self._pending[(server_index, txid)] = (future, question, type_code)
+        try:
+            transport.sendto(struct.pack('>HHHHHH', txid, 0x0100, 1, 0, 0, 0) + question)
+            self.stats['sent'] += 1
+            rcode, addresses, cnames, ttl = await asyncio.wait_for(future, self.timeout)
+            return DNSAnswer(name, rcode, addresses, cnames, ttl, nameserver)
+        except asyncio.TimeoutError:
+            return DNSAnswer(name, self.RCODE_TIMEOUT, nameserver=nameserver)
+        finally:
+            self._pending.pop((server_index, txid), None)
+
+    def _on_datagram(self, server_index: int, data: bytes):
+        """Сопоставление ответа с ожидающим запросом"""
+        if len(data) < 12:
+            return
+        txid = struct.unpack_from('>H', data)[0]
+        pending = self._pending.get((server_index, txid))
+        if pending is None:
+            return  # Опоздавший или чужой ответ
+        future, question, type_code = pending
+        if future.done():
+            return
+        try:
+            result = self.parse_response(data, question, type_code)
+        except DNSError as e:
+            # Ответ не на наш вопрос - ждем дальше (или таймаут)
+            self.stats['errors'] += 1
+            self.logger.debug(f"Некорректный DNS-ответ: {e}")
+            return
+        future.set_result(result)
+
+    # ------------------------------------------------------------------
+    # Формат сообщений
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def encode_question(name: str, type_code: int) -> bytes:
+        """Секция вопроса: QNAME, QTYPE, QCLASS=IN"""
+        encoded = bytearray()
+        for label in name.split('.'):
+            raw = label.encode('idna') if label else b''
+            if not raw or len(raw) > 63:
+                raise ValueError(f"Некорректная метка DNS-имени: {name!r}")
+            encoded.append(len(raw))
+            encoded += raw
+        encoded.append(0)
+        return bytes(encoded) + struct.pack('>HH', type_code, 1)
+
+    @classmethod
+    def parse_response(cls, data: bytes, question: bytes,
+                       type_code: int) -> Tuple[int, List[str], List[str], Optional[int]]:
+        """
+        Разбор ответа
+
+        Returns:
+            (rcode, адреса, CNAME-цели, минимальный TTL записей)
+        """
+        _, flags, qdcount, ancount, nscount, _ = struct.unpack_from('>HHHHHH', data)
+        if not flags & 0x8000:
+            raise DNSError("не ответ (QR=0)")
+        rcode = flags & 0x000F
+        if qdcount != 1 or data[12:12 + len(question)].lower() != question.lower():
+            raise DNSError("вопрос ответа не совпадает с запросом")
+
+        offset = 12 + len(question)
+        addresses, cnames, ttls = [], [], []
+        for _ in range(ancount):
+            offset = cls._skip_name(data, offset)
+            if offset + 10 > len(data):
+                raise DNSError("обрезанная запись ответа")
+            record_type, _, ttl, length = struct.unpack_from('>HHIH', data, offset)
+            offset += 10
+            rdata = data[offset:offset + length]
+            if len(rdata) != length:
+                raise DNSError("обрезанные данные записи")
+            if record_type == 1 and type_code == 1 and length == 4:
+                addresses.append(socket.inet_ntop(socket.AF_INET, rdata))
+                ttls.append(ttl)
+            elif record_type == 28 and type_code == 28 and length == 16:
+                addresses.append(socket.inet_ntop(socket.AF_INET6, rdata))
+                ttls.append(ttl)
+            elif record_type == 5:
+                cnames.append(cls._read_name(data, offset))
+                ttls.append(ttl)
+            offset += length
+
+        if not addresses:
+            # Отрицательный ответ: TTL = min(TTL SOA, MINIMUM) из секции authority
+            for _ in range(nscount):
+                offset = cls._skip_name(data, offset)
+                if offset + 10 > len(data):
+                    break
+                record_type, _, ttl, length = struct.unpack_from('>HHIH', data, offset)
+                offset += 10
+                if record_type == 6 and length >= 4 and offset + length <= len(data):
+                    minimum = struct.unpack_from('>I', data, offset + length - 4)[0]
+                    return rcode, addresses, cnames, min(ttl, minimum)
+                offset += length
+            return rcode, addresses, cnames, None
+
+        return rcode, addresses, cnames, (min(ttls) if ttls else None)
+
+    @staticmethod
+    def _skip_name(data: bytes, offset: int) -> int:
+        while True:
+            if offset >= len(data):
+                raise DNSError("обрезанное имя")
+            length = data[offset]
+            if length & 0xC0 == 0xC0:
+                return offset + 2  # Указатель сжатия
+            if length == 0:
+                return offset + 1
+            offset += length + 1
+
+    @staticmethod
+    def _read_name(data: bytes, offset: int) -> str:
+        labels = []
+        jumps = 0
+        while True:
+            if offset >= len(data) or jumps > 32:
+                raise DNSError("некорректное имя")
+            length = data[offset]
+            if length & 0xC0 == 0xC0:
+                offset = ((length & 0x3F) << 8) | data[offset + 1]
+                jumps += 1
+                continue
+            if length == 0:
+                return '.'.join(labels).lower()
+            labels.append(data[offset + 1:offset + 1 + length].decode('ascii', 'replace'))
+            offset += length + 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Статистика резолвера"""
+        return {
+            **self.stats,
+            'in_flight': len(self._pending),
+            'cache': {**self.cache.stats, 'entries': len(self.cache)} if self.cache is not None else None,
+            'nameservers': [f"{host}:{port}" for host, port in self.nameservers]
+        }
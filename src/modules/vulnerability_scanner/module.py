@@ -1,12 +1,15 @@
 import asyncio
 import re
 from typing import List, Dict, Any
+from core.rate_limiter import FallbackPacer, governed_slot
 
 class VulnerabilityScanner:
     def __init__(self, rate_limit: int = 3):
         self.rate_limit = rate_limit
         self.name = "vulnerability_scanner"
         self.vulnerability_db = self.load_vulnerability_db()
+        self.rate_governor = None  # Общий RateGovernor, назначается движком
+        self._fallback_pacer = FallbackPacer()
     
     def load_vulnerability_db(self) -> Dict[str, List[Dict]]:
         """База данных уязвимостей"""
@@ -52,16 +55,27 @@ class VulnerabilityScanner:
     async def scan(self, services_data: Dict[str, Any]) -> Dict[str, Any]:
         results = {"vulnerabilities": [], "module": self.name}
         
-        for host, services in services_data.items():
-            for service_info in services:
-                vulns = await self.check_service_vulnerabilities(service_info)
-                if vulns:
-                    results["vulnerabilities"].extend(vulns)
-            
-            await asyncio.sleep(1 / self.rate_limit)
+        checks = [
+            self.check_limited(host, service_info)
+            for host, services in services_data.items()
+            for service_info in services
+        ]
+        
+        # Сервисы проверяются параллельно, темп задает регулятор нагрузки
+        for vulns in await asyncio.gather(*checks):
+            if vulns:
+                results["vulnerabilities"].extend(vulns)
         
         return results
     
+    async def check_limited(self, host: str, service_info: Dict) -> List[Dict]:
+        async with self.rate_slot(host):
+            return await self.check_service_vulnerabilities(service_info)
+    
+    def rate_slot(self, host: str):
+        """Слот запроса к хосту с учетом ограничения скорости"""
+        return governed_slot(self.rate_governor, self.name, host, self._fallback_pacer.slot(self.rate_limit))
+    
     async def check_service_vulnerabilities(self, service_info: Dict) -> List[Dict]:
         """Проверка уязвимостей для конкретного сервиса"""
         vulnerabilities = []
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+# Модули импортируются так же, как в src/main.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pytest
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Движок с конфигурацией по умолчанию; config.json и configs/ создаются во временном каталоге"""
+    monkeypatch.chdir(tmp_path)
+    from core.engine import PropagationEngine
+    return PropagationEngine()
@@ -0,0 +1,234 @@
+"""
+Тесты неблокирующего DNS-резолвера и wildcard-фильтра на локальном stub DNS-сервере
+"""
+import asyncio
+import socket
+import struct
+import time
+
+from modules.subdomain_scanner.module import SubdomainScanner
+from modules.subdomain_scanner.resolver import DNSResolver
+
+
+class StubDNS(asyncio.DatagramProtocol):
+    """
+    Минимальный DNS-сервер на loopback
+
+    records: имя -> IPv4; wildcard: зона -> IPv4 для любых имен в зоне.
+    mode: "answer" - обычные ответы, "silent" - не отвечать,
+    "bad_txid" - сначала ответ с чужим txid, затем правильный.
+    """
+
+    def __init__(self, records=None, wildcard=None, mode="answer", delay=0.0):
+        self.records = records or {}
+        self.wildcard = wildcard or {}
+        self.mode = mode
+        self.delay = delay
+        self.received = 0
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+        if self.mode == "silent":
+            return
+        asyncio.get_running_loop().call_later(self.delay, self.reply, data, addr)
+
+    def lookup(self, name):
+        if name in self.records:
+            return self.records[name]
+        for zone, address in self.wildcard.items():
+            if name.endswith("." + zone):
+                return address
+        return None
+
+    def reply(self, data, addr):
+        txid = struct.unpack_from(">H", data)[0]
+        offset, labels = 12, []
+        while data[offset]:
+            labels.append(data[offset + 1:offset + 1 + data[offset]].decode())
+            offset += data[offset] + 1
+        question = data[12:offset + 5]
+        address = self.lookup(".".join(labels))
+
+        if address is None:
+            response = struct.pack(">HHHHHH", txid, 0x8183, 1, 0, 0, 0) + question
+        else:
+            record = b"\xc0\x0c" + struct.pack(">HHIH", 1, 1, 300, 4) + socket.inet_aton(address)
+            response = struct.pack(">HHHHHH", txid, 0x8180, 1, 1, 0, 0) + question + record
+
+        if self.mode == "bad_txid":
+            self.transport.sendto(struct.pack(">H", txid ^ 0xFFFF) + response[2:], addr)
+        self.transport.sendto(response, addr)
+
+
+async def start_stub(**kwargs):
+    transport, protocol = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: StubDNS(**kwargs), local_addr=("127.0.0.1", 0)
+    )
+    return transport, protocol, f"127.0.0.1:{transport.get_extra_info('sockname')[1]}"
+
+
+def test_noerror_and_nxdomain():
+    async def run():
+        transport, _, server = await start_stub(records={"www.example.test": "10.0.0.1"})
+        resolver = DNSResolver([server], timeout=0.5, retries=0)
+        try:
+            found = await resolver.resolve("www.example.test")
+            missing = await resolver.resolve("nope.example.test")
+        finally:
+            await resolver.close()
+            transport.close()
+
+        assert found.rcode == 0 and found.exists
+        assert found.addresses == ["10.0.0.1"]
+        assert found.ttl == 300
+        assert missing.nxdomain and not missing.exists
+
+    asyncio.run(run())
+
+
+def test_timeout_falls_back_to_next_server():
+    async def run():
+        silent_transport, silent, silent_server = await start_stub(mode="silent")
+        transport, _, server = await start_stub(records={"www.example.test": "10.0.0.2"})
+        resolver = DNSResolver([silent_server, server], timeout=0.2, retries=1)
+        try:
+            answer = await resolver.resolve("www.example.test")
+        finally:
+            await resolver.close()
+            silent_transport.close()
+            transport.close()
+
+        assert silent.received == 1
+        assert answer.addresses == ["10.0.0.2"]
+        assert answer.nameserver == server
+
+    asyncio.run(run())
+
+
+def test_all_servers_silent_is_timeout():
+    async def run():
+        transport, _, server = await start_stub(mode="silent")
+        resolver = DNSResolver([server], timeout=0.1, retries=1)
+        try:
+            answer = await resolver.resolve("www.example.test")
+        finally:
+            await resolver.close()
+            transport.close()
+
+        assert answer.rcode == DNSResolver.RCODE_TIMEOUT
+        assert resolver.get_statistics()["timeouts"] == 1
+
+    asyncio.run(run())
+
+
+def test_mismatched_txid_is_ignored():
+    async def run():
+        transport, _, server = await start_stub(records={"www.example.test": "10.0.0.3"}, mode="bad_txid")
+        resolver = DNSResolver([server], timeout=0.5, retries=0)
+        try:
+            answer = await resolver.resolve("www.example.test")
+        finally:
+            await resolver.close()
+            transport.close()
+
+        assert answer.addresses == ["10.0.0.3"]
+
+    asyncio.run(run())
+
+
+def test_many_concurrent_queries():
+    async def run():
+        records = {f"h{i}.example.test": f"10.1.{i // 256}.{i % 256}" for i in range(0, 2000, 2)}
+        transport, _, server = await start_stub(records=records, delay=0.01)
+        resolver = DNSResolver([server], timeout=2.0, retries=1, max_in_flight=500)
+        started = time.monotonic()
+        try:
+            answers = await asyncio.gather(*(resolver.resolve(f"h{i}.example.test") for i in range(2000)))
+        finally:
+            await resolver.close()
+            transport.close()
+
+        assert time.monotonic() - started < 10
+        assert {answer.name for answer in answers if answer.exists} == set(records)
+        assert sum(answer.nxdomain for answer in answers) == 1000
+
+    asyncio.run(run())
+
+
+def test_wildcard_zone_is_filtered():
+    async def run():
+        transport, _, server = await start_stub(
+            records={"www.wild.test": "10.2.0.1"},
+            wildcard={"wild.test": "10.2.0.254"}
+        )
+        scanner = SubdomainScanner()
+        scanner.update_config({"dns_servers": [server], "dns_timeout": 0.5, "rate_limit": 1000})
+        try:
+            found = await scanner.find_subdomains("wild.test")
+        finally:
+            await scanner.resolver.close()
+            transport.close()
+
+        assert [item["subdomain"] for item in found] == ["www.wild.test"]
+        assert scanner.wildcards["wild.test"][1] == {"10.2.0.254"}
+        assert scanner.stats["wildcard_filtered"] == len(scanner.common_subdomains) - 1
+
+    asyncio.run(run())
+
+
+def test_invalid_server_list_is_rejected():
+    resolver = DNSResolver(["127.0.0.1:5353"])
+    for servers in (["8.8.8.8", "not-an-ip"], ["1.1.1.1:99999"], ["[::1"], []):
+        try:
+            resolver.set_nameservers(servers)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{servers} принят")
+    assert resolver.nameservers == [("127.0.0.1", 5353)]
+    assert DNSResolver.parse_nameserver("[::1]:53") == ("::1", 53)
+
+
+def test_server_change_retries_in_flight_queries():
+    async def run():
+        silent_transport, _, silent_server = await start_stub(mode="silent")
+        transport, _, server = await start_stub(records={"www.example.test": "10.0.0.4"})
+        resolver = DNSResolver([silent_server], timeout=2.0, retries=0)
+        try:
+            pending = asyncio.ensure_future(resolver.resolve("www.example.test"))
+            await asyncio.sleep(0.1)
+            resolver.set_nameservers([server])
+            answer = await asyncio.wait_for(pending, 1.0)
+        finally:
+            await resolver.close()
+            silent_transport.close()
+            transport.close()
+
+        assert answer.addresses == ["10.0.0.4"]
+        assert answer.nameserver == server
+
+    asyncio.run(run())
+
+
+def test_unusable_server_is_timeout():
+    async def run():
+        transport, _, server = await start_stub(records={"www.example.test": "10.0.0.5"})
+        # connect() на широковещательный адрес без SO_BROADCAST завершается ошибкой
+        resolver = DNSResolver(["255.255.255.255", server], timeout=0.5, retries=1)
+        try:
+            answer = await resolver.resolve("www.example.test")
+            single = DNSResolver(["255.255.255.255"], timeout=0.1, retries=0)
+            failed = await single.resolve("www.example.test")
+            await single.close()
+        finally:
+            await resolver.close()
+            transport.close()
+
+        assert answer.addresses == ["10.0.0.5"]
+        assert failed.rcode == DNSResolver.RCODE_TIMEOUT
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+"""
+Тесты объединения задач одного модуля в один вызов scan()
+"""
+import asyncio
+
+from core.engine import NodeType
+from core.scheduler import BatchPolicy
+
+
+class RecordingScanner:
+    """Модуль, запоминающий цели каждого вызова scan()"""
+
+    calls = []
+
+    async def scan(self, targets):
+        RecordingScanner.calls.append(list(targets))
+        return {"module": "port_scanner", "open_ports": []}
+
+
+def test_tasks_of_one_module_share_scan_call(engine):
+    RecordingScanner.calls = []
+    engine.register_module("port_scanner", RecordingScanner)
+    hosts = [f"10.0.0.{i}" for i in range(1, 6)]
+    for host in hosts:
+        engine.add_custom_node(NodeType.ACTIVE_HOST, host, "test", 1, module="port_scanner")
+
+    asyncio.run(engine.process_queue())
+
+    assert RecordingScanner.calls == [hosts]
+    assert engine.stats["batches_executed"] == 1
+    assert engine.stats["successful_scans"] == len(hosts)
+
+
+def test_split_copies_unattributed_items_to_every_task(engine):
+    engine.add_custom_node(NodeType.ACTIVE_HOST, "10.0.0.1", "test", 1, module="port_scanner")
+    engine.add_custom_node(NodeType.ACTIVE_HOST, "10.0.0.2", "test", 1, module="port_scanner")
+    tasks = [entry[2] for entry in list(engine.pending_scans.queue)]
+    results = {
+        "module": "port_scanner",
+        "open_ports": [
+            {"host": "10.0.0.2", "port": 22},
+            {"host": "10.0.0.1", "port": 80},
+            {"port": 443},
+            {"host": "10.9.9.9", "port": 8080}
+        ]
+    }
+
+    parts = dict((task.data, part) for task, part in engine._split_batch_results(results, tasks))
+
+    assert parts["10.0.0.1"]["open_ports"] == [
+        {"host": "10.0.0.1", "port": 80}, {"port": 443}, {"host": "10.9.9.9", "port": 8080}
+    ]
+    assert parts["10.0.0.2"]["open_ports"] == [
+        {"host": "10.0.0.2", "port": 22}, {"port": 443}, {"host": "10.9.9.9", "port": 8080}
+    ]
+    assert parts["10.0.0.1"]["module"] == parts["10.0.0.2"]["module"] == "port_scanner"
+
+
+def test_batch_timeout_grows_by_waves_and_is_capped():
+    policy = BatchPolicy({"concurrency": 16, "module_concurrency": {"exploitation": 1}, "max_timeout": 60})
+
+    assert policy.timeout("port_scanner", 2.0, 1) == 2.0
+    assert policy.timeout("port_scanner", 2.0, 16) == 2.0
+    assert policy.timeout("port_scanner", 2.0, 17) == 4.0
+    assert policy.timeout("port_scanner", 2.0, 256) == 32.0
+    assert policy.timeout("exploitation", 2.0, 256) == 60
+    assert BatchPolicy({"max_timeout": 1}).timeout("port_scanner", 2.0, 256) == 2.0
@@ -0,0 +1,62 @@
+"""
+Тесты журнала контрольных точек и возобновления сканирования
+"""
+from core.engine import PropagationEngine, NodeType, ScanNode
+from core.checkpoint import CheckpointJournal
+
+
+def queued_targets(engine):
+    return sorted(entry[2].data for entry in list(engine.pending_scans.queue))
+
+
+def test_resume_skips_completed_work_and_duplicates(engine, tmp_path):
+    path = str(tmp_path / "scan.jsonl")
+    engine.enable_checkpoint(path, flush_every=1000)
+    for target in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+        engine.add_initial_target(target)
+    # Повторная цель сливается с известным узлом, новой записи узла нет
+    engine.add_initial_target("10.0.0.1")
+
+    first = engine.find_node(NodeType.INITIAL_TARGET, "10.0.0.1", "ping_scanner")
+    engine._complete_task(first)
+    engine.checkpoint.record_stats(engine.stats)
+    # Запись того же хоста под другим id (например, из другого процесса) - дубликат
+    engine.checkpoint.record_node(engine._node_to_dict(ScanNode(
+        "initial_10.0.0.1_duplicate", NodeType.INITIAL_TARGET, "10.0.0.1", "user_input", 0, 0.0,
+        module="ping_scanner"
+    )))
+    engine.checkpoint.flush()
+
+    state = CheckpointJournal.replay(path)
+    assert len(state["nodes"]) == 4
+    assert list(state["completed"]) == [first.node_id]
+
+    resumed = PropagationEngine()
+    requeued = resumed.resume_from(path)
+
+    assert requeued == 2
+    assert len(resumed.discovered_nodes) == 3
+    assert queued_targets(resumed) == ["10.0.0.2", "10.0.0.3"]
+    assert first.node_id in resumed.completed_scans
+    assert resumed.stats["successful_scans"] == 1
+    assert resumed.stats["duplicates_merged"] == 1
+    assert resumed.checkpoint.path == engine.checkpoint.path
+
+    # После возобновления дедупликация продолжает работать по восстановленным узлам
+    resumed.add_initial_target("10.0.0.2")
+    assert len(resumed.discovered_nodes) == 3
+    assert queued_targets(resumed) == ["10.0.0.2", "10.0.0.3"]
+
+
+def test_replay_skips_truncated_record(tmp_path):
+    path = tmp_path / "scan.jsonl"
+    journal = CheckpointJournal(str(path))
+    journal.record_completed("a", {"status": "completed"})
+    journal.flush()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "node", "node": {"id"')
+
+    state = CheckpointJournal.replay(str(path))
+
+    assert state["completed"] == {"a": {"status": "completed"}}
+    assert state["nodes"] == {}
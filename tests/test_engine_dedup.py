@@ -0,0 +1,55 @@
+"""
+Тесты дедупликации обнаруженных узлов
+"""
+import asyncio
+
+from core.engine import NodeType, ScanNode
+
+
+def host_node(node_id, data, source, ports=None, metadata=None):
+    return ScanNode(node_id, NodeType.OPEN_PORTS, data, source, 2, 0.0, module="service_detector",
+                    ports=ports, metadata=metadata)
+
+
+def test_same_host_from_two_sources_is_merged(engine):
+    async def run():
+        await engine.add_discovered_node(host_node("a", "10.0.0.1", "www", [80], {"hostname": "www.example.test"}))
+        await engine.add_discovered_node(host_node("b", "10.0.0.1.", "api", [80, 443], {"via": "api"}))
+
+    asyncio.run(run())
+
+    assert len(engine.discovered_nodes) == 1
+    assert engine.get_pending_count() == 1
+    node = engine.get_node("a")
+    assert node.ports == [80, 443]
+    assert node.metadata["hostname"] == "www.example.test" and node.metadata["via"] == "api"
+    assert node.metadata["sources"] == ["www", "api"]
+    assert engine.stats["duplicates_merged"] == 1
+
+
+def test_duplicate_of_scanned_node_queues_only_new_data(engine):
+    async def run():
+        await engine.add_discovered_node(host_node("a", "10.0.0.1", "www", [80]))
+        first = engine.pending_scans.get_nowait()[2]
+        engine._complete_task(first)
+        await engine.add_discovered_node(host_node("b", "10.0.0.1", "api", [80, 8080]))
+        await engine.add_discovered_node(host_node("c", "10.0.0.1", "cdn", [80]))
+
+    asyncio.run(run())
+
+    follow_ups = [entry[2] for entry in list(engine.pending_scans.queue)]
+    assert [node.ports for node in follow_ups] == [[8080]]
+    assert follow_ups[0].get_meta("follow_up_of") == "a"
+    assert engine.stats["follow_up_scans"] == 1
+    assert engine.find_node(NodeType.OPEN_PORTS, "10.0.0.1", "service_detector").node_id == "a"
+
+
+def test_different_modules_are_not_merged(engine):
+    async def run():
+        await engine.add_discovered_node(host_node("a", "10.0.0.1", "www"))
+        await engine.add_discovered_node(ScanNode("b", NodeType.OPEN_PORTS, "10.0.0.1", "www", 2, 0.0,
+                                                  module="vulnerability_scanner"))
+
+    asyncio.run(run())
+
+    assert len(engine.discovered_nodes) == 2
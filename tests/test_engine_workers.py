@@ -0,0 +1,59 @@
+"""
+Тесты пула воркеров движка
+"""
+import asyncio
+
+from core.engine import NodeType
+from core.scheduler import BatchPolicy
+
+
+class SleepingScanner:
+    """Модуль, который сканирует цель "slow" дольше остальных"""
+
+    finished = []
+
+    async def scan(self, targets):
+        for target in targets:
+            await asyncio.sleep(1.0 if target == "slow" else 0.1)
+            SleepingScanner.finished.append(target)
+        return {"module": "port_scanner"}
+
+
+def test_slow_task_does_not_block_other_workers(engine):
+    SleepingScanner.finished = []
+    engine.max_concurrent_tasks = 2
+    engine.batch_policy = BatchPolicy({"enabled": False})
+    engine.register_module("port_scanner", SleepingScanner)
+    for target in ("slow", "a", "b", "c", "d"):
+        engine.add_custom_node(NodeType.ACTIVE_HOST, target, "test", 1, module="port_scanner")
+
+    asyncio.run(engine.process_queue())
+
+    # Пока один воркер занят медленной задачей, второй успевает выполнить все остальные
+    assert SleepingScanner.finished[-1] == "slow"
+    assert sorted(SleepingScanner.finished) == ["a", "b", "c", "d", "slow"]
+    assert engine.stats["successful_scans"] == 5
+    assert engine.get_pending_count() == 0
+
+
+def test_children_found_during_scan_are_processed(engine):
+    class DiscoveringScanner:
+        async def scan(self, targets):
+            return {"module": "ping_scanner", "active_hosts": [{"ip": target} for target in targets]}
+
+    scanned = []
+
+    class RecordingPortScanner:
+        async def scan(self, targets):
+            scanned.extend(targets)
+            return {"module": "port_scanner"}
+
+    engine.register_module("ping_scanner", DiscoveringScanner)
+    engine.register_module("port_scanner", RecordingPortScanner)
+    engine.add_initial_target("10.0.0.1")
+    engine.add_initial_target("10.0.0.2")
+
+    asyncio.run(engine.process_queue())
+
+    assert sorted(scanned) == ["10.0.0.1", "10.0.0.2"]
+    assert not engine.is_running
@@ -0,0 +1,33 @@
+"""
+Тесты шины событий движок -> GUI
+"""
+from core.event_bus import EventBus
+
+
+def test_coalesced_event_takes_last_position():
+    events = [
+        ("node_added", 1),
+        ("progress_update", {"done": 1}),
+        ("scan_started", None),
+        ("node_added", 2),
+        ("progress_update", {"done": 2}),
+        ("module_registered", "x")
+    ]
+
+    assert EventBus.coalesce(events) == [
+        ("scan_started", None),
+        ("node_added", [1, 2]),
+        ("progress_update", {"done": 2}),
+        ("module_registered", "x")
+    ]
+
+
+def test_overflow_requests_resync_once():
+    bus = EventBus(capacity=2)
+    for index in range(3):
+        bus.publish("scan_started", index)
+
+    assert bus.drain() == [("resync", None), ("scan_started", 1), ("scan_started", 2)]
+    bus.publish("scan_started", 3)
+    assert bus.drain() == [("scan_started", 3)]
+    assert bus.get_statistics()["dropped"] == 1
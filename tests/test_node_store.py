@@ -0,0 +1,42 @@
+"""
+Тесты репозиториев узлов
+"""
+import sqlite3
+
+import pytest
+
+from core.engine import NodeType, ScanNode, PropagationEngine
+from core.node_store import NodeRepository, SQLiteNodeRepository
+
+
+def make_node(index):
+    return ScanNode(f"node_{index}", NodeType.ACTIVE_HOST, f"10.0.0.{index}", "test", 1, 0.0,
+                    module="port_scanner")
+
+
+def test_repository_interface_is_abstract():
+    with pytest.raises(TypeError):
+        NodeRepository()
+
+
+def test_sqlite_commits_in_batches(tmp_path):
+    path = str(tmp_path / "nodes.db")
+    repository = SQLiteNodeRepository(path, PropagationEngine._node_to_dict,
+                                      PropagationEngine._node_from_dict, commit_every=3)
+
+    def committed():
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    for index in range(1, 3):
+        repository.add(make_node(index), ("active_host", f"10.0.0.{index}", "port_scanner"))
+    assert len(repository) == 2 and committed() == 0
+    assert repository.get_by_key(("active_host", "10.0.0.2", "port_scanner")).node_id == "node_2"
+
+    repository.add(make_node(3))
+    assert committed() == 3
+
+    repository.add(make_node(4))
+    repository.flush()
+    assert committed() == 4
+    repository.close()
@@ -0,0 +1,22 @@
+"""
+Тесты планировщика сканирования портов
+"""
+from modules.port_scanner.planner import ScanPlanner
+
+
+def test_hosts_interleave_and_respect_host_limit():
+    planner = ScanPlanner(["a", "b"], [1, 2, 3], host_concurrency=2)
+
+    taken = [planner.take() for _ in range(4)]
+    assert taken == [("a", 1), ("b", 1), ("a", 2), ("b", 2)]
+    assert planner.take() is None
+
+    planner.release("b")
+    assert planner.take() == ("b", 3)
+    planner.release("a")
+    assert planner.take() == ("a", 3)
+    assert planner.exhausted and not planner.finished
+
+    for host in ("a", "a", "b", "b"):
+        planner.release(host)
+    assert planner.finished
@@ -0,0 +1,91 @@
+"""
+Тесты сканера портов на локальных TCP-серверах
+"""
+import asyncio
+import time
+
+from modules.port_scanner.module import PortScanner
+
+
+async def start_servers(count, banner=b""):
+    async def handle(reader, writer):
+        if banner:
+            writer.write(banner)
+            await writer.drain()
+        try:
+            await reader.read()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    servers = [await asyncio.start_server(handle, "127.0.0.1", 0) for _ in range(count)]
+    ports = [server.sockets[0].getsockname()[1] for server in servers]
+    return servers, ports
+
+
+def make_scanner(ports, **config):
+    scanner = PortScanner()
+    scanner.update_config({"ports": ports, "alive_ports": ports[:1], "timeout": 1.0, **config})
+    return scanner
+
+
+def test_banner_reads_do_not_hold_host_slot():
+    async def run():
+        servers, ports = await start_servers(4)
+        scanner = make_scanner(ports, max_host_concurrency=1, banner_timeout=0.5)
+        started = time.monotonic()
+        try:
+            found = await scanner.scan_hosts(["127.0.0.1"])
+        finally:
+            for server in servers:
+                server.close()
+        return time.monotonic() - started, found
+
+    elapsed, found = asyncio.run(run())
+
+    assert [info["port"] for info in found["127.0.0.1"]] == sorted(info["port"] for info in found["127.0.0.1"])
+    assert len(found["127.0.0.1"]) == 4
+    # Четыре окна чтения баннера по 0.5s шли бы последовательно при одном слоте на хост
+    assert elapsed < 1.5
+
+
+def test_banner_is_read_from_probe_connection():
+    async def run():
+        servers, ports = await start_servers(1, banner=b"SSH-2.0-Test\r\n")
+        scanner = make_scanner(ports, banner_timeout=0.5)
+        try:
+            return await scanner.scan_hosts(["127.0.0.1"])
+        finally:
+            for server in servers:
+                server.close()
+
+    found = asyncio.run(run())
+
+    assert found["127.0.0.1"][0]["banner"] == "SSH-2.0-Test"
+
+
+def test_hostname_is_resolved_once_outside_rtt(monkeypatch):
+    lookups = []
+
+    async def slow_getaddrinfo(self, host, port, **kwargs):
+        lookups.append(host)
+        await asyncio.sleep(0.3)
+        return [(None, None, None, "", ("127.0.0.1", 0))]
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", slow_getaddrinfo)
+
+    async def run():
+        servers, ports = await start_servers(3)
+        scanner = make_scanner(ports, banner_grab=False)
+        try:
+            found = await scanner.scan_hosts(["scan.example.test"])
+        finally:
+            for server in servers:
+                server.close()
+        return scanner, found
+
+    scanner, found = asyncio.run(run())
+
+    assert lookups == ["scan.example.test"]
+    assert len(found["scan.example.test"]) == 3
+    assert scanner.rtt.get_statistics()["127.0.0.1"]["srtt"] < 0.1
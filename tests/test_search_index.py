@@ -0,0 +1,31 @@
+"""
+Тесты поискового индекса GUI
+"""
+from gui.search_index import SearchIndex
+
+
+def make_index():
+    index = SearchIndex()
+    index.index_host("192.168.1.10", {"hostname": "db.example.test", "status": "active"})
+    index.index_host("10.0.0.5", {"hostname": "web.example.test", "status": "active",
+                                  "vulnerabilities": [{"cve": "CVE-2021-44228"}]})
+    return index
+
+
+def test_short_query_matches_inside_values():
+    index = make_index()
+
+    assert index.search("host", "68") == {"192.168.1.10"}
+    assert index.search("host", ".1") == {"192.168.1.10"}
+    assert index.search("host", "b") == {"192.168.1.10", "10.0.0.5"}
+    assert index.search("host", "b", require=["has_vulns"]) == {"10.0.0.5"}
+    assert index.matches("host", "192.168.1.10", "68")
+    assert not index.matches("host", "10.0.0.5", "68")
+
+
+def test_long_query_uses_trigrams():
+    index = make_index()
+
+    assert index.search("host", "44228") == {"10.0.0.5"}
+    assert index.search("host", "168.1.1") == {"192.168.1.10"}
+    assert index.search("host", "missing") == set()
@@ -0,0 +1,43 @@
+"""
+Тесты приоритетов очереди задач
+"""
+from core.engine import NodeType, ScanNode
+from core.scheduler import TaskPriorityPolicy
+
+
+def make_node(node_type, depth=1, priority=None):
+    metadata = {"priority": priority} if priority else None
+    return ScanNode(f"{node_type.value}_{depth}_{priority}", node_type, "example.test", "test", depth, 0.0,
+                    metadata=metadata)
+
+
+def test_vulnerability_scan_runs_before_subdomain_fanout():
+    policy = TaskPriorityPolicy()
+    subdomain = policy.make_entry(make_node(NodeType.SUBDOMAIN))
+    vuln_scan = policy.make_entry(make_node(NodeType.VULNERABILITY_SCAN, depth=3))
+
+    assert vuln_scan < subdomain
+
+
+def test_priority_metadata_and_depth_change_weight():
+    policy = TaskPriorityPolicy()
+
+    assert policy.weight(make_node(NodeType.INITIAL_TARGET, priority="high")) < \
+        policy.weight(make_node(NodeType.INITIAL_TARGET))
+    assert policy.weight(make_node(NodeType.ACTIVE_HOST, depth=1)) < \
+        policy.weight(make_node(NodeType.ACTIVE_HOST, depth=4))
+    assert TaskPriorityPolicy({"type_weights": {"subdomain": 0}}).weight(make_node(NodeType.SUBDOMAIN)) < \
+        policy.weight(make_node(NodeType.SUBDOMAIN))
+
+
+def test_waiting_task_ages_ahead_of_new_urgent_work(monkeypatch):
+    policy = TaskPriorityPolicy({"aging_interval": 2.0})
+    clock = [100.0]
+    monkeypatch.setattr("core.scheduler.time.monotonic", lambda: clock[0])
+
+    subdomain = policy.make_entry(make_node(NodeType.SUBDOMAIN))
+    clock[0] += 20.0
+    vuln_scan = policy.make_entry(make_node(NodeType.VULNERABILITY_SCAN))
+
+    # Разница весов 8 компенсируется 16 секундами ожидания
+    assert subdomain < vuln_scan